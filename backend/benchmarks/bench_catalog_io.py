@@ -0,0 +1,108 @@
+# backend/benchmarks/bench_catalog_io.py
+"""
+강의 카탈로그 내보내기 / 가져오기 메모리 벤치마크 (기본 10만 강의 x 차시 3개)
+
+- SQLite 파일 DB에 합성 카탈로그를 만든 뒤 src.catalog_io로 내보내고, 빈 DB에 다시 가져옵니다.
+- 측정: 처리 시간과 tracemalloc 최대 메모리 -> 카탈로그 크기를 늘려도 최대 메모리가 거의 같아야 함
+  (가져오기에는 dry_run이 아닐 때 강의 id 집합을 들고 있지 않음)
+
+실행: cd backend && python -m benchmarks.bench_catalog_io --courses 100000 --lectures 3 --format ndjson
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src import catalog_io, category_registry, models
+from src.database import Base
+
+SEED_CHUNK = 5000
+
+
+async def _database(path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def seed(session_maker, n_courses: int, n_lectures: int) -> None:
+    async with session_maker() as db:
+        await db.execute(insert(models.User), [{"email": "bench@test.com", "hashed_password": "x"}])
+        await db.execute(insert(models.Category), [{"name": f"카테고리{i}"} for i in range(10)])
+        for start in range(1, n_courses + 1, SEED_CHUNK):
+            ids = range(start, min(start + SEED_CHUNK, n_courses + 1))
+            await db.execute(insert(models.Course), [
+                {"id": i, "title": f"강의 {i}", "description": "설명 " * 20, "price": i % 9 * 10000,
+                 "category_id": i % 10 + 1, "instructor_id": 1}
+                for i in ids
+            ])
+            await db.execute(insert(models.Lecture), [
+                {"course_id": i, "title": f"{i}-{j}", "video_url": "https://v.test/x", "order_index": j}
+                for i in ids for j in range(1, n_lectures + 1)
+            ])
+        await db.commit()
+
+
+async def measure(label: str, coro):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = await coro
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<8} {elapsed:>7.1f}s   peak {peak / 1024 / 1024:>6.1f} MB")
+    return result
+
+
+async def main_async(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        source_engine, source = await _database(os.path.join(tmp, "source.db"))
+        target_engine, target = await _database(os.path.join(tmp, "target.db"))
+        await seed(source, args.courses, args.lectures)
+        async with target() as db:
+            await db.execute(insert(models.User), [{"email": "bench@test.com", "hashed_password": "x"}])
+            await db.commit()
+        print(f"courses={args.courses:,} lectures/course={args.lectures} format={args.format}\n")
+
+        path = os.path.join(tmp, f"catalog.{args.format}")
+
+        async def export():
+            async with source() as db:
+                with open(path, "wb") as f:
+                    async for chunk in catalog_io.export_stream(db, args.format):
+                        f.write(chunk)
+
+        async def import_():
+            category_registry.reset()
+            async with target() as db:
+                with open(path, encoding="utf-8", newline="") as f:
+                    return await catalog_io.import_file(db, f, args.format)
+
+        await measure("export", export())
+        print(f"         file {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+        report = await measure("import", import_())
+        print(f"         courses {report['courses']} lectures {report['lectures']} rejected {report['rejected']}")
+        await source_engine.dispose()
+        await target_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--courses", type=int, default=100_000)
+    parser.add_argument("--lectures", type=int, default=3)
+    parser.add_argument("--format", choices=catalog_io.FORMATS, default="ndjson")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
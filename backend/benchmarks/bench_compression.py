@@ -0,0 +1,74 @@
+# backend/benchmarks/bench_compression.py
+"""
+목록 API 응답 압축 벤치마크 (bytes-on-wire)
+
+- 100개짜리 강의 목록 페이지(PageResponse[CourseResponse])를 기준으로
+  무압축 / gzip / brotli 전송 크기와 압축 시간을 비교합니다.
+
+실행: cd backend && python -m benchmarks.bench_compression
+"""
+import sys
+import os
+import time
+import zlib
+from types import SimpleNamespace
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from faker import Faker
+
+from src import models
+from src.config import settings
+from src.serializers import course_row_to_dict, json_dumps, user_row_to_dict
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+fake = Faker("ko_KR")
+REPEAT = 50
+
+
+def course_page(size: int = 100) -> bytes:
+    now = datetime.now(timezone.utc)
+    rows = [
+        SimpleNamespace(
+            id=i, title=fake.catch_phrase(), description=fake.paragraph(nb_sentences=6), price=10000 * (i % 9),
+            level="BEGINNER", thumbnail_url=None, category_id=i % 5 + 1, instructor_id=i % 20 + 1,
+            created_at=now, updated_at=now, category_name=f"카테고리{i % 5}",
+            instructor_email=f"inst{i % 20}@example.com", instructor_role=models.UserRole.USER,
+            instructor_created_at=now,
+        )
+        for i in range(size)
+    ]
+    content = [course_row_to_dict(r) for r in rows]
+    return json_dumps({"content": content, "page": 1, "size": size, "total_elements": 1000, "total_pages": 10})
+
+
+def user_page(size: int = 100) -> bytes:
+    now = datetime.now(timezone.utc)
+    rows = [SimpleNamespace(id=i, email=fake.email(), role=models.UserRole.USER, created_at=now) for i in range(size)]
+    return json_dumps({"content": [user_row_to_dict(r) for r in rows], "size": size, "next_cursor": size})
+
+
+def measure(name: str, fn, body: bytes):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        out = fn(body)
+    elapsed = (time.perf_counter() - start) / REPEAT
+    print(f"  {name:<8} {len(out):>8,} bytes  ({len(out) / len(body):6.1%})  {elapsed * 1e3:7.3f} ms")
+
+
+def main():
+    for label, body in (("GET /courses?size=100", course_page()), ("GET /users?size=100", user_page())):
+        print(label)
+        measure("identity", lambda b: b, body)
+        measure("gzip", lambda b: zlib.compress(b, settings.COMPRESSION_GZIP_LEVEL), body)
+        if brotli is not None:
+            measure("br", lambda b: brotli.compress(b, quality=settings.COMPRESSION_BROTLI_QUALITY), body)
+
+
+if __name__ == "__main__":
+    main()
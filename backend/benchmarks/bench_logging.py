@@ -0,0 +1,148 @@
+# backend/benchmarks/bench_logging.py
+"""
+요청 로그 비용 벤치마크 (이벤트 루프 점유 시간)
+
+- 동시 요청(코루틴) N개가 요청마다 접근 로그 1줄, 1%는 에러 + 트레이스백을 남기는 상황에서
+  로그 호출이 이벤트 루프를 붙잡는 시간(호출당 평균 / p99)과 전체 처리 시간을 비교합니다.
+  - basicConfig : 기존 설정 (f-string + StreamHandler, 루프 위에서 포맷/쓰기, traceback.format_exc())
+  - queue-json  : src.logging_setup (QueueHandler -> 리스너 스레드에서 JSON 포맷/쓰기)
+  - queue-json + 샘플링(LOG_SUCCESS_SAMPLE_RATE=0.1)
+- 출력은 임시 파일 (느린 stdout/파이프를 흉내 내려면 --write-delay-us로 쓰기마다 지연 추가)
+
+실행: cd backend && python -m benchmarks.bench_logging --requests 20000 --concurrency 200
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import logging_setup
+from src.config import settings
+
+ERROR_EVERY = 100
+
+
+class SlowFile:
+    """쓰기마다 지연을 넣은 파일 (블로킹 I/O 흉내)"""
+
+    def __init__(self, f, delay_us: int):
+        self.f = f
+        self.delay = delay_us / 1_000_000
+
+    def write(self, data):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.f.write(data)
+
+    def flush(self):
+        self.f.flush()
+
+
+def _reset_root():
+    logging_setup.shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+async def _request(i: int, mode: str, logger: logging.Logger, timings: list):
+    await asyncio.sleep(0)
+    method, path, status, duration_ms = "GET", f"/api/v1/courses/{i % 500}", 200, 3.2
+    started = time.perf_counter()
+    if i % ERROR_EVERY == 0:
+        try:
+            _fail()
+        except ValueError as e:
+            if mode == "basicConfig":
+                logger.error(f"Server Error: {str(e)}")
+                logger.error(traceback.format_exc())
+            else:
+                logger.exception("Unhandled error", extra={"method": method, "path": path})
+        status = 500
+    if mode == "basicConfig":
+        logger.info(f"{method} {path} - {status} - {duration_ms / 1000:.4f}s")
+    elif logging_setup.should_log_access(status, duration_ms):
+        logger.info("request", extra={
+            "method": method, "path": path, "route": "/api/v1/courses/{course_id}",
+            "status": status, "duration_ms": duration_ms, "user_id": i % 1000, "client_ip": "10.0.0.1",
+        })
+    timings.append(time.perf_counter() - started)
+
+
+async def _run(total: int, concurrency: int, mode: str, logger: logging.Logger) -> list:
+    timings: list = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            await _request(i, mode, logger, timings)
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return timings
+
+
+def bench(mode: str, total: int, concurrency: int, delay_us: int, sample_rate: float):
+    with tempfile.TemporaryFile("w+") as f:
+        stream = SlowFile(f, delay_us)
+        _reset_root()
+        if mode == "basicConfig":
+            handler = logging.StreamHandler(stream)
+            handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+            logging.getLogger().addHandler(handler)
+            logging.getLogger().setLevel(logging.INFO)
+        else:
+            settings.LOG_SUCCESS_SAMPLE_RATE = sample_rate
+            logging_setup.setup_logging(level="INFO", fmt="json", stream=stream)
+        logger = logging.getLogger("bench")
+
+        started = time.perf_counter()
+        timings = asyncio.run(_run(total, concurrency, mode, logger))
+        loop_elapsed = time.perf_counter() - started
+        dropped = logging_setup.dropped_count()
+        _reset_root()   # 큐에 남은 로그까지 모두 쓰고 종료
+        drained = time.perf_counter() - started
+        f.seek(0)
+        lines = sum(1 for _ in f)
+
+    timings.sort()
+    return {
+        "mean_us": statistics.mean(timings) * 1e6,
+        "p99_us": timings[int(len(timings) * 0.99)] * 1e6,
+        "loop_s": loop_elapsed,
+        "drained_s": drained,
+        "lines": lines,
+        "dropped": dropped,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--write-delay-us", type=int, default=0)
+    args = parser.parse_args()
+
+    cases = [("basicConfig", "basicConfig", 1.0), ("queue-json", "queue", 1.0), ("queue-json(10%)", "queue", 0.1)]
+    print(f"requests={args.requests} concurrency={args.concurrency} write_delay={args.write_delay_us}us\n")
+    print(f"{'setup':<18}{'mean/call':>12}{'p99/call':>12}{'loop':>10}{'drained':>10}{'lines':>9}{'dropped':>9}")
+    for name, mode, rate in cases:
+        r = bench(mode, args.requests, args.concurrency, args.write_delay_us, rate)
+        print(
+            f"{name:<18}{r['mean_us']:>10.1f}us{r['p99_us']:>10.1f}us{r['loop_s']:>9.2f}s"
+            f"{r['drained_s']:>9.2f}s{r['lines']:>9}{r['dropped']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
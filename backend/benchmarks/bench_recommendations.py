@@ -0,0 +1,80 @@
+# backend/benchmarks/bench_recommendations.py
+"""
+함께 수강 추천 Top-K 계산 벤치마크 (기본 100만 수강 신청)
+
+- 학생 N명이 Zipf 분포(인기 강의 쏠림)로 강의를 골라 수강했다고 가정한 합성 데이터
+- 측정: 희소 행렬 X^T X + 코사인 정규화 + 강의별 Top-K (src.recommendations.top_k_neighbors)
+- 비교: 강의쌍마다 dict로 세는 순수 파이썬 방식 (--python-baseline, 느리므로 데이터 일부만 사용)
+
+실행: cd backend && python -m benchmarks.bench_recommendations --enrollments 1000000 --courses 2000
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from itertools import combinations
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.recommendations import top_k_neighbors
+
+
+def synthetic_enrollments(n_enrollments: int, n_courses: int, per_user: float, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    n_users = max(int(n_enrollments / per_user), 1)
+    users = rng.integers(0, n_users, size=n_enrollments)
+    courses = (rng.zipf(1.3, size=n_enrollments) - 1) % n_courses
+    return users, courses
+
+
+def python_baseline(users, courses, k: int):
+    """비교용: 학생별 수강 목록 -> 강의쌍 카운트 (dict)"""
+    by_user = defaultdict(set)
+    for u, c in zip(users.tolist(), courses.tolist()):
+        by_user[u].add(c)
+    counts, co = Counter(), defaultdict(Counter)
+    for taken in by_user.values():
+        counts.update(taken)
+        for a, b in combinations(sorted(taken), 2):
+            co[a][b] += 1
+            co[b][a] += 1
+    return {
+        c: sorted(((o, n / (counts[c] * counts[o]) ** 0.5) for o, n in others.items()), key=lambda x: -x[1])[:k]
+        for c, others in co.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--enrollments", type=int, default=1_000_000)
+    parser.add_argument("--courses", type=int, default=2000)
+    parser.add_argument("--per-user", type=float, default=8.0, help="학생 1명당 평균 수강 수")
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--python-baseline", action="store_true")
+    args = parser.parse_args()
+
+    users, courses = synthetic_enrollments(args.enrollments, args.courses, args.per_user)
+    print(f"enrollments={len(users):,} users={len(np.unique(users)):,} courses={len(np.unique(courses)):,}")
+
+    started = time.perf_counter()
+    neighbors = top_k_neighbors(users, courses, k=args.top_k, min_support=1)
+    elapsed = time.perf_counter() - started
+    rows = sum(len(v) for v in neighbors.values())
+    print(f"sparse top-k : {elapsed:7.2f}s  ({len(neighbors):,} courses, {rows:,} rows)")
+
+    if args.python_baseline:
+        sample = min(len(users), 100_000)
+        started = time.perf_counter()
+        python_baseline(users[:sample], courses[:sample], args.top_k)
+        base = time.perf_counter() - started
+        started = time.perf_counter()
+        top_k_neighbors(users[:sample], courses[:sample], k=args.top_k, min_support=1)
+        fast = time.perf_counter() - started
+        print(f"python dict  : {base:7.2f}s vs sparse {fast:.2f}s on {sample:,} enrollments ({base / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# backend/benchmarks/bench_serialization.py
+"""
+목록 응답 직렬화 마이크로 벤치마크 (100개 페이지 기준)
+
+- 기존 경로: ORM 객체 -> Pydantic(from_attributes) 검증 -> JSON
+- 빠른 경로: Core row -> dict -> orjson (src.serializers)
+
+실행: cd backend && python -m benchmarks.bench_serialization
+"""
+import sys
+import os
+import timeit
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter
+
+from src import models, schemas
+from src.serializers import FastJSONResponse, course_row_to_dict
+
+PAGE_SIZE = 100
+REPEAT = 200
+
+
+def build_orm_page():
+    now = datetime.now(timezone.utc)
+    category = models.Category(id=1, name="Python")
+    instructor = models.User(id=1, email="inst@example.com", role=models.UserRole.USER, created_at=now)
+    courses = []
+    for i in range(PAGE_SIZE):
+        courses.append(models.Course(
+            id=i, title=f"Course {i}", description="설명 " * 20, price=10000, level="BEGINNER",
+            thumbnail_url=None, category_id=1, instructor_id=1, created_at=now, updated_at=now,
+            category=category, instructor=instructor,
+        ))
+    return {"content": courses, "page": 1, "size": PAGE_SIZE, "total_elements": PAGE_SIZE, "total_pages": 1}
+
+
+def build_row_page():
+    now = datetime.now(timezone.utc)
+    rows = [
+        SimpleNamespace(
+            id=i, title=f"Course {i}", description="설명 " * 20, price=10000, level="BEGINNER",
+            thumbnail_url=None, category_id=1, instructor_id=1, created_at=now, updated_at=now,
+            category_name="Python", instructor_email="inst@example.com",
+            instructor_role=models.UserRole.USER, instructor_created_at=now,
+        )
+        for i in range(PAGE_SIZE)
+    ]
+    return rows
+
+
+def main():
+    adapter = TypeAdapter(schemas.PageResponse[schemas.CourseResponse])
+    orm_page = build_orm_page()
+    rows = build_row_page()
+
+    def pydantic_path():
+        return adapter.dump_json(adapter.validate_python(orm_page))
+
+    def fast_path():
+        content = [course_row_to_dict(r) for r in rows]
+        return FastJSONResponse({**orm_page, "content": content}).body
+
+    slow = min(timeit.repeat(pydantic_path, number=REPEAT, repeat=3)) / REPEAT
+    fast = min(timeit.repeat(fast_path, number=REPEAT, repeat=3)) / REPEAT
+
+    print(f"[page={PAGE_SIZE}] pydantic from_attributes : {slow * 1e3:.3f} ms/page, {slow / PAGE_SIZE * 1e6:.2f} us/item")
+    print(f"[page={PAGE_SIZE}] core row + orjson        : {fast * 1e3:.3f} ms/page, {fast / PAGE_SIZE * 1e6:.2f} us/item")
+    print(f"speedup: x{slow / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
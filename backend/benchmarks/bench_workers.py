@@ -0,0 +1,91 @@
+# backend/benchmarks/bench_workers.py
+"""
+워커 수에 따른 처리량(RPS) 측정
+
+- serve.py를 WEB_CONCURRENCY=1..N 으로 띄우고, 각 설정마다 동시 요청을 보내 RPS를 측정합니다.
+- 기본 대상은 DB를 타지 않는 /health (서버/이벤트 루프 자체 처리량)이며,
+  --path 로 /api/v1/courses 등 실제 엔드포인트를 지정할 수 있습니다. (DB/Redis 필요)
+
+실행: cd backend && python -m benchmarks.bench_workers --max-workers 4 --requests 5000 --concurrency 64
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def wait_until_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.3)
+    raise RuntimeError(f"server did not start: {url}")
+
+
+async def load(url: str, total: int, concurrency: int) -> float:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def worker():
+            while True:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await client.get(url)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+def run_server(workers: int, port: int) -> subprocess.Popen:
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "PORT": str(port), "HOST": "127.0.0.1"}
+    return subprocess.Popen(
+        [sys.executable, "serve.py"], cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--port", type=int, default=18080)
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}{args.path}"
+    print(f"target={args.path} requests={args.requests} concurrency={args.concurrency}")
+    print(f"{'workers':>7} | {'RPS':>9} | scale")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        proc = run_server(workers, args.port)
+        try:
+            await wait_until_ready(f"http://127.0.0.1:{args.port}/health")
+            await load(url, min(args.requests, 500), args.concurrency)  # 워밍업
+            rps = await load(url, args.requests, args.concurrency)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+        baseline = baseline or rps
+        print(f"{workers:>7} | {rps:>9.1f} | x{rps / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
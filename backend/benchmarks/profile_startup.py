@@ -0,0 +1,96 @@
+# backend/benchmarks/profile_startup.py
+"""
+기동(cold start) 시 모듈별 import 시간 프로파일링
+
+- 새 인터프리터에서 `python -X importtime -c "import src.main"`을 실행해 모듈별 self/누적 시간을 집계합니다.
+- 최상위 패키지 기준 누적 시간 상위 N개와 전체 import 시간을 출력하고, 예산(--budget-ms)을 넘으면 exit code 1
+- 지연 초기화 대상(LAZY_MODULES)이 기동 시 import 되면 함께 실패로 보고합니다. (CI에서 회귀 감지용)
+
+실행: cd backend && python -m benchmarks.profile_startup --budget-ms 2000 --top 15
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = int(os.getenv("STARTUP_BUDGET_MS", "2000"))
+
+# 첫 사용 시에만 import 되어야 하는 무거운 의존성 (추천 계산 배치에서만 사용)
+LAZY_MODULES = ("numpy", "scipy")
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+class ImportRecord(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """-X importtime 출력(stderr) 파싱 - 헤더 등 형식이 다른 줄은 무시"""
+    records = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(ImportRecord(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def by_package(records: List[ImportRecord]) -> Dict[str, int]:
+    """최상위 패키지별 self 시간 합계(us) - src 하위는 모듈 단위로 구분"""
+    totals: Dict[str, int] = defaultdict(int)
+    for record in records:
+        parts = record.name.split(".")
+        key = ".".join(parts[:2]) if parts[0] == "src" else parts[0]
+        totals[key] += record.self_us
+    return dict(totals)
+
+
+def profile(target: str = "src.main") -> List[ImportRecord]:
+    # lifespan(Redis/DB 연결)은 실행하지 않고 import 비용만 측정
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", default="src.main")
+    parser.add_argument("--budget-ms", type=int, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    records = profile(args.target)
+    # 대상 모듈의 누적 시간 = 인터프리터 기본 모듈을 제외한 앱 import 비용
+    total_ms = next(r.cumulative_us for r in records if r.name == args.target) / 1000
+    loaded = {r.name for r in records}
+
+    print(f"{'package':<32}{'self(ms)':>10}{'share':>8}")
+    for name, us in sorted(by_package(records).items(), key=lambda kv: kv[1], reverse=True)[: args.top]:
+        print(f"{name:<32}{us / 1000:>10.1f}{us / 1000 / total_ms:>8.1%}")
+    print(f"\ntotal import time of {args.target}: {total_ms:.0f} ms (budget {args.budget_ms} ms)")
+
+    ok = True
+    if total_ms > args.budget_ms:
+        print("FAIL: cold start import time exceeds budget")
+        ok = False
+    eager = [m for m in LAZY_MODULES if m in loaded]
+    if eager:
+        print(f"FAIL: lazy modules imported at startup: {', '.join(eager)}")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+# backend/jobs/build_recommendations.py
+"""
+함께 수강한 강의 추천 Top-K 재계산 (오프라인 배치)
+
+- cron / 스케줄러에서 주기적으로 실행 (예: 매일 새벽)
+- 계산 중에도 API는 기존 course_recommendations 테이블로 응답하고, 저장은 한 트랜잭션으로 교체됩니다.
+
+실행: cd backend && python -m jobs.build_recommendations --top-k 20 --min-support 2
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# 프로젝트 루트(/app) 기준 import 되도록 path 보정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import logging_setup, recommendations
+from src.config import settings
+from src.database import async_session_maker, engine
+
+
+async def run(top_k: int, min_support: int) -> None:
+    started = time.perf_counter()
+    async with async_session_maker() as db:
+        saved = await recommendations.build(db, k=top_k, min_support=min_support)
+    print(f"✅ {saved} recommendation rows saved in {time.perf_counter() - started:.1f}s")
+    await engine.dispose()
+
+
+def main() -> None:
+    logging_setup.setup_logging()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top-k", type=int, default=settings.RECOMMENDATION_TOP_K)
+    parser.add_argument("--min-support", type=int, default=settings.RECOMMENDATION_MIN_SUPPORT)
+    args = parser.parse_args()
+    asyncio.run(run(args.top_k, args.min_support))
+
+
+if __name__ == "__main__":
+    main()
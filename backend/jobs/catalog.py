@@ -0,0 +1,90 @@
+# backend/jobs/catalog.py
+"""
+강의 카탈로그 내보내기 / 가져오기 CLI (관리자 API와 같은 형식 - src/catalog_io.py)
+
+- 대용량(수십만 강의) 카탈로그는 HTTP 요청 대신 이 스크립트로 옮기는 것을 권장합니다.
+- 형식은 --format 또는 파일 확장자(.ndjson / .csv)로 지정
+
+실행: cd backend && python -m jobs.catalog export catalog.ndjson --include enrollments,reviews
+      python -m jobs.catalog import catalog.ndjson --batch-size 1000
+      python -m jobs.catalog import catalog.csv --dry-run
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# 프로젝트 루트(/app) 기준 import 되도록 path 보정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import cache, catalog_io, logging_setup
+from src.config import settings
+from src.database import async_session_maker, engine
+
+
+def _format(path: str, fmt: str) -> str:
+    fmt = fmt or path.rsplit(".", 1)[-1].lower()
+    if fmt not in catalog_io.FORMATS:
+        raise SystemExit(f"Unknown format '{fmt}' (use --format ndjson|csv)")
+    return fmt
+
+
+async def export(path: str, fmt: str, include: set) -> None:
+    started = time.perf_counter()
+    written = 0
+    async with async_session_maker() as db:
+        with open(path, "wb") as f:
+            async for chunk in catalog_io.export_stream(db, fmt, include):
+                f.write(chunk)
+                written += len(chunk)
+    print(f"✅ {written:,} bytes written to {path} in {time.perf_counter() - started:.1f}s")
+
+
+async def import_(path: str, fmt: str, batch_size: int, dry_run: bool) -> None:
+    started = time.perf_counter()
+    # 다른 워커의 캐시 무효화 알림을 보내기 위해 Redis 연결
+    await cache.init_redis()
+    try:
+        async with async_session_maker() as db:
+            with open(path, encoding="utf-8-sig", newline="") as f:
+                report = await catalog_io.import_file(db, f, fmt, batch_size=batch_size, dry_run=dry_run)
+    finally:
+        await cache.close_redis()
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f"✅ {report['processed']:,} records ({report['rejected']:,} rejected) in {time.perf_counter() - started:.1f}s")
+
+
+async def run(args) -> None:
+    try:
+        if args.command == "export":
+            include = {part.strip() for part in (args.include or "").split(",") if part.strip()}
+            unknown = include - set(catalog_io.OPTIONAL_RECORDS)
+            if unknown:
+                raise SystemExit(f"Unknown --include: {', '.join(sorted(unknown))}")
+            await export(args.path, _format(args.path, args.format), include)
+        else:
+            await import_(args.path, _format(args.path, args.format), args.batch_size, args.dry_run)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    logging_setup.setup_logging()
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    export_parser = sub.add_parser("export")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", choices=catalog_io.FORMATS)
+    export_parser.add_argument("--include", help="enrollments,reviews")
+    import_parser = sub.add_parser("import")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=catalog_io.FORMATS)
+    import_parser.add_argument("--batch-size", type=int, default=settings.CATALOG_IMPORT_BATCH_SIZE)
+    import_parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# backend/jobs/outbox_worker.py
+"""
+아웃박스 작업 워커 프로세스
+
+- outbox_events를 폴링해 src.outbox_handlers에 등록된 부수 효과를 실행합니다.
+- 여러 프로세스를 띄워도 SELECT ... FOR UPDATE SKIP LOCKED로 같은 작업을 나눠 갖지 않습니다.
+- SIGTERM / SIGINT: 진행 중인 배치를 마친 뒤 종료
+
+실행: cd backend && python -m jobs.outbox_worker --concurrency 4
+      python -m jobs.outbox_worker --requeue-dead        # DEAD 작업 전체 재시도
+"""
+import argparse
+import asyncio
+import os
+import signal
+import sys
+
+# 프로젝트 루트(/app) 기준 import 되도록 path 보정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import cache, logging_setup, outbox, outbox_handlers  # noqa: F401 - 핸들러 등록
+from src.config import settings
+from src.database import engine
+
+
+async def run(concurrency: int, requeue_dead: bool) -> None:
+    if requeue_dead:
+        count = await outbox.backend.requeue_dead()
+        print(f"♻️ {count} dead jobs requeued")
+        await engine.dispose()
+        return
+
+    await cache.init_redis()
+    worker = outbox.OutboxWorker(concurrency=concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+    print(f"🚚 Outbox worker started (concurrency={worker.concurrency}, backend={settings.OUTBOX_BACKEND})")
+    try:
+        await worker.run()
+    finally:
+        await cache.close_redis()
+        await engine.dispose()
+    print("🛑 Outbox worker stopped.")
+
+
+def main() -> None:
+    logging_setup.setup_logging()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=settings.OUTBOX_CONCURRENCY)
+    parser.add_argument("--requeue-dead", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.concurrency, args.requeue_dead))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""add course_recommendations
+
+Revision ID: a3c1f0d2b7e4
+Revises: 5eaaedd5b39e
+Create Date: 2026-10-19 10:12:41.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c1f0d2b7e4'
+down_revision: Union[str, Sequence[str], None] = '5eaaedd5b39e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'course_recommendations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('recommended_course_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['recommended_course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_course_recommendations_id'), 'course_recommendations', ['id'], unique=False)
+    op.create_index(op.f('ix_course_recommendations_course_id'), 'course_recommendations', ['course_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_course_recommendations_course_id'), table_name='course_recommendations')
+    op.drop_index(op.f('ix_course_recommendations_id'), table_name='course_recommendations')
+    op.drop_table('course_recommendations')
@@ -0,0 +1,44 @@
+"""add analytics_rollups
+
+Revision ID: c5e7f3a18d2b
+Revises: b8d4e2a91c5f
+Create Date: 2026-10-19 15:42:08.118274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e7f3a18d2b'
+down_revision: Union[str, Sequence[str], None] = 'b8d4e2a91c5f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'analytics_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('method', sa.String(length=10), nullable=False),
+        sa.Column('route', sa.String(length=200), nullable=False),
+        sa.Column('status', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('authenticated', sa.Integer(), nullable=False),
+        sa.Column('latency_sum_ms', sa.Float(), nullable=False),
+        sa.Column('latency_max_ms', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_analytics_rollups_id'), 'analytics_rollups', ['id'], unique=False)
+    op.create_index(op.f('ix_analytics_rollups_bucket_start'), 'analytics_rollups', ['bucket_start'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_analytics_rollups_bucket_start'), table_name='analytics_rollups')
+    op.drop_index(op.f('ix_analytics_rollups_id'), table_name='analytics_rollups')
+    op.drop_table('analytics_rollups')
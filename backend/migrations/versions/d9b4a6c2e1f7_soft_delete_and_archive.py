@@ -0,0 +1,83 @@
+"""soft delete enrollments/reviews + archive tables
+
+Revision ID: d9b4a6c2e1f7
+Revises: c5e7f3a18d2b
+Create Date: 2026-10-19 18:05:41.532907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9b4a6c2e1f7'
+down_revision: Union[str, Sequence[str], None] = 'c5e7f3a18d2b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = sa.text('deleted_at IS NULL')
+DELETED = sa.text('deleted_at IS NOT NULL')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('enrollments', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('reviews', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    # PostgreSQL / SQLite: 부분 인덱스, MySQL: where 옵션이 무시되어 deleted_at을 포함한 복합 인덱스
+    op.create_index('ix_enrollments_live_user_course', 'enrollments', ['user_id', 'course_id', 'deleted_at'],
+                    postgresql_where=LIVE, sqlite_where=LIVE)
+    op.create_index('ix_enrollments_live_course', 'enrollments', ['course_id', 'deleted_at'],
+                    postgresql_where=LIVE, sqlite_where=LIVE)
+    op.create_index('ix_enrollments_deleted_at', 'enrollments', ['deleted_at'],
+                    postgresql_where=DELETED, sqlite_where=DELETED)
+    op.create_index('ix_reviews_live_course_created', 'reviews', ['course_id', 'created_at', 'deleted_at'],
+                    postgresql_where=LIVE, sqlite_where=LIVE)
+    op.create_index('ix_reviews_deleted_at', 'reviews', ['deleted_at'],
+                    postgresql_where=DELETED, sqlite_where=DELETED)
+
+    op.create_table(
+        'enrollments_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('enrolled_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('course_id', sa.Integer(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_enrollments_archive_user_id'), 'enrollments_archive', ['user_id'], unique=False)
+    op.create_index(op.f('ix_enrollments_archive_course_id'), 'enrollments_archive', ['course_id'], unique=False)
+    op.create_table(
+        'reviews_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('course_id', sa.Integer(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_reviews_archive_user_id'), 'reviews_archive', ['user_id'], unique=False)
+    op.create_index(op.f('ix_reviews_archive_course_id'), 'reviews_archive', ['course_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_reviews_archive_course_id'), table_name='reviews_archive')
+    op.drop_index(op.f('ix_reviews_archive_user_id'), table_name='reviews_archive')
+    op.drop_table('reviews_archive')
+    op.drop_index(op.f('ix_enrollments_archive_course_id'), table_name='enrollments_archive')
+    op.drop_index(op.f('ix_enrollments_archive_user_id'), table_name='enrollments_archive')
+    op.drop_table('enrollments_archive')
+    op.drop_index('ix_reviews_deleted_at', table_name='reviews')
+    op.drop_index('ix_reviews_live_course_created', table_name='reviews')
+    op.drop_index('ix_enrollments_deleted_at', table_name='enrollments')
+    op.drop_index('ix_enrollments_live_course', table_name='enrollments')
+    op.drop_index('ix_enrollments_live_user_course', table_name='enrollments')
+    op.drop_column('reviews', 'deleted_at')
+    op.drop_column('enrollments', 'deleted_at')
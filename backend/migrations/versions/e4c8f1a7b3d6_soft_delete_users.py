@@ -0,0 +1,33 @@
+"""soft delete users (two-phase account deletion)
+
+Revision ID: e4c8f1a7b3d6
+Revises: d9b4a6c2e1f7
+Create Date: 2026-10-19 19:22:17.604133
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c8f1a7b3d6'
+down_revision: Union[str, Sequence[str], None] = 'd9b4a6c2e1f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DELETED = sa.text('deleted_at IS NOT NULL')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_users_deleted_at', 'users', ['deleted_at'],
+                    postgresql_where=DELETED, sqlite_where=DELETED)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_deleted_at', table_name='users')
+    op.drop_column('users', 'deleted_at')
@@ -0,0 +1,75 @@
+# backend/serve.py
+"""
+운영용 서버 실행 스크립트 (멀티 워커)
+
+- 워커 수: WEB_CONCURRENCY 환경변수 > 컨테이너 CPU 할당량(cgroup) > CPU 코어 수
+- 이벤트 루프/HTTP 파서: uvloop + httptools (uvicorn[standard]에 포함, 없으면 기본값으로 폴백)
+- 종료 시 각 워커의 lifespan에서 Redis 클라이언트와 DB 커넥션 풀을 정리합니다.
+
+실행: python serve.py  (Dockerfile CMD)
+"""
+import importlib.util
+import math
+import os
+
+import uvicorn
+
+
+def _cgroup_cpu_limit():
+    """컨테이너 CPU 제한(cgroup v2 cpu.max / v1 cfs quota)을 코어 수로 환산, 없으면 None"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def worker_count() -> int:
+    env = os.getenv("WEB_CONCURRENCY")
+    if env:
+        return max(int(env), 1)
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS 등
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, max(math.ceil(limit), 1))
+    # async 워커는 코어당 1개면 CPU를 다 쓰므로 그 이상 늘리지 않음
+    return max(cpus, 1)
+
+
+def main():
+    has_uvloop = importlib.util.find_spec("uvloop") is not None
+    has_httptools = importlib.util.find_spec("httptools") is not None
+    uvicorn.run(
+        "src.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8080")),
+        workers=worker_count(),
+        loop="uvloop" if has_uvloop else "asyncio",
+        http="httptools" if has_httptools else "h11",
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        backlog=int(os.getenv("BACKLOG", "2048")),
+        timeout_keep_alive=int(os.getenv("KEEP_ALIVE", "5")),
+        # SIGTERM 후 진행 중인 요청을 마무리할 시간 (이후 lifespan 종료 처리)
+        timeout_graceful_shutdown=int(os.getenv("GRACEFUL_TIMEOUT", "20")),
+        access_log=False,  # 요청 로그는 LoggingAndRateLimitMiddleware에서 남김
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+# backend/src/analytics.py
+"""
+요청 분석 이벤트 파이프라인 (시간 버킷 집계)
+
+- 기록: 미들웨어가 요청마다 (시각, method, 라우트 템플릿, status, 지연 ms, 로그인 여부)를
+  워커 메모리 링 버퍼(deque, ANALYTICS_BUFFER_SIZE)에 넣음 -> 요청 경로에는 I/O 없음
+  - 버퍼가 가득 차면 가장 오래된 이벤트부터 버리고 dropped로 셉니다.
+- 저장: AnalyticsFlusher가 ANALYTICS_FLUSH_INTERVAL_SECONDS마다(또는 ANALYTICS_FLUSH_BATCH_SIZE가 쌓이면)
+  버퍼를 비워 (정시 버킷, method, route, status)별로 합친 행을 analytics_rollups에 INSERT만 합니다. (append-only)
+  - 지난 시간 버킷은 compact()가 키별 1행으로 합쳐 테이블 크기를 제한합니다.
+    - 매 정시에 방금 닫힌 1시간 버킷만 합침 (이전 기록은 다시 읽지 않음)
+    - 이미 합친 버킷에 늦게 flush된 행(지연된 워커 / 종료 직전 flush)은 버킷 단위로 기록해 두었다가 그 버킷만 다시 합침
+- 조회: daily() / hourly()가 집계 행만 SUM -> 방문(visits, API 요청 수) / 가입(signups) / 수강 신청(enrollments)
+- 시간은 모두 UTC
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import cache, models
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = settings.API_V1_STR
+# 성공 응답(2xx)을 지표로 세는 라우트
+METRIC_ROUTES = {
+    "signups": ("POST", f"{API_PREFIX}/auth/signup"),
+    "enrollments": ("POST", f"{API_PREFIX}/courses/{{course_id}}/enroll"),
+}
+COMPACT_LOCK_KEY = "analytics:compact:{}"
+# 이미 합친(또는 합칠 차례가 지난) 버킷에 늦게 들어온 행이 있는 버킷 (Redis Set, 값: isoformat)
+LATE_BUCKETS_KEY = "analytics:late_buckets"
+
+
+class RequestEvent(NamedTuple):
+    timestamp: float
+    method: str
+    route: str
+    status: int
+    latency_ms: float
+    user_id: Optional[int]
+
+
+# ------------------------------------------
+# 기록 (요청 경로)
+# ------------------------------------------
+class RingBuffer:
+    """고정 크기 버퍼 - 가득 차면 가장 오래된 항목을 버림"""
+
+    def __init__(self, maxlen: int):
+        self._events: deque = deque(maxlen=maxlen)
+        self.dropped = 0
+
+    def append(self, event: RequestEvent) -> None:
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(event)
+
+    def drain(self) -> List[RequestEvent]:
+        events = []
+        while self._events:
+            events.append(self._events.popleft())
+        return events
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+buffer = RingBuffer(settings.ANALYTICS_BUFFER_SIZE)
+_flush_wanted = asyncio.Event()
+
+# 요청마다 미들웨어가 넣는 보관함 - 인증 의존성(get_current_user)이 사용자 id를 채움
+_request_context: ContextVar[Optional[dict]] = ContextVar("analytics_request", default=None)
+
+
+def begin_request():
+    return _request_context.set({})
+
+
+def end_request(token) -> Optional[int]:
+    context = _request_context.get()
+    _request_context.reset(token)
+    return (context or {}).get("user_id")
+
+
+def set_user(user_id: int) -> None:
+    context = _request_context.get()
+    if context is not None:
+        context["user_id"] = user_id
+
+
+def route_template(scope) -> Optional[str]:
+    """매칭된 라우트 템플릿 (/api/v1/courses/{course_id}), 매칭 실패(404)면 None"""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None:
+        return None
+    # include_router(prefix=...)의 prefix가 route.path에 없는 FastAPI 버전 대응
+    if scope["path"].startswith(API_PREFIX) and not path.startswith(API_PREFIX):
+        path = API_PREFIX + path
+    return path
+
+
+def record(method: str, route: str, status: int, latency_ms: float, user_id: Optional[int]) -> None:
+    if not settings.ANALYTICS_ENABLED:
+        return
+    buffer.append(RequestEvent(time.time(), method, route, status, latency_ms, user_id))
+    if len(buffer) >= settings.ANALYTICS_FLUSH_BATCH_SIZE:
+        _flush_wanted.set()
+
+
+# ------------------------------------------
+# 저장
+# ------------------------------------------
+def _bucket(timestamp: float) -> datetime:
+    return datetime.utcfromtimestamp(timestamp).replace(minute=0, second=0, microsecond=0)
+
+
+def _compact_before(now: Optional[float] = None) -> datetime:
+    """이 시각 이전 버킷은 합칠 차례가 지남 - 다른 워커가 아직 flush하지 않은 직전 시간 이벤트를 위해 1시간 여유"""
+    return _bucket(now if now is not None else time.time()) - timedelta(hours=1)
+
+
+# Redis가 없을 때(단일 워커) 늦게 들어온 버킷
+_late_buckets: Set[datetime] = set()
+
+
+async def _mark_late(buckets: Iterable[datetime]) -> None:
+    buckets = set(buckets)
+    if not buckets:
+        return
+    client = cache.redis_client
+    if client is None:
+        _late_buckets.update(buckets)
+        return
+    try:
+        await client.sadd(LATE_BUCKETS_KEY, *(bucket.isoformat() for bucket in buckets))
+    except Exception as e:
+        logger.warning(f"Analytics late bucket tracking failed: {e}")
+
+
+async def _pop_late() -> List[datetime]:
+    client = cache.redis_client
+    if client is None:
+        buckets = sorted(_late_buckets)
+        _late_buckets.clear()
+        return buckets
+    buckets = []
+    while True:
+        popped = await client.spop(LATE_BUCKETS_KEY, 100)
+        if not popped:
+            return sorted(buckets)
+        buckets.extend(datetime.fromisoformat(value) for value in popped)
+
+
+def rollup(events: List[RequestEvent]) -> List[dict]:
+    """이벤트 -> (버킷, method, route, status)별 집계 행"""
+    groups: Dict[Tuple, dict] = {}
+    for event in events:
+        key = (_bucket(event.timestamp), event.method, event.route, event.status)
+        row = groups.get(key)
+        if row is None:
+            row = groups[key] = {
+                "bucket_start": key[0], "method": key[1], "route": key[2], "status": key[3],
+                "count": 0, "authenticated": 0, "latency_sum_ms": 0.0, "latency_max_ms": 0.0,
+            }
+        row["count"] += 1
+        row["authenticated"] += event.user_id is not None
+        row["latency_sum_ms"] += event.latency_ms
+        row["latency_max_ms"] = max(row["latency_max_ms"], event.latency_ms)
+    return list(groups.values())
+
+
+async def flush(session_maker) -> int:
+    """버퍼를 비워 집계 행 INSERT, 저장한 이벤트 수 반환 (실패하면 이벤트는 버림 - 분석용 데이터)"""
+    events = buffer.drain()
+    if not events:
+        return 0
+    rows = rollup(events)
+    try:
+        async with session_maker() as db:
+            await db.execute(insert(models.AnalyticsRollup), rows)
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"Analytics flush failed, dropped {len(events)} events: {e}")
+        return 0
+    before = _compact_before()
+    await _mark_late(row["bucket_start"] for row in rows if row["bucket_start"] < before)
+    return len(events)
+
+
+async def compact(db: AsyncSession, start: datetime, end: datetime) -> int:
+    """
+    [start, end) 버킷의 행을 키별 1행으로 합침 (한 트랜잭션), 줄어든 행 수 반환
+    - 읽기 시작할 때의 마지막 id까지만 합치고 지움 -> 그 사이 flush된 행은 건드리지 않음
+    """
+    AR = models.AnalyticsRollup
+    conditions = [AR.bucket_start >= start, AR.bucket_start < end]
+    last_id = (await db.execute(select(func.max(AR.id)).where(*conditions))).scalar()
+    if last_id is None:
+        return 0
+    conditions.append(AR.id <= last_id)
+    rows = (await db.execute(
+        select(
+            AR.bucket_start, AR.method, AR.route, AR.status,
+            func.sum(AR.count), func.sum(AR.authenticated), func.sum(AR.latency_sum_ms), func.max(AR.latency_max_ms),
+            func.count(AR.id),
+        )
+        .where(*conditions)
+        .group_by(AR.bucket_start, AR.method, AR.route, AR.status)
+    )).all()
+    if all(row[-1] == 1 for row in rows):
+        return 0
+    await db.execute(delete(AR).where(*conditions))
+    await db.execute(insert(AR), [
+        {
+            "bucket_start": bucket, "method": method, "route": route, "status": status,
+            "count": count, "authenticated": authenticated,
+            "latency_sum_ms": latency_sum, "latency_max_ms": latency_max,
+        }
+        for bucket, method, route, status, count, authenticated, latency_sum, latency_max, _ in rows
+    ])
+    await db.commit()
+    return sum(row[-1] for row in rows) - len(rows)
+
+
+# ------------------------------------------
+# 조회
+# ------------------------------------------
+def _empty() -> dict:
+    return {"visits": 0, "signups": 0, "enrollments": 0}
+
+
+async def _totals(db: AsyncSession, start: datetime, end: datetime) -> List[Tuple[datetime, str, str, int, int]]:
+    AR = models.AnalyticsRollup
+    result = await db.execute(
+        select(AR.bucket_start, AR.method, AR.route, AR.status, func.sum(AR.count))
+        .where(AR.bucket_start >= start, AR.bucket_start < end)
+        .group_by(AR.bucket_start, AR.method, AR.route, AR.status)
+    )
+    return result.all()
+
+
+def _accumulate(target: dict, method: str, route: str, status: int, count: int) -> None:
+    target["visits"] += count
+    if 200 <= status < 300:
+        for metric, key in METRIC_ROUTES.items():
+            if (method, route) == key:
+                target[metric] += count
+
+
+async def daily(db: AsyncSession, days: int = 7, today: Optional[date] = None) -> Dict[str, dict]:
+    """최근 days일 {YYYY-MM-DD: {visits, signups, enrollments}} (오래된 날짜부터)"""
+    today = today or datetime.utcnow().date()
+    first = today - timedelta(days=days - 1)
+    stats = {(first + timedelta(days=i)).isoformat(): _empty() for i in range(days)}
+    start = datetime.combine(first, datetime.min.time())
+    for bucket, method, route, status, count in await _totals(db, start, start + timedelta(days=days)):
+        _accumulate(stats[bucket.date().isoformat()], method, route, status, int(count))
+    return stats
+
+
+async def hourly(db: AsyncSession, day: date) -> Dict[str, dict]:
+    """하루의 {HH:00: {visits, signups, enrollments}}"""
+    stats = {f"{hour:02d}:00": _empty() for hour in range(24)}
+    start = datetime.combine(day, datetime.min.time())
+    for bucket, method, route, status, count in await _totals(db, start, start + timedelta(days=1)):
+        _accumulate(stats[f"{bucket.hour:02d}:00"], method, route, status, int(count))
+    return stats
+
+
+# ------------------------------------------
+# 주기적 flush (lifespan)
+# ------------------------------------------
+class AnalyticsFlusher:
+    def __init__(self, session_maker):
+        self.session_maker = session_maker
+        self._task: Optional[asyncio.Task] = None
+        self._compacted_before: Optional[datetime] = None
+
+    async def _compact_closed_hours(self) -> None:
+        """
+        정시가 지나면 방금 닫힌 1시간 버킷만 한 번 합침 (Redis가 있으면 워커 중 하나만)
+        - 다른 워커가 아직 flush하지 않은 직전 시간 이벤트와 겹치지 않도록 1시간 여유를 둠
+        - 이어서 늦게 행이 들어온 이전 버킷을 버킷별로 다시 합침
+        """
+        before = _compact_before()
+        if self._compacted_before == before:
+            return
+        self._compacted_before = before
+        client = cache.redis_client
+        if client is not None:
+            try:
+                if not await client.set(COMPACT_LOCK_KEY.format(before.isoformat()), "1", ex=3600, nx=True):
+                    return
+            except Exception:
+                return
+        hour = timedelta(hours=1)
+        async with self.session_maker() as db:
+            await compact(db, before - hour, before)
+            for bucket in await _pop_late():
+                await compact(db, bucket, bucket + hour)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(_flush_wanted.wait(), timeout=settings.ANALYTICS_FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            _flush_wanted.clear()
+            try:
+                await flush(self.session_maker)
+                await self._compact_closed_hours()
+            except Exception as e:
+                logger.warning(f"Analytics flush loop error: {e}")
+
+    def start(self) -> None:
+        if settings.ANALYTICS_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            # 종료 직전 남은 이벤트 저장
+            await flush(self.session_maker)
@@ -0,0 +1,111 @@
+# backend/src/archive.py
+"""
+소프트 삭제 행 보관 (enrollments / reviews -> *_archive)
+
+- move(): 조건에 맞는 행을 INSERT ... SELECT + DELETE 두 statement로 보관 테이블에 옮김 (행을 메모리에 올리지 않음)
+  - 강의 삭제(src.deletion)처럼 원본 행을 바로 치워야 하는 경우에도 사용
+- archive_deleted(): SOFT_DELETE_RETENTION_DAYS 전에 삭제된 행을 ARCHIVE_BATCH_SIZE씩 id 순서로 옮김
+  - 청크마다 commit -> 큰 테이블에서도 한 트랜잭션이 오래 락을 잡지 않음
+- Archiver: ARCHIVE_INTERVAL_SECONDS마다 실행 (lifespan start/stop, Redis가 있으면 워커 중 하나만)
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import cache, models
+from src.config import settings
+from src.soft_delete import INCLUDE_DELETED
+
+logger = logging.getLogger(__name__)
+
+ARCHIVES = {
+    models.Enrollment: models.EnrollmentArchive,
+    models.Review: models.ReviewArchive,
+}
+LOCK_KEY = "archive:lock"
+# 보관 작업은 삭제 행을 다루므로 소프트 삭제 필터 제외, 세션 identity map 동기화 생략
+_OPTIONS = {INCLUDE_DELETED: True, "synchronize_session": False}
+
+
+async def move(db: AsyncSession, model, *conditions) -> int:
+    """conditions에 맞는 model 행을 보관 테이블로 이동, 옮긴 행 수 반환 (commit은 호출한 쪽에서)"""
+    source = model.__table__
+    columns = [column.name for column in source.columns]
+    await db.execute(
+        insert(ARCHIVES[model].__table__)
+        .from_select(columns, select(*source.columns).where(*conditions))
+        .execution_options(**_OPTIONS)
+    )
+    result = await db.execute(delete(source).where(*conditions).execution_options(**_OPTIONS))
+    return result.rowcount
+
+
+async def archive_deleted(session_maker, before: Optional[datetime] = None, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """before(기본: 보관 기간) 이전에 삭제된 행을 청크 단위로 이동, {테이블: 옮긴 행 수}"""
+    before = before or datetime.utcnow() - timedelta(days=settings.SOFT_DELETE_RETENTION_DAYS)
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    moved: Dict[str, int] = {}
+    for model in ARCHIVES:
+        total = 0
+        while True:
+            async with session_maker() as db:
+                ids = (await db.execute(
+                    select(model.id)
+                    .where(model.deleted_at.is_not(None), model.deleted_at < before)
+                    .order_by(model.id)
+                    .limit(batch_size)
+                    .execution_options(**_OPTIONS)
+                )).scalars().all()
+                if ids:
+                    await move(db, model, model.id.in_(ids))
+                    await db.commit()
+            total += len(ids)
+            if len(ids) < batch_size:
+                break
+            # 청크 사이에 다른 요청에 이벤트 루프 / DB 락 양보
+            await asyncio.sleep(0)
+        moved[model.__tablename__] = total
+    return moved
+
+
+class Archiver:
+    def __init__(self, session_maker):
+        self.session_maker = session_maker
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run_once(self) -> None:
+        client = cache.redis_client
+        if client is not None:
+            try:
+                if not await client.set(LOCK_KEY, "1", ex=int(settings.ARCHIVE_INTERVAL_SECONDS), nx=True):
+                    return
+            except Exception:
+                return
+        moved = await archive_deleted(self.session_maker)
+        if any(moved.values()):
+            logger.info("Archived soft-deleted rows", extra={"moved": moved})
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
+            try:
+                await self._run_once()
+            except Exception as e:
+                logger.warning(f"Archive run failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
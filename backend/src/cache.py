@@ -0,0 +1,86 @@
+# backend/src/cache.py
+"""
+Redis 클라이언트 공용 보관소 + 프로세스 로컬 LRU 캐시
+
+- redis_client는 main.lifespan에서 init_redis()로 연결하고, 라우터/서비스는 cache.redis_client로 사용합니다.
+- Redis 연결이 없으면(테스트, 로컬 개발) redis_client는 None 이므로 호출 측에서 폴백 처리해야 합니다.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import redis.asyncio as redis
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+redis_client: Optional[redis.Redis] = None
+
+
+async def init_redis() -> Optional[redis.Redis]:
+    """Redis 연결 (실패해도 서버는 계속 뜨도록 경고만 남김)"""
+    global redis_client
+    try:
+        redis_client = redis.from_url(
+            settings.REDIS_URL,
+            encoding="utf-8",
+            decode_responses=True,
+            socket_connect_timeout=3
+        )
+        await redis_client.ping()
+        logger.info("✅ Redis Connected!")
+    except Exception as e:
+        logger.warning(f"❌ Redis Connection Failed: {e}")
+    return redis_client
+
+
+async def close_redis() -> None:
+    global redis_client
+    if redis_client:
+        await redis_client.close()
+        redis_client = None
+        logger.info("🛑 Redis Closed.")
+
+
+class LocalTTLCache:
+    """
+    프로세스(워커) 로컬 LRU + TTL 캐시
+    - 이벤트 루프 안에서만 사용 (스레드 안전하지 않음)
+    - maxsize를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,375 @@
+# backend/src/catalog_io.py
+"""
+강의 카탈로그 내보내기 / 가져오기 (NDJSON / CSV)
+
+레코드: 한 줄(행)에 하나, type으로 구분 - course / lecture / enrollment(선택) / review(선택)
+- 필드는 src.schemas.Catalog*Record, CSV는 CATALOG_FIELDS 컬럼의 합집합 (해당 없는 칸은 비움)
+- 회원은 이메일, 카테고리는 이름으로 기록 -> 다른 DB로 옮겨도 id가 아닌 값으로 다시 연결
+- 강의 / 차시 / 수강 / 수강평은 원본 id를 유지 (같은 파일을 다시 가져오면 갱신)
+
+내보내기 - export_stream()
+- 테이블마다 서버 사이드 커서(db.stream + yield_per)로 CATALOG_EXPORT_CHUNK_SIZE씩 읽어 바로 직렬화
+  -> 카탈로그 크기와 관계없이 메모리 사용량 일정 (커서는 한 번에 하나만 열림)
+- 순서: 강의 전체 -> 차시 -> 수강 -> 수강평 (가져올 때 부모가 먼저 들어가도록)
+
+가져오기 - import_file()
+- 파일을 줄 단위로 읽어 검증하고 CATALOG_IMPORT_BATCH_SIZE개씩 upsert 후 commit (파일 전체를 메모리에 올리지 않음)
+  - upsert: 배치의 id 중 이미 있는 id를 한 번 조회 -> 새 행은 bulk INSERT, 기존 행은 PK 기준 bulk UPDATE
+  - 이메일 / 카테고리 이름 / 부모 강의는 배치마다 IN 조회 한 번으로 확인
+- 검증 실패 / 없는 회원 / 없는 강의를 참조하는 레코드는 건너뛰고 errors에 기록 (처음 MAX_REPORTED_ERRORS개)
+- 없는 카테고리는 새로 만듦
+- dry_run: 같은 검증과 statement를 실행하고 배치마다 rollback
+  (앞 배치에서 새로 만들 강의를 참조하는 행을 거부하지 않도록 파일에서 본 강의 id는 기억)
+"""
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import category_registry, invalidation, models, schemas
+from src.config import settings
+from src.serializers import json_dumps
+from src.soft_delete import INCLUDE_DELETED
+
+FORMATS = ("ndjson", "csv")
+OPTIONAL_RECORDS = ("enrollments", "reviews")
+CATALOG_FIELDS = [
+    "type", "id", "course_id", "title", "description", "price", "level", "thumbnail_url", "is_public",
+    "category", "instructor_email", "video_url", "order_index", "user_email", "status", "enrolled_at",
+    "rating", "comment", "created_at",
+]
+MAX_REPORTED_ERRORS = 100
+
+_record = TypeAdapter(schemas.CatalogRecord)
+
+
+# ------------------------------------------
+# 내보내기
+# ------------------------------------------
+def _course_records(rows) -> List[dict]:
+    return [
+        {
+            "type": "course", "id": row.id, "title": row.title, "description": row.description,
+            "price": row.price, "level": row.level, "thumbnail_url": row.thumbnail_url, "is_public": row.is_public,
+            "category": (category_registry.get(row.category_id) or {}).get("name"),
+            "instructor_email": row.instructor_email,
+        }
+        for row in rows
+    ]
+
+
+def _lecture_records(rows) -> List[dict]:
+    return [
+        {
+            "type": "lecture", "id": row.id, "course_id": row.course_id, "title": row.title,
+            "video_url": row.video_url, "order_index": row.order_index,
+        }
+        for row in rows
+    ]
+
+
+def _enrollment_records(rows) -> List[dict]:
+    return [
+        {
+            "type": "enrollment", "id": row.id, "course_id": row.course_id, "user_email": row.email,
+            "status": row.status, "enrolled_at": row.enrolled_at,
+        }
+        for row in rows
+    ]
+
+
+def _review_records(rows) -> List[dict]:
+    return [
+        {
+            "type": "review", "id": row.id, "course_id": row.course_id, "user_email": row.email,
+            "rating": row.rating, "comment": row.comment, "created_at": row.created_at,
+        }
+        for row in rows
+    ]
+
+
+def _export_queries(include: Iterable[str]):
+    """(select, 레코드 변환 함수) - 부모 테이블부터"""
+    C, L, E, R, U = models.Course, models.Lecture, models.Enrollment, models.Review, models.User
+    queries = [
+        (
+            select(C.id, C.title, C.description, C.price, C.level, C.thumbnail_url, C.is_public, C.category_id,
+                   U.email.label("instructor_email"))
+            .outerjoin(U, C.instructor_id == U.id)
+            .order_by(C.id),
+            _course_records,
+        ),
+        (
+            select(L.id, L.course_id, L.title, L.video_url, L.order_index)
+            .where(L.course_id.is_not(None))
+            .order_by(L.course_id, L.order_index, L.id),
+            _lecture_records,
+        ),
+    ]
+    # 회원이 없는(탈퇴로 참조가 정리된) 행은 다른 DB에서 연결할 수 없으므로 제외
+    if "enrollments" in include:
+        queries.append((
+            select(E.id, E.course_id, E.status, E.enrolled_at, U.email)
+            .join(U, E.user_id == U.id)
+            .where(E.course_id.is_not(None))
+            .order_by(E.id),
+            _enrollment_records,
+        ))
+    if "reviews" in include:
+        queries.append((
+            select(R.id, R.course_id, R.rating, R.comment, R.created_at, U.email)
+            .join(U, R.user_id == U.id)
+            .where(R.course_id.is_not(None))
+            .order_by(R.id),
+            _review_records,
+        ))
+    return queries
+
+
+async def export_records(db: AsyncSession, include: Iterable[str] = ()) -> AsyncIterator[List[dict]]:
+    """CATALOG_EXPORT_CHUNK_SIZE개씩 레코드 dict 리스트를 생성"""
+    # 카테고리 이름은 레지스트리에서 (스트리밍 중에는 같은 세션으로 다른 쿼리를 실행하지 않음)
+    await category_registry.ensure(db)
+    for query, to_records in _export_queries(include):
+        result = await db.stream(query.execution_options(yield_per=settings.CATALOG_EXPORT_CHUNK_SIZE))
+        async for partition in result.partitions():
+            yield to_records(partition)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def export_stream(db: AsyncSession, fmt: str = "ndjson", include: Iterable[str] = ()) -> AsyncIterator[bytes]:
+    """직렬화된 청크(bytes) 생성 - StreamingResponse / CLI 파일 쓰기에 그대로 사용"""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CATALOG_FIELDS)
+        writer.writeheader()
+        async for records in export_records(db, include):
+            for record in records:
+                writer.writerow({key: _csv_value(value) for key, value in record.items()})
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+        yield buffer.getvalue().encode("utf-8")
+    else:
+        async for records in export_records(db, include):
+            yield b"".join(json_dumps(record) + b"\n" for record in records)
+
+
+# ------------------------------------------
+# 가져오기
+# ------------------------------------------
+@dataclass
+class ImportReport:
+    dry_run: bool = False
+    processed: int = 0
+    rejected: int = 0
+    counts: Dict[str, Dict[str, int]] = field(default_factory=lambda: {
+        table: {"inserted": 0, "updated": 0} for table in ("courses", "lectures", "enrollments", "reviews")
+    })
+    categories_created: int = 0
+    errors: List[dict] = field(default_factory=list)
+
+    def reject(self, line: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    def as_dict(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "processed": self.processed,
+            "rejected": self.rejected,
+            **self.counts,
+            "categories_created": self.categories_created,
+            "errors": self.errors,
+        }
+
+
+def read_lines(f, fmt: str) -> Iterator[Tuple[int, object]]:
+    """텍스트 파일 -> (줄 번호, 원본 레코드) - NDJSON은 문자열, CSV는 빈 칸을 뺀 dict"""
+    if fmt == "csv":
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}
+    else:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                yield number, line
+
+
+def _parse(raw):
+    if isinstance(raw, dict):
+        return _record.validate_python(raw)
+    return _record.validate_json(raw)
+
+
+def _validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
+
+
+async def _user_ids(db: AsyncSession, emails: Set[str]) -> Dict[str, int]:
+    if not emails:
+        return {}
+    rows = await db.execute(select(models.User.email, models.User.id).where(models.User.email.in_(emails)))
+    return dict(rows.all())
+
+
+async def _category_ids(db: AsyncSession, names: Set[str], report: ImportReport) -> Dict[str, int]:
+    if not names:
+        return {}
+    found = dict((await db.execute(
+        select(models.Category.name, models.Category.id).where(models.Category.name.in_(names))
+    )).all())
+    missing = names - set(found)
+    if missing:
+        await db.execute(insert(models.Category), [{"name": name} for name in sorted(missing)])
+        report.categories_created += len(missing)
+        found.update((await db.execute(
+            select(models.Category.name, models.Category.id).where(models.Category.name.in_(missing))
+        )).all())
+    return found
+
+
+async def _existing_ids(db: AsyncSession, model, ids: Iterable[int]) -> Set[int]:
+    ids = set(ids)
+    if not ids:
+        return set()
+    result = await db.execute(select(model.id).where(model.id.in_(ids)).execution_options(**{INCLUDE_DELETED: True}))
+    return set(result.scalars())
+
+
+async def _upsert(db: AsyncSession, model, rows: List[dict], report: ImportReport) -> None:
+    """PK 기준 upsert - 새 행 bulk INSERT, 기존 행 bulk UPDATE (배치 안 중복 id는 마지막 값)"""
+    if not rows:
+        return
+    rows = list({row["id"]: row for row in rows}.values())
+    existing = await _existing_ids(db, model, (row["id"] for row in rows))
+    new_rows = [row for row in rows if row["id"] not in existing]
+    old_rows = [row for row in rows if row["id"] in existing]
+    if new_rows:
+        await db.execute(insert(model), new_rows)
+    if old_rows:
+        await db.execute(update(model), old_rows)
+    counts = report.counts[model.__tablename__]
+    counts["inserted"] += len(new_rows)
+    counts["updated"] += len(old_rows)
+
+
+class CatalogImporter:
+    def __init__(self, db: AsyncSession, dry_run: bool = False):
+        self.db = db
+        self.report = ImportReport(dry_run=dry_run)
+        # dry_run은 배치마다 rollback하므로 파일에서 본 강의 id를 기억해 뒤 배치의 자식 행 검증에 사용
+        self._planned_courses: Optional[Set[int]] = set() if dry_run else None
+
+    async def apply(self, batch: List[Tuple[int, object]]) -> None:
+        """검증된 레코드 배치를 부모 -> 자식 순서로 upsert"""
+        by_type: Dict[str, list] = {"course": [], "lecture": [], "enrollment": [], "review": []}
+        for number, record in batch:
+            by_type[record.type].append((number, record))
+        await self._courses(by_type["course"])
+        children = by_type["lecture"] + by_type["enrollment"] + by_type["review"]
+        if not children:
+            return
+        course_ids = await _existing_ids(self.db, models.Course, (record.course_id for _, record in children))
+        if self._planned_courses is not None:
+            course_ids |= self._planned_courses
+        user_ids = await _user_ids(
+            self.db, {record.user_email for _, record in by_type["enrollment"] + by_type["review"]}
+        )
+        await _upsert(self.db, models.Lecture, [
+            record.model_dump(exclude={"type"})
+            for number, record in by_type["lecture"] if self._known_course(number, record, course_ids)
+        ], self.report)
+        for kind, model in (("enrollment", models.Enrollment), ("review", models.Review)):
+            rows = []
+            for number, record in by_type[kind]:
+                if not self._known_course(number, record, course_ids):
+                    continue
+                user_id = user_ids.get(record.user_email)
+                if user_id is None:
+                    self.report.reject(number, f"Unknown user '{record.user_email}'")
+                    continue
+                row = record.model_dump(exclude={"type", "user_email"}, exclude_none=True)
+                rows.append({**row, "user_id": user_id, "deleted_at": None})
+            await _upsert(self.db, model, rows, self.report)
+
+    def _known_course(self, number: int, record, course_ids: Set[int]) -> bool:
+        if record.course_id in course_ids:
+            return True
+        self.report.reject(number, f"Unknown course {record.course_id}")
+        return False
+
+    async def _courses(self, courses: list) -> None:
+        if not courses:
+            return
+        category_ids = await _category_ids(self.db, {r.category for _, r in courses if r.category}, self.report)
+        instructor_ids = await _user_ids(self.db, {r.instructor_email for _, r in courses if r.instructor_email})
+        rows = []
+        for number, record in courses:
+            if record.instructor_email and record.instructor_email not in instructor_ids:
+                self.report.reject(number, f"Unknown instructor '{record.instructor_email}'")
+                continue
+            row = record.model_dump(exclude={"type", "category", "instructor_email"})
+            row["category_id"] = category_ids.get(record.category)
+            row["instructor_id"] = instructor_ids.get(record.instructor_email)
+            rows.append(row)
+            if self._planned_courses is not None:
+                self._planned_courses.add(record.id)
+        await _upsert(self.db, models.Course, rows, self.report)
+
+    async def flush(self, batch: List[Tuple[int, object]]) -> None:
+        try:
+            await self.apply(batch)
+        except Exception:
+            await self.db.rollback()
+            raise
+        if self.report.dry_run:
+            await self.db.rollback()
+        else:
+            await self.db.commit()
+
+
+async def import_file(
+    db: AsyncSession, f, fmt: str = "ndjson", batch_size: Optional[int] = None, dry_run: bool = False,
+) -> dict:
+    """텍스트 파일 객체에서 레코드를 읽어 배치 upsert, 결과 요약(ImportReport.as_dict) 반환"""
+    batch_size = batch_size or settings.CATALOG_IMPORT_BATCH_SIZE
+    importer = CatalogImporter(db, dry_run=dry_run)
+    report = importer.report
+    batch: List[Tuple[int, object]] = []
+    for number, raw in read_lines(f, fmt):
+        report.processed += 1
+        try:
+            batch.append((number, _parse(raw)))
+        except ValidationError as e:
+            report.reject(number, _validation_message(e))
+            continue
+        if len(batch) >= batch_size:
+            await importer.flush(batch)
+            batch = []
+    if batch:
+        await importer.flush(batch)
+
+    if not dry_run:
+        # 강의 목록 / 카테고리 캐시를 모든 워커에서 비움
+        await invalidation.publish("course")
+        if report.categories_created:
+            await invalidation.publish("category")
+    return report.as_dict()
@@ -0,0 +1,108 @@
+# backend/src/category_registry.py
+"""
+카테고리 레지스트리 (워커 메모리 스냅샷)
+
+- 카테고리는 관리자만 바꾸는 몇 개 안 되는 행이므로 워커 메모리에 {id: {"id", "name"}}로 들고 있습니다.
+  - GET /categories 응답
+  - 강의 응답의 category 필드 (강의 조회 쿼리에서 categories JOIN / selectinload 제거)
+- 기동 시(lifespan) warm()으로 한 번 로딩, 이후
+  - create_category: 로컬 스냅샷 갱신 + 무효화 버스(src.invalidation)로 "category" 변경 알림
+  - 다른 워커는 알림을 받으면 스냅샷을 stale로 표시 -> 다음 ensure()에서 DB 재로딩
+    (메시지 유실 / 재구독은 버스의 버전 스탬프 확인이 전체 무효화로 처리)
+- 스냅샷에 없는 id를 만나면(DB에 직접 넣은 경우 등) ensure()가 한 번 재로딩합니다.
+- 재로딩은 warm()에 넘긴 primary 세션 팩토리로 합니다. (요청의 replica 세션을 쓰면 지연된 replica에서
+  새 카테고리 없이 _loaded=True가 되어 다음 무효화 전까지 반영되지 않음)
+  - warm() 전(테스트 / 배치 스크립트)에는 넘겨받은 세션으로 로딩
+"""
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from src import invalidation, models
+
+logger = logging.getLogger(__name__)
+
+_by_id: Dict[int, dict] = {}
+# 재로딩 후에도 없던 id (끊어진 FK 등) - 매 요청 재로딩 방지, 다음 로딩 때 초기화
+_unknown: Set[int] = set()
+_loaded = False
+_load_lock = asyncio.Lock()
+# 재로딩용 primary 세션 팩토리 (warm()에서 설정)
+_session_maker = None
+
+
+def _entry(category_id: int, name: str) -> dict:
+    return {"id": category_id, "name": name}
+
+
+async def load(db: AsyncSession) -> int:
+    """DB에서 전체 카테고리를 읽어 스냅샷을 통째로 교체"""
+    global _by_id, _unknown, _loaded
+    result = await db.execute(select(models.Category.id, models.Category.name))
+    _by_id = {category_id: _entry(category_id, name) for category_id, name in result}
+    _unknown = set()
+    _loaded = True
+    return len(_by_id)
+
+
+async def ensure(db: AsyncSession, category_ids: Iterable[Optional[int]] = ()) -> None:
+    """스냅샷이 비어 있거나 모르는 id가 있으면 한 번 재로딩"""
+    missing = {cid for cid in category_ids if cid is not None and cid not in _by_id and cid not in _unknown}
+    if _loaded and not missing:
+        return
+    async with _load_lock:
+        missing = {cid for cid in missing if cid not in _by_id}
+        if _loaded and not missing:
+            return
+        if _session_maker is not None:
+            async with _session_maker() as primary:
+                await load(primary)
+        else:
+            await load(db)
+        _unknown.update(cid for cid in missing if cid not in _by_id)
+
+
+def get(category_id: Optional[int]) -> Optional[dict]:
+    if category_id is None:
+        return None
+    return _by_id.get(category_id)
+
+
+def list_all() -> List[dict]:
+    return [_by_id[cid] for cid in sorted(_by_id)]
+
+
+async def publish(category: models.Category) -> None:
+    """카테고리 생성/변경 후 호출 - 이 워커는 즉시 반영, 다른 워커에는 무효화 버스로 전파"""
+    _by_id[category.id] = _entry(category.id, category.name)
+    _unknown.discard(category.id)
+    await invalidation.publish("category", category.id)
+
+
+@invalidation.on("category")
+async def _on_category_changed(event: invalidation.Event) -> None:
+    global _loaded
+    if not event.local or event.id is None:
+        # 다른 워커의 변경(또는 유실 감지): 다음 조회 때 DB에서 다시 읽음
+        _loaded = False
+
+
+async def warm(session_maker) -> None:
+    """기동 시 로딩 (실패해도 첫 조회 때 다시 시도), 이후 재로딩도 이 세션 팩토리로"""
+    global _session_maker
+    _session_maker = session_maker
+    try:
+        async with session_maker() as db:
+            async with _load_lock:
+                await load(db)
+    except Exception as e:
+        logger.warning(f"Category registry load failed (will load on first use): {e}")
+
+
+def reset() -> None:
+    """테스트용: 스냅샷 초기화"""
+    global _by_id, _unknown, _loaded, _session_maker
+    _by_id, _unknown, _loaded, _session_maker = {}, set(), False, None
@@ -0,0 +1,172 @@
+# backend/src/compression.py
+"""
+응답 압축 미들웨어 (gzip / brotli)
+
+- Accept-Encoding 협상: br(brotli 설치 시) > gzip > 무압축
+- minimum_size보다 작은 응답, 이미 압축된 미디어(이미지/영상/zip 등), Content-Encoding이 있는 응답은 그대로 전달
+- StreamingResponse(내보내기 등)는 청크 단위로 이어서 압축
+"""
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli는 선택 의존성
+    brotli = None
+
+# 이미 압축된 포맷 (files.get_file로 서빙되는 이미지 등) - 다시 압축해도 크기가 줄지 않음
+EXCLUDED_CONTENT_TYPES = (
+    "image/png", "image/jpeg", "image/gif", "image/webp", "image/avif",
+    "video/", "audio/", "font/woff", "font/woff2",
+    "application/zip", "application/gzip", "application/x-gzip", "application/pdf",
+    "text/event-stream",
+)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding 헤더에서 사용할 인코딩 선택 (q=0은 거부로 처리)"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            accepted[token] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def is_excluded(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    return any(media_type.startswith(excluded) for excluded in EXCLUDED_CONTENT_TYPES)
+
+
+class _Compressor:
+    """gzip / brotli 스트리밍 압축기 공통 인터페이스"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=16+MAX_WBITS -> gzip 헤더/트레일러 포함
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._br.process(data)
+        return self._gz.compress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return self._br.finish()
+        return self._gz.flush()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.compressor: Optional[_Compressor] = None
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_length = headers.get("content-length")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 206, 304)
+                or is_excluded(headers.get("content-type", ""))
+                # BaseHTTPMiddleware를 거치면 본문이 여러 청크로 오므로 Content-Length로 먼저 판단
+                or (content_length is not None and int(content_length) < self.middleware.minimum_size)
+            )
+            if self.passthrough:
+                await self._send(message)
+            else:
+                # 본문 크기를 보고 헤더를 정해야 하므로 start는 잠시 보류
+                self.start_message = message
+            return
+
+        if self.passthrough or message_type != "http.response.body":
+            if self.start_message is not None:
+                # pathsend 등 본문 메시지가 아닌 경우: 보류했던 start를 그대로 전송
+                await self._send(self.start_message)
+                self.start_message = None
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.middleware.minimum_size:
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self.compressor = _Compressor(
+                self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+            )
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                del headers["Content-Length"]
+            compressed = self.compressor.compress(body)
+            if not more_body:
+                compressed += self.compressor.flush()
+                headers["Content-Length"] = str(len(compressed))
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            return
+
+        if self.compressor is None:
+            # 작은 응답으로 판단해 이미 원본을 보낸 경우
+            await self._send(message)
+            return
+
+        compressed = self.compressor.compress(body)
+        if not more_body:
+            compressed += self.compressor.flush()
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
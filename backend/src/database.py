@@ -1,6 +1,16 @@
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import Request
+from jose import jwt, JWTError
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from src.config import settings
+from src import cache
+
+logger = logging.getLogger(__name__)
 
 # DB URL 설정
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
@@ -8,22 +18,169 @@ SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 # 엔진 생성
 engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
-    echo=True, # 쿼리 로그 확인용 (운영 시에는 False 권장)
+    echo=settings.SQL_ECHO, # 쿼리 로그 확인용 (SQL_ECHO=true)
     future=True
 )
 
 # [핵심 수정] expire_on_commit=False 설정을 반드시 추가해야 합니다!
 # 이 설정이 있어야 commit 후에도 객체 데이터가 메모리에 남아있어 에러가 안 납니다.
 async_session_maker = sessionmaker(
-    engine, 
-    class_=AsyncSession, 
+    engine,
+    class_=AsyncSession,
     expire_on_commit=False,  # <--- 이 부분이 누락되어 있었습니다.
     autoflush=False
 )
 
+# --- 읽기 전용 복제본(Replica) ---
+# DATABASE_REPLICA_URL이 없으면 읽기도 primary로 보냅니다.
+read_engine = (
+    create_async_engine(settings.DATABASE_REPLICA_URL, echo=settings.SQL_ECHO, future=True)
+    if settings.DATABASE_REPLICA_URL else None
+)
+read_session_maker = (
+    sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    if read_engine is not None else None
+)
+
 Base = declarative_base()
 
 # 의존성 주입 함수
 async def get_db():
     async with async_session_maker() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def dispose_engines():
+    """커넥션 풀 정리 (lifespan 종료 시)"""
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
+def get_session_factory():
+    """
+    여러 세션을 직접 열어야 하는 엔드포인트용 (예: 병렬 쿼리)
+    - 테스트에서는 dependency_overrides로 교체
+    """
+    return async_session_maker
+
+
+# ==========================================
+# 읽기/쓰기 라우팅
+# ==========================================
+STICKY_KEY = "db:sticky:{}"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# 워커 로컬 스티키 캐시 (같은 워커로 온 요청은 Redis 조회 없이 판단)
+_sticky_local = cache.LocalTTLCache(maxsize=10000)
+
+
+class ReplicaHealth:
+    """복제 지연(lag) 상태 - lifespan의 백그라운드 태스크가 주기적으로 갱신"""
+
+    def __init__(self):
+        self.lag_seconds: Optional[float] = None
+        self.healthy = read_engine is not None
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self) -> None:
+        try:
+            async with read_engine.connect() as conn:
+                try:
+                    row = (await conn.execute(text("SHOW REPLICA STATUS"))).mappings().first()
+                    lag = row.get("Seconds_Behind_Source") if row else None
+                except Exception:
+                    # MySQL 8.0.22 미만
+                    row = (await conn.execute(text("SHOW SLAVE STATUS"))).mappings().first()
+                    lag = row.get("Seconds_Behind_Master") if row else None
+            # 복제가 멈췄으면(lag=NULL) 지연을 알 수 없으므로 primary 사용
+            self.lag_seconds = float(lag) if lag is not None else None
+            self.healthy = self.lag_seconds is not None and self.lag_seconds <= settings.REPLICA_MAX_LAG_SECONDS
+        except Exception as e:
+            self.lag_seconds = None
+            self.healthy = False
+            logger.warning(f"Replica health check failed: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.REPLICA_HEALTH_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        if read_engine is not None and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+replica_health = ReplicaHealth()
+
+
+def _token_subject(request: Request) -> Optional[str]:
+    """
+    라우팅 판단용으로만 토큰의 sub를 꺼냄 (서명 검증 X)
+    - 위조해도 primary로 읽게 될 뿐이므로 안전
+    """
+    auth = request.headers.get("authorization", "")
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+
+
+async def remember_write(request: Request) -> None:
+    """쓰기 요청 직후 일정 시간(REPLICA_STICKY_SECONDS) 동안 해당 유저의 읽기를 primary로 고정"""
+    if read_engine is None:
+        return
+    subject = _token_subject(request)
+    if subject is None:
+        return
+    ttl = settings.REPLICA_STICKY_SECONDS
+    _sticky_local.set(subject, True, ttl)
+    if cache.redis_client is not None:
+        try:
+            await cache.redis_client.set(STICKY_KEY.format(subject), "1", px=int(ttl * 1000))
+        except Exception as e:
+            logger.warning(f"Sticky write mark failed: {e}")
+
+
+async def _is_sticky(subject: str) -> bool:
+    if subject in _sticky_local:
+        return True
+    if cache.redis_client is None:
+        return False
+    try:
+        # 다른 워커에서 쓴 경우
+        return bool(await cache.redis_client.exists(STICKY_KEY.format(subject)))
+    except Exception:
+        return True
+
+
+async def choose_read_session_maker(request: Request):
+    """replica가 없거나, 지연이 크거나, 방금 쓴 유저면 primary"""
+    if read_session_maker is None or not replica_health.healthy:
+        return async_session_maker
+    subject = _token_subject(request)
+    if subject is not None and await _is_sticky(subject):
+        return async_session_maker
+    return read_session_maker
+
+
+async def get_read_db(request: Request):
+    """읽기 전용 엔드포인트용 세션 (replica 우선)"""
+    maker = await choose_read_session_maker(request)
+    async with maker() as session:
+        yield session
+
+
+async def get_read_session_factory(request: Request):
+    """읽기 전용 병렬 쿼리용 세션 팩토리 (replica 우선)"""
+    return await choose_read_session_maker(request)
@@ -0,0 +1,122 @@
+# backend/src/deletion.py
+"""
+set-based 삭제 서비스 (강의 / 회원)
+
+기존: db.delete(obj) -> ORM이 자식 행(차시 / 수강 / 수강평 / 강의)을 모두 읽어
+      1건씩 DELETE 하거나 FK를 NULL로 UPDATE (자식 수만큼 메모리 + statement)
+변경: 서버 쪽 statement로 처리 (행을 메모리에 올리지 않음)
+
+강의 - delete_course(): 요청 안에서 테이블마다 statement 하나
+- lectures: DELETE ... WHERE course_id = ?
+- enrollments / reviews: 보관 테이블로 이동 (src.archive.move) - 이력은 남기고 FK는 정리
+- course_recommendations: DB의 ON DELETE CASCADE
+
+회원 - 두 단계
+1) mark_user_deleted(): 요청 안에서 UPDATE 1개
+   - deleted_at 기록 -> 소프트 삭제 필터로 로그인 / 인증 / 조회에서 즉시 제외
+   - 이메일은 자리표시 값으로 바꿔 같은 이메일로 바로 재가입 가능
+2) purge_user(): 참조 정리 후 행 삭제 (강의 강사 / 수강 / 수강평의 FK를 NULL로 - 기존 ORM 동작과 같음)
+   - USER_DELETE_BATCH_SIZE씩 id 청크로 UPDATE, 청크마다 commit (수천 건이어도 긴 트랜잭션 / 락 없음)
+   - 탈퇴 / 관리자 삭제 모두 아웃박스 작업(user.deleted)으로 실행 (관리자 삭제는 purge=true면 요청 안에서)
+   - 여러 번 실행해도 안전 (아웃박스 재시도)
+   - 진행 상태: deletion_status()
+"""
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import archive, models
+from src.config import settings
+from src.soft_delete import INCLUDE_DELETED
+
+_OPTIONS = {"synchronize_session": False}
+# 회원을 참조하는 (모델, FK 컬럼)
+USER_REFERENCES = (
+    (models.Course, "instructor_id"),
+    (models.Enrollment, "user_id"),
+    (models.Review, "user_id"),
+)
+
+
+async def delete_course(db: AsyncSession, course_id: int) -> None:
+    """commit은 호출한 쪽에서 (아웃박스와 같은 트랜잭션)"""
+    await db.execute(
+        delete(models.Lecture).where(models.Lecture.course_id == course_id).execution_options(**_OPTIONS)
+    )
+    for model in archive.ARCHIVES:
+        await archive.move(db, model, model.course_id == course_id)
+    await db.execute(delete(models.Course).where(models.Course.id == course_id).execution_options(**_OPTIONS))
+
+
+async def mark_user_deleted(db: AsyncSession, user_id: int) -> bool:
+    """탈퇴 처리 1단계 (commit은 호출한 쪽에서), 이미 삭제 중이거나 없으면 False"""
+    result = await db.execute(
+        update(models.User)
+        .where(models.User.id == user_id, models.User.deleted_at.is_(None))
+        .values(deleted_at=datetime.utcnow(), email=f"deleted-{user_id}-{uuid.uuid4().hex[:12]}@deleted.invalid")
+        .execution_options(**_OPTIONS)
+    )
+    return result.rowcount > 0
+
+
+async def purge_user(session_maker, user_id: int, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """탈퇴 처리 2단계: 참조를 청크 단위로 NULL 처리한 뒤 회원 행 삭제, {테이블: 정리한 행 수}"""
+    batch_size = batch_size or settings.USER_DELETE_BATCH_SIZE
+    detached: Dict[str, int] = {}
+    for model, column_name in USER_REFERENCES:
+        column = getattr(model, column_name)
+        total = 0
+        while True:
+            async with session_maker() as db:
+                ids = (await db.execute(
+                    select(model.id).where(column == user_id).limit(batch_size)
+                    .execution_options(**{INCLUDE_DELETED: True})
+                )).scalars().all()
+                if ids:
+                    await db.execute(
+                        update(model).where(model.id.in_(ids)).values({column_name: None})
+                        .execution_options(**_OPTIONS)
+                    )
+                    await db.commit()
+            total += len(ids)
+            if len(ids) < batch_size:
+                break
+            # 청크 사이에 다른 요청에 이벤트 루프 / DB 락 양보
+            await asyncio.sleep(0)
+        detached[model.__tablename__] = total
+    async with session_maker() as db:
+        # 1단계(deleted_at)를 거친 회원만 삭제
+        await db.execute(
+            delete(models.User)
+            .where(models.User.id == user_id, models.User.deleted_at.is_not(None))
+            .execution_options(**_OPTIONS)
+        )
+        await db.commit()
+    return detached
+
+
+async def deletion_status(db: AsyncSession, user_id: int) -> Optional[dict]:
+    """
+    삭제 진행 상태
+    - PENDING: 1단계만 끝남, remaining = 아직 회원을 참조하는 행 수
+    - DELETED: 회원 행까지 삭제됨 (없는 id도 DELETED)
+    - 삭제 중이 아닌 회원이면 None
+    """
+    row = (await db.execute(
+        select(models.User.deleted_at).where(models.User.id == user_id).execution_options(**{INCLUDE_DELETED: True})
+    )).first()
+    if row is None:
+        return {"user_id": user_id, "status": "DELETED", "remaining": {}}
+    if row.deleted_at is None:
+        return None
+    remaining = {}
+    for model, column_name in USER_REFERENCES:
+        remaining[model.__tablename__] = (await db.execute(
+            select(func.count(model.id)).where(getattr(model, column_name) == user_id)
+            .execution_options(**{INCLUDE_DELETED: True})
+        )).scalar() or 0
+    return {"user_id": user_id, "status": "PENDING", "remaining": remaining, "deleted_at": row.deleted_at}
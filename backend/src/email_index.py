@@ -0,0 +1,159 @@
+# backend/src/email_index.py
+"""
+가입 이메일 존재 여부 캐시 (Redis Set)
+
+- check-email(키 입력마다 호출)과 회원가입 중복 확인이 MySQL을 거치지 않도록 Redis Set으로 응답합니다.
+- 회원가입 / 구글 로그인 신규 가입 / 회원 삭제 시 동기화합니다.
+- Set이 아직 채워지지 않았거나(ready 키 없음) Redis 장애 시에는 '불확실'로 보고 DB에서 확인합니다.
+"""
+import logging
+from typing import Optional
+
+from redis.exceptions import WatchError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from src import cache, models
+
+logger = logging.getLogger(__name__)
+
+EMAIL_SET_KEY = "users:emails"
+EMAIL_SET_READY_KEY = "users:emails:ready"
+EMAIL_SET_BUILD_LOCK_KEY = "users:emails:building"
+# 빌드(락) 중의 add/remove 기록 {email: "1"(추가) | "0"(제거)} - 교체 직후 새 Set에 반영
+EMAIL_SET_DELTA_KEY = "users:emails:delta"
+BUILD_LOCK_SECONDS = 300
+WARM_CHUNK_SIZE = 5000
+
+
+def _normalize(email: str) -> str:
+    # MySQL 기본 collation이 대소문자를 구분하지 않으므로 소문자로 통일
+    return email.strip().lower()
+
+
+async def warm(db: AsyncSession) -> Optional[int]:
+    """
+    users 테이블의 이메일로 Set을 (재)구성
+    - 여러 워커가 동시에 뜰 때 한 워커만 빌드하도록 NX 락 사용
+    - 임시 키에 채운 뒤 RENAME으로 통째로 교체 (빌드 중에도 기존 Set은 그대로 응답, 기존 Set의 오래된 값은 버림)
+    - 빌드 중 add()/remove()는 delta에도 기록 -> 교체와 같은 MULTI에서 새 Set에 반영
+      (DB를 읽은 뒤 가입/탈퇴한 이메일을 잃거나 되살리지 않음)
+    """
+    client = cache.redis_client
+    if client is None:
+        return None
+    try:
+        if await client.exists(EMAIL_SET_READY_KEY):
+            return None
+        if not await client.set(EMAIL_SET_BUILD_LOCK_KEY, "1", ex=BUILD_LOCK_SECONDS, nx=True):
+            return None
+
+        tmp_key = f"{EMAIL_SET_KEY}:tmp"
+        await client.delete(tmp_key, EMAIL_SET_DELTA_KEY)
+        count = 0
+        result = await db.stream(
+            select(models.User.email).execution_options(yield_per=WARM_CHUNK_SIZE)
+        )
+        async for partition in result.partitions():
+            emails = [_normalize(row.email) for row in partition]
+            await client.sadd(tmp_key, *emails)
+            count += len(emails)
+
+        async with client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    # 읽은 delta와 교체 사이에 add/remove가 끼어들면 WatchError -> 다시 읽음
+                    await pipe.watch(EMAIL_SET_DELTA_KEY)
+                    delta = await pipe.hgetall(EMAIL_SET_DELTA_KEY)
+                    pipe.multi()
+                    if count:
+                        pipe.rename(tmp_key, EMAIL_SET_KEY)
+                    else:
+                        pipe.delete(EMAIL_SET_KEY)
+                    added = [email for email, op in delta.items() if op == "1"]
+                    removed = [email for email, op in delta.items() if op == "0"]
+                    if added:
+                        pipe.sadd(EMAIL_SET_KEY, *added)
+                    if removed:
+                        pipe.srem(EMAIL_SET_KEY, *removed)
+                    pipe.delete(EMAIL_SET_DELTA_KEY)
+                    pipe.set(EMAIL_SET_READY_KEY, "1")
+                    pipe.delete(EMAIL_SET_BUILD_LOCK_KEY)
+                    await pipe.execute()
+                    break
+                except WatchError:
+                    pipe.reset()
+        logger.info(f"Email index warmed with {count} emails")
+        return count
+    except Exception as e:
+        logger.warning(f"Email index warm failed: {e}")
+        return None
+
+
+async def _record_delta(client, email: str, op: str) -> None:
+    """빌드 중이면 delta에 기록 - Set 변경보다 먼저 (교체가 그 사이에 일어나도 delta 또는 새 Set 중 한쪽에 남음)"""
+    if await client.exists(EMAIL_SET_BUILD_LOCK_KEY):
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.hset(EMAIL_SET_DELTA_KEY, email, op)
+            pipe.expire(EMAIL_SET_DELTA_KEY, BUILD_LOCK_SECONDS)
+            await pipe.execute()
+
+
+async def add(email: str) -> None:
+    client = cache.redis_client
+    if client is None:
+        return
+    try:
+        email = _normalize(email)
+        await _record_delta(client, email, "1")
+        await client.sadd(EMAIL_SET_KEY, email)
+    except Exception as e:
+        logger.warning(f"Email index add failed: {e}")
+
+
+async def remove(email: str) -> None:
+    client = cache.redis_client
+    if client is None:
+        return
+    try:
+        email = _normalize(email)
+        await _record_delta(client, email, "0")
+        await client.srem(EMAIL_SET_KEY, email)
+    except Exception as e:
+        # false-positive가 남을 수 있음 (회원가입은 verify_positive로 DB 재확인)
+        logger.warning(f"Email index remove failed: {e}")
+
+
+async def contains(email: str) -> Optional[bool]:
+    """True/False = 캐시로 확정, None = 불확실 (DB 확인 필요)"""
+    client = cache.redis_client
+    if client is None:
+        return None
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.exists(EMAIL_SET_READY_KEY)
+            pipe.sismember(EMAIL_SET_KEY, _normalize(email))
+            ready, member = await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Email index lookup failed: {e}")
+        return None
+    if not ready:
+        return None
+    return bool(member)
+
+
+async def email_exists(db: AsyncSession, email: str, verify_positive: bool = False) -> bool:
+    """
+    이메일 존재 여부
+    - 캐시가 확정 응답하면 DB를 조회하지 않음
+    - verify_positive=True: '존재함' 응답은 DB로 한 번 더 확인 (회원가입 거절처럼 오탐 비용이 큰 경우)
+    """
+    cached = await contains(email)
+    if cached is False or (cached is True and not verify_positive):
+        return cached
+
+    result = await db.execute(select(models.User.id).where(models.User.email == email))
+    exists = result.first() is not None
+    if exists and cached is None:
+        await add(email)
+    return exists
@@ -0,0 +1,158 @@
+# backend/src/google_auth.py
+"""
+Google(Firebase) ID 토큰 비동기 검증 서비스
+
+- firebase_auth.verify_id_token은 동기 함수라 이벤트 루프를 막고, 인증서를 네트워크로 가져올 수 있습니다.
+- 이 모듈은 Google 공개키(x509 인증서)를 Cache-Control max-age 동안 메모리에 캐싱하고,
+  서명 검증(RS256)은 스레드 풀에서 로컬로 수행합니다.
+- 테스트/오프라인 환경에서는 use_static_keys()로 고정 키 세트를 주입할 수 있습니다.
+- project_id는 첫 검증 시점에 확정합니다. (import 시점에 서비스 계정 키 파일을 읽지 않음)
+"""
+import asyncio
+import json
+import logging
+import re
+import time
+import urllib.request
+from typing import Dict, Optional
+
+from jose import jwt, JWTError
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+ISSUER_PREFIX = "https://securetoken.google.com/"
+DEFAULT_MAX_AGE = 3600
+# 모르는 kid가 들어왔을 때 강제 재조회 최소 간격 (잘못된 토큰으로 인한 과도한 요청 방지)
+MIN_REFRESH_INTERVAL = 60
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+class GoogleTokenError(Exception):
+    """ID 토큰 검증 실패"""
+
+
+def _parse_max_age(cache_control: Optional[str]) -> int:
+    if cache_control:
+        match = MAX_AGE_PATTERN.search(cache_control)
+        if match:
+            return int(match.group(1))
+    return DEFAULT_MAX_AGE
+
+
+def _fetch_certs(url: str, timeout: float = 5.0):
+    """(동기) 인증서 JSON + Cache-Control max-age 조회 - 스레드에서 실행"""
+    with urllib.request.urlopen(url, timeout=timeout) as res:
+        body = json.loads(res.read().decode("utf-8"))
+        return body, _parse_max_age(res.headers.get("Cache-Control"))
+
+
+class GoogleTokenVerifier:
+    def __init__(self, project_id: Optional[str] = None, certs_url: str = GOOGLE_CERTS_URL):
+        # None이면 첫 사용 시 설정/서비스 계정 키 파일에서 읽음
+        self._project_id = project_id
+        self.certs_url = certs_url
+        self._keys: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._static = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def project_id(self) -> str:
+        if self._project_id is None:
+            self._project_id = _resolve_project_id()
+        return self._project_id
+
+    @project_id.setter
+    def project_id(self, value: str) -> None:
+        self._project_id = value
+
+    def use_static_keys(self, keys: Dict[str, str], project_id: Optional[str] = None) -> None:
+        """오프라인 테스트용 고정 키 세트 (kid -> PEM 공개키/인증서). 네트워크 조회를 하지 않음"""
+        self._keys = dict(keys)
+        self._static = True
+        self._expires_at = float("inf")
+        if project_id is not None:
+            self.project_id = project_id
+
+    async def _refresh_keys(self, force: bool = False) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            # 락을 기다리는 동안 다른 요청이 이미 갱신했으면 건너뜀
+            if not force and now < self._expires_at:
+                return
+            if force and now - self._fetched_at < MIN_REFRESH_INTERVAL:
+                return
+            try:
+                keys, max_age = await asyncio.to_thread(_fetch_certs, self.certs_url)
+            except Exception as e:
+                if self._keys:
+                    # 기존 키로 계속 검증 (다음 요청에서 재시도)
+                    logger.warning(f"Google cert refresh failed, using cached keys: {e}")
+                    return
+                raise GoogleTokenError(f"Could not fetch Google public keys: {e}")
+            self._keys = keys
+            self._fetched_at = now
+            self._expires_at = now + max_age
+
+    async def _get_key(self, kid: str) -> str:
+        if not self._static and time.monotonic() >= self._expires_at:
+            await self._refresh_keys()
+        key = self._keys.get(kid)
+        if key is None and not self._static:
+            # 키 교체 직후일 수 있으므로 한 번 강제 재조회
+            await self._refresh_keys(force=True)
+            key = self._keys.get(kid)
+        if key is None:
+            raise GoogleTokenError("Unknown signing key (kid)")
+        return key
+
+    def _decode(self, token: str, key: str) -> dict:
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=self.project_id,
+                issuer=ISSUER_PREFIX + self.project_id,
+                options={"verify_at_hash": False},
+            )
+        except JWTError as e:
+            raise GoogleTokenError(str(e))
+        if not claims.get("sub"):
+            raise GoogleTokenError("Token has no subject")
+        if claims.get("auth_time", 0) > time.time() + 60:
+            raise GoogleTokenError("Token auth_time is in the future")
+        return claims
+
+    async def verify(self, token: str) -> dict:
+        """ID 토큰 검증 후 claims 반환 (실패 시 GoogleTokenError)"""
+        if not self.project_id:
+            raise GoogleTokenError("FIREBASE_PROJECT_ID is not configured")
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise GoogleTokenError(f"Malformed token: {e}")
+        kid = header.get("kid")
+        if header.get("alg") != "RS256" or not kid:
+            raise GoogleTokenError("Unexpected token header")
+
+        key = await self._get_key(kid)
+        # RSA 서명 검증은 CPU 작업이므로 스레드 풀에서 실행
+        return await asyncio.to_thread(self._decode, token, key)
+
+
+def _resolve_project_id() -> str:
+    if settings.FIREBASE_PROJECT_ID:
+        return settings.FIREBASE_PROJECT_ID
+    try:
+        with open(settings.FIREBASE_CRED_PATH, encoding="utf-8") as f:
+            return json.load(f).get("project_id", "")
+    except (OSError, ValueError):
+        return ""
+
+
+verifier = GoogleTokenVerifier()
@@ -0,0 +1,229 @@
+# backend/src/idempotency.py
+"""
+Idempotency-Key 헤더 처리 (재시도로 인한 중복 생성 방지)
+
+- @idempotent로 표시한 엔드포인트에 Idempotency-Key 헤더가 오면
+  첫 응답(status / headers / body)을 Redis에 IDEMPOTENCY_TTL_SECONDS 동안 저장하고, 같은 키의 재요청에는 저장된 응답을 그대로 돌려줍니다.
+  (재생된 응답에는 Idempotent-Replayed: true 헤더 추가)
+- 키 범위: (사용자, method, path, 키). 토큰은 서명까지 검증하므로 다른 사용자의 응답은 재생되지 않습니다.
+- 처리 중(in-flight)인 같은 키의 요청은 핸들러를 다시 실행하지 않고 첫 요청이 끝날 때까지 기다립니다.
+  (IDEMPOTENCY_WAIT_SECONDS를 넘기면 409)
+- 같은 키로 다른 본문을 보내면 422, 5xx 응답은 저장하지 않아 재시도할 수 있습니다.
+- Redis가 없으면 워커 메모리에 저장합니다. (단일 워커 / 테스트용)
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src import cache, security
+from src.config import settings
+from src.serializers import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+HEADER = "idempotency-key"
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+RESPONSE_KEY = "idem:resp:{}"
+LOCK_KEY = "idem:lock:{}"
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL = 0.05
+
+# Redis 미연결 시 대체 저장소
+_memory_store = cache.LocalTTLCache(maxsize=10000)
+
+
+def idempotent(endpoint):
+    """Idempotency-Key를 지원할 엔드포인트에 붙이는 표시 (@router.post 아래에 사용)"""
+    endpoint.__idempotent__ = True
+    return endpoint
+
+
+# ------------------------------------------
+# 저장소 (Redis / 메모리)
+# ------------------------------------------
+async def _get(key: str) -> Optional[str]:
+    client = cache.redis_client
+    if client is not None:
+        try:
+            return await client.get(key)
+        except Exception as e:
+            logger.warning(f"Idempotency Redis error (fallback to memory): {e}")
+    return _memory_store.get(key)
+
+
+async def _set(key: str, value: str, ttl: float, nx: bool = False) -> bool:
+    client = cache.redis_client
+    if client is not None:
+        try:
+            return bool(await client.set(key, value, px=int(ttl * 1000), nx=nx))
+        except Exception as e:
+            logger.warning(f"Idempotency Redis error (fallback to memory): {e}")
+    if nx and _memory_store.get(key) is not None:
+        return False
+    _memory_store.set(key, value, ttl)
+    return True
+
+
+async def _release(key: str, token: str) -> None:
+    """내가 잡은 락일 때만 해제"""
+    client = cache.redis_client
+    if client is not None:
+        try:
+            if await client.get(key) == token:
+                await client.delete(key)
+            return
+        except Exception as e:
+            logger.warning(f"Idempotency Redis error (fallback to memory): {e}")
+    if _memory_store.get(key) == token:
+        _memory_store.delete(key)
+
+
+# ------------------------------------------
+# 미들웨어
+# ------------------------------------------
+def _is_idempotent_endpoint(scope: Scope) -> bool:
+    # 라우팅 후 scope에 채워지는 endpoint로 판단 (FastAPI 버전별 라우터 내부 구조에 의존하지 않음)
+    return getattr(scope.get("endpoint"), "__idempotent__", False)
+
+
+async def _subject(headers: Headers) -> Optional[str]:
+    """키 범위용 사용자. 토큰이 없으면 'anonymous', 유효하지 않으면 None (핸들러가 401 처리)"""
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return "anonymous"
+    try:
+        return (await security.decode_access_token(token))["sub"]
+    except HTTPException:
+        return None
+
+
+def _error(status_code: int, message: str, code: str, path: str):
+    """main.create_error_response와 같은 에러 응답 포맷"""
+    return FastJSONResponse(
+        status_code=status_code,
+        content={
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "path": path,
+            "status": status_code,
+            "code": code,
+            "message": message,
+            "details": None,
+        },
+    )
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        idem_key = headers.get(HEADER)
+        if not idem_key:
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        if len(idem_key) > MAX_KEY_LENGTH:
+            await _error(400, "Idempotency-Key is too long", "BAD_REQUEST", path)(scope, receive, send)
+            return
+        subject = await _subject(headers)
+        if subject is None:
+            await self.app(scope, receive, send)
+            return
+
+        # 본문을 읽어 지문(fingerprint)을 만들고, 핸들러에는 같은 본문을 다시 흘려줌
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body.extend(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        fingerprint = hashlib.sha256(bytes(body)).hexdigest()
+
+        digest = hashlib.sha256(f"{subject}\n{scope['method']}\n{path}\n{idem_key}".encode()).hexdigest()
+        response_key, lock_key = RESPONSE_KEY.format(digest), LOCK_KEY.format(digest)
+        lock_token = uuid.uuid4().hex
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+
+        while True:
+            stored = await _get(response_key)
+            if stored is not None:
+                await self._replay(json.loads(stored), fingerprint, path, scope, receive, send)
+                return
+            if await _set(lock_key, lock_token, settings.IDEMPOTENCY_LOCK_SECONDS, nx=True):
+                break
+            # 같은 키의 첫 요청이 처리 중 -> 끝날 때까지 대기
+            if time.monotonic() >= deadline:
+                await _error(409, "A request with this Idempotency-Key is still in progress", "CONFLICT", path)(
+                    scope, receive, send
+                )
+                return
+            await asyncio.sleep(POLL_INTERVAL)
+
+        try:
+            await self._execute(scope, receive, send, bytes(body), fingerprint, response_key)
+        finally:
+            await _release(lock_key, lock_token)
+
+    async def _execute(
+        self, scope: Scope, receive: Receive, send: Send, body: bytes, fingerprint: str, response_key: str
+    ) -> None:
+        sent = False
+
+        async def replay_receive() -> Message:
+            # 미리 읽은 본문을 한 번 전달한 뒤에는 원래 receive로 (연결 종료 감지용)
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        start: Optional[Message] = None
+        chunks = []
+
+        async def capture_send(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, replay_receive, capture_send)
+
+        # @idempotent가 아닌 엔드포인트이거나 5xx(재시도 허용)면 저장하지 않음
+        if start is None or start["status"] >= 500 or not _is_idempotent_endpoint(scope):
+            return
+        record = {
+            "fingerprint": fingerprint,
+            "status": start["status"],
+            "headers": [[k.decode("latin-1"), v.decode("latin-1")] for k, v in start.get("headers", [])],
+            "body": base64.b64encode(b"".join(chunks)).decode("ascii"),
+        }
+        await _set(response_key, json.dumps(record), settings.IDEMPOTENCY_TTL_SECONDS)
+
+    async def _replay(self, record: dict, fingerprint: str, path: str, scope: Scope, receive: Receive, send: Send) -> None:
+        if record["fingerprint"] != fingerprint:
+            await _error(
+                422, "Idempotency-Key was already used with a different request body", "IDEMPOTENCY_KEY_REUSED", path
+            )(scope, receive, send)
+            return
+        headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in record["headers"]]
+        headers.append(REPLAYED_HEADER)
+        await send({"type": "http.response.start", "status": record["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": base64.b64decode(record["body"])})
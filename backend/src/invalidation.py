@@ -0,0 +1,188 @@
+# backend/src/invalidation.py
+"""
+워커 간 로컬 캐시 무효화 버스 (Redis pub/sub)
+
+- 멀티 워커 배포에서 워커 메모리 캐시(강의 목록/상세 SWR, 카테고리 스냅샷 등)는
+  다른 워커의 쓰기를 알 수 없으므로, 쓰기 후 publish(entity, id)로 모든 워커에 알립니다.
+- 엔티티: course / lecture / user / category
+- @on("course", ...): 엔티티 변경 시 실행할 리스너 등록 (async def listener(event: Event))
+  - 쓴 워커에서는 publish() 안에서 바로 실행 (event.local=True) -> Redis 공유 캐시 삭제 같은 1회성 작업은 여기서
+  - 다른 워커에서는 구독 메시지로 실행 (event.local=False) -> 로컬 캐시만 비움
+  - event.id가 None이면 해당 엔티티 전체 무효화
+- 메시지 유실 대비 버전 스탬프: publish마다 Redis Hash(invalidation:versions)의 엔티티 버전을 HINCRBY
+  - 받은 메시지의 버전이 건너뛰었거나, 주기적 확인(INVALIDATION_VERSION_CHECK_SECONDS)/재구독 때
+    Redis 버전이 마지막으로 본 버전보다 크면 그 엔티티 전체를 무효화합니다.
+- 구독이 끊기면 지수 백오프로 재연결 (InvalidationBus, lifespan에서 start/stop)
+- Redis가 없으면 이 워커의 리스너만 실행합니다. (단일 워커 / 테스트)
+"""
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src import cache
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "invalidation"
+VERSIONS_KEY = "invalidation:versions"
+ENTITIES = ("course", "lecture", "user", "category")
+
+# 이 워커가 보낸 메시지를 구독에서 다시 처리하지 않기 위한 식별자
+WORKER_ID = uuid.uuid4().hex
+
+
+@dataclass
+class Event:
+    entity: str
+    id: Optional[int] = None
+    local: bool = False
+
+
+Listener = Callable[[Event], Awaitable[None]]
+_listeners: Dict[str, List[Listener]] = defaultdict(list)
+# 엔티티별 마지막으로 반영한 버전
+_seen: Dict[str, int] = {}
+
+
+def on(*entities: str):
+    """리스너 등록 데코레이터: @invalidation.on("course", "user")"""
+    for entity in entities:
+        if entity not in ENTITIES:
+            raise ValueError(f"Unknown entity '{entity}'")
+
+    def decorator(func: Listener) -> Listener:
+        for entity in entities:
+            _listeners[entity].append(func)
+        return func
+    return decorator
+
+
+async def _dispatch(event: Event) -> None:
+    for listener in list(_listeners.get(event.entity, ())):
+        try:
+            await listener(event)
+        except Exception as e:
+            logger.warning(f"Invalidation listener failed ({event.entity}): {e}")
+
+
+async def _observe(entity: str, version: int, entity_id: Optional[int], local: bool) -> None:
+    """버전을 반영하면서 리스너 실행 - 중간 버전을 건너뛰었으면(유실) 엔티티 전체 무효화"""
+    seen = _seen.get(entity)
+    _seen[entity] = max(version, seen or 0)
+    if seen is not None and version > seen + 1:
+        logger.info(f"Invalidation gap on '{entity}' ({seen} -> {version}), evicting all")
+        entity_id = None
+    await _dispatch(Event(entity, entity_id, local))
+
+
+async def publish(entity: str, entity_id: Optional[int] = None) -> None:
+    """엔티티 변경 알림 (commit 이후 호출)"""
+    if entity not in ENTITIES:
+        raise ValueError(f"Unknown entity '{entity}'")
+    client = cache.redis_client
+    if client is None:
+        await _dispatch(Event(entity, entity_id, local=True))
+        return
+    try:
+        version = await client.hincrby(VERSIONS_KEY, entity, 1)
+        await client.publish(
+            CHANNEL, json.dumps({"entity": entity, "id": entity_id, "version": version, "origin": WORKER_ID})
+        )
+    except Exception as e:
+        # 전파 실패해도 다른 워커는 캐시 TTL로 결국 수렴, 이 워커는 바로 반영
+        logger.warning(f"Invalidation publish failed ({entity}): {e}")
+        await _dispatch(Event(entity, entity_id, local=True))
+        return
+    await _observe(entity, version, entity_id, local=True)
+
+
+async def check_versions() -> None:
+    """Redis 버전 스탬프와 비교해 놓친 변경이 있는 엔티티는 전체 무효화 (처음 보는 엔티티는 기준값만 기록)"""
+    client = cache.redis_client
+    if client is None:
+        return
+    versions = await client.hgetall(VERSIONS_KEY)
+    for entity, raw in versions.items():
+        version = int(raw)
+        seen = _seen.get(entity)
+        if seen is None:
+            _seen[entity] = version
+        elif version > seen:
+            logger.info(f"Invalidation version drift on '{entity}' ({seen} -> {version}), evicting all")
+            _seen[entity] = version
+            await _dispatch(Event(entity))
+
+
+def reset() -> None:
+    """테스트용: 마지막으로 본 버전 초기화"""
+    _seen.clear()
+
+
+# ------------------------------------------
+# 구독 (lifespan)
+# ------------------------------------------
+class InvalidationBus:
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._subscribed = False
+
+    async def _handle(self, data: str) -> None:
+        message = json.loads(data)
+        if message.get("origin") == WORKER_ID or message.get("entity") not in ENTITIES:
+            return
+        await _observe(message["entity"], int(message["version"]), message.get("id"), local=False)
+
+    async def _listen(self) -> None:
+        pubsub = cache.redis_client.pubsub()
+        try:
+            await pubsub.subscribe(CHANNEL)
+            # 끊겨 있던 동안의 변경은 메시지로 오지 않으므로 구독 직후 버전 확인
+            await check_versions()
+            self._subscribed = True
+            loop = asyncio.get_running_loop()
+            next_check = loop.time() + settings.INVALIDATION_VERSION_CHECK_SECONDS
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    await self._handle(message["data"])
+                if loop.time() >= next_check:
+                    await check_versions()
+                    next_check = loop.time() + settings.INVALIDATION_VERSION_CHECK_SECONDS
+        finally:
+            await pubsub.aclose()
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            self._subscribed = False
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 한 번이라도 구독에 성공했으면 대기 시간 초기화, 연속 실패면 지수 백오프
+                delay = 1.0 if self._subscribed else min(delay * 2, settings.INVALIDATION_RECONNECT_MAX_SECONDS)
+                logger.warning(f"Invalidation subscription lost, reconnecting in {delay}s: {e}")
+            await asyncio.sleep(delay)
+
+    @property
+    def subscribed(self) -> bool:
+        return self._subscribed
+
+    def start(self) -> None:
+        if cache.redis_client is not None and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
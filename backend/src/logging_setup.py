@@ -0,0 +1,163 @@
+# backend/src/logging_setup.py
+"""
+구조화(JSON) 로깅 설정
+
+- 기존: logging.basicConfig(StreamHandler) -> 로그 한 줄마다 이벤트 루프 위에서 포맷 + stdout 쓰기(블로킹 I/O)
+- 변경: 루트 로거에는 QueueHandler 하나만 두고, 별도 스레드의 QueueListener가 포맷/쓰기를 담당
+  - 요청 경로에서는 메시지 인자만 합쳐 큐에 넣음 (JSON 직렬화, 트레이스백 문자열화, I/O는 리스너 스레드)
+  - 큐가 가득 차면(LOG_QUEUE_SIZE) 로그를 버리고 dropped로 셈 -> 로그 때문에 요청이 막히지 않음
+- 출력: LOG_FORMAT=json(기본) 한 줄 JSON / text (로컬 개발용 기존 형식)
+  - 공통 필드: ts, level, logger, msg, request_id + logger.info(..., extra={...})로 넘긴 필드
+- 요청 ID: 미들웨어가 X-Request-ID(없거나 형식이 잘못되면 새로 발급)를 request_id_var에 넣으면
+  그 요청 안에서 남기는 모든 로그에 request_id가 붙습니다.
+- 접근 로그 샘플링: 성공(2xx/3xx) 요청은 LOG_SUCCESS_SAMPLE_RATE 비율만 남기고,
+  4xx/5xx와 느린 요청(LOG_SLOW_REQUEST_MS 이상)은 항상 남깁니다. -> should_log_access()
+"""
+import atexit
+import logging
+import queue
+import random
+import re
+import sys
+import traceback
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from src.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+# LogRecord 기본 속성 - 이 외의 속성은 extra로 넘긴 필드로 보고 출력에 포함
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id", "taskName"}
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """클라이언트/프록시가 보낸 X-Request-ID를 이어받고, 없거나 형식이 이상하면 새로 발급"""
+    if incoming and _REQUEST_ID_PATTERN.match(incoming):
+        return incoming
+    return uuid.uuid4().hex
+
+
+def should_log_access(status_code: int, duration_ms: float) -> bool:
+    if status_code >= 400 or duration_ms >= settings.LOG_SLOW_REQUEST_MS:
+        return True
+    rate = settings.LOG_SUCCESS_SAMPLE_RATE
+    return rate >= 1.0 or random.random() < rate
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in record.__dict__.items() if key not in _RESERVED and not key.startswith("_")}
+
+
+class RequestIdFilter(logging.Filter):
+    """로그를 남긴 쪽(요청 컨텍스트)에서 request_id를 레코드에 복사 - 리스너 스레드에서는 ContextVar를 볼 수 없음"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            payload["request_id"] = request_id
+        payload.update(_extra_fields(record))
+        if record.exc_info:
+            payload["exc"] = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        if orjson is not None:
+            return orjson.dumps(payload, default=str).decode("utf-8")
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """기존 basicConfig 형식 + [request_id] + extra 필드(key=value)"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s - %(levelname)s - [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "request_id"):
+            record.request_id = None
+        line = super().format(record)
+        fields = _extra_fields(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 구현은 여기서 format()(트레이스백 포함)까지 하므로 메시지 인자만 합치고 나머지는 리스너 스레드로
+        # (같은 프로세스 안의 큐라 exc_info를 그대로 넘겨도 됨)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_queue_handler: Optional[_NonBlockingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None, fmt: Optional[str] = None, stream=None) -> None:
+    """루트 로거를 QueueHandler -> QueueListener(스레드) -> stream 구성으로 교체 (여러 번 호출해도 1회만 적용)"""
+    global _queue_handler, _listener
+    if _listener is not None:
+        return
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(TextFormatter() if (fmt or settings.LOG_FORMAT) == "text" else JsonFormatter())
+
+    _queue_handler = _NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    _queue_handler.addFilter(RequestIdFilter())
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel((level or settings.LOG_LEVEL).upper())
+
+    _listener = QueueListener(_queue_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.unregister(shutdown_logging)
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 로그를 모두 쓰고 리스너 스레드 종료"""
+    global _queue_handler, _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger().removeHandler(_queue_handler)
+    _queue_handler, _listener = None, None
+
+
+def dropped_count() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
@@ -1,6 +1,6 @@
+import asyncio
 import time
 import logging
-import traceback
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Union
@@ -12,20 +12,21 @@ from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from starlette.middleware.base import BaseHTTPMiddleware
 
-import redis.asyncio as redis
+from src import analytics, archive, cache, category_registry, email_index, invalidation, logging_setup, rankings, outbox
+from src import database
+from src.database import async_session_maker
 from src.config import settings
+from src.serializers import FastJSONResponse
+from src.compression import CompressionMiddleware
+from src.idempotency import IdempotencyMiddleware
 # [수정] files 추가
 from src.routers import auth, users, courses, categories, lectures, enrollments, reviews, stats, files, admin
 from fastapi.staticfiles import StaticFiles
 
-# --- 로거 설정 ---
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+# --- 로거 설정 (JSON, 로그 I/O는 QueueListener 스레드에서) ---
+logging_setup.setup_logging()
 logger = logging.getLogger(__name__)
-
-redis_client = None
+access_logger = logging.getLogger("access")
 
 # --- 에러 응답 공통 포맷 ---
 def create_error_response(status_code: int, message: str, code: str = None, details: Union[dict, str] = None, path: str = ""):
@@ -57,10 +58,21 @@ def create_error_response(status_code: int, message: str, code: str = None, deta
 # --- 미들웨어 ---
 class LoggingAndRateLimitMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
+        request_id = logging_setup.new_request_id(request.headers.get("x-request-id"))
+        request_id_token = logging_setup.request_id_var.set(request_id)
+        try:
+            response = await self._dispatch(request, call_next)
+        finally:
+            logging_setup.request_id_var.reset(request_id_token)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+    async def _dispatch(self, request: Request, call_next):
+        start_time = time.perf_counter()
         path = request.url.path
         
         # 1. Rate Limiting
+        redis_client = cache.redis_client
         if redis_client:
             client_ip = request.client.host
             key = f"rate_limit:{client_ip}"
@@ -78,7 +90,7 @@ class LoggingAndRateLimitMiddleware(BaseHTTPMiddleware):
                     await redis_client.expire(key, expire_time)
                 
                 if request_count > limit:
-                    logger.warning(f"Rate limit exceeded for IP: {client_ip}")
+                    logger.warning("Rate limit exceeded", extra={"client_ip": client_ip})
                     return create_error_response(
                         status_code=429, 
                         message="Rate limit exceeded", 
@@ -86,50 +98,93 @@ class LoggingAndRateLimitMiddleware(BaseHTTPMiddleware):
                         path=path
                     )
             except Exception as e:
-                logger.error(f"Redis Error: {str(e)}")
+                logger.error("Rate limit Redis error: %s", e)
 
         # 2. 로깅 및 에러 핸들링
+        analytics_token = analytics.begin_request()
         try:
             response = await call_next(request)
-            process_time = time.time() - start_time
-            logger.info(f"{request.method} {path} - {response.status_code} - {process_time:.4f}s")
-            return response
+            # 쓰기 성공 직후에는 본인 읽기를 잠시 primary로 고정 (read-your-writes)
+            if request.method in database.WRITE_METHODS and response.status_code < 400:
+                await database.remember_write(request)
         except Exception as e:
-            logger.error(f"Server Error: {str(e)}")
-            logger.error(traceback.format_exc())
-            return create_error_response(
+            # 트레이스백 문자열화는 리스너 스레드에서
+            logger.exception("Unhandled error", extra={"method": request.method, "path": path})
+            response = create_error_response(
                 status_code=500, 
                 message="Internal Server Error", 
                 details=str(e),
                 path=path
             )
+        # 3. 분석 이벤트 (링 버퍼에 넣기만 함, 저장은 AnalyticsFlusher)
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        user_id = analytics.end_request(analytics_token)
+        route = analytics.route_template(request.scope)
+        if route is not None:
+            analytics.record(request.method, route, response.status_code, duration_ms, user_id)
+        # 4. 접근 로그 (성공 요청은 샘플링, 에러/느린 요청은 항상)
+        if logging_setup.should_log_access(response.status_code, duration_ms):
+            access_logger.info("request", extra={
+                "method": request.method,
+                "path": path,
+                "route": route,
+                "status": response.status_code,
+                "duration_ms": round(duration_ms, 2),
+                "user_id": user_id,
+                "client_ip": request.client.host if request.client else None,
+            })
+        return response
 
 # --- Lifespan ---
+# 강의 랭킹 주기적 재계산 (집계 쿼리이므로 replica가 있으면 replica에서 실행)
+ranking_refresher = rankings.RankingRefresher(database.read_session_maker or async_session_maker)
+# 다른 워커의 쓰기를 받아 로컬 캐시(강의 목록/상세, 카테고리 스냅샷)를 비우는 구독
+invalidation_bus = invalidation.InvalidationBus()
+# 요청 분석 이벤트 링 버퍼 -> analytics_rollups 배치 저장
+analytics_flusher = analytics.AnalyticsFlusher(async_session_maker)
+# 오래된 소프트 삭제 행(수강 취소 / 수강평 삭제) -> *_archive 테이블
+archiver = archive.Archiver(async_session_maker)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global redis_client
-    try:
-        redis_client = redis.from_url(
-            settings.REDIS_URL, 
-            encoding="utf-8", 
-            decode_responses=True,
-            socket_connect_timeout=3
-        )
-        await redis_client.ping()
-        logger.info("✅ Redis Connected!")
-    except Exception as e:
-        logger.warning(f"❌ Redis Connection Failed: {e}")
-        
+    await cache.init_redis()
+    # 이메일 존재 여부 캐시 워밍 (이미 채워져 있거나 다른 워커가 빌드 중이면 건너뜀)
+    if cache.redis_client:
+        async with async_session_maker() as db:
+            await email_index.warm(db)
+    database.replica_health.start()
+    invalidation_bus.start()
+    # 카테고리 스냅샷 (방금 쓴 값을 바로 읽도록 primary 사용)
+    await category_registry.warm(async_session_maker)
+    ranking_refresher.start()
+    analytics_flusher.start()
+    archiver.start()
+    # 메모리 아웃박스(로컬 개발)는 별도 워커 프로세스가 없으므로 API 프로세스 안에서 처리
+    outbox_task = None
+    if settings.OUTBOX_BACKEND == "memory":
+        from src import outbox_handlers  # noqa: F401 - 핸들러 등록
+        outbox_worker = outbox.OutboxWorker()
+        outbox_task = asyncio.create_task(outbox_worker.run())
+
     yield
-    
-    if redis_client:
-        await redis_client.close()
-        logger.info("🛑 Redis Closed.")
+
+    # 워커 종료 시 외부 연결 정리 (멀티 워커 환경에서 워커마다 실행됨)
+    if outbox_task is not None:
+        outbox_worker.stop()
+        await outbox_task
+    await archiver.stop()
+    await analytics_flusher.stop()
+    await ranking_refresher.stop()
+    await invalidation_bus.stop()
+    await database.replica_health.stop()
+    await cache.close_redis()
+    await database.dispose_engines()
 
 # --- App Init ---
 app = FastAPI(
     title=settings.PROJECT_NAME,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
@@ -139,6 +194,8 @@ app.mount(
     name="static"
 )
 
+# 가장 안쪽: 재생된 응답에도 CORS 헤더가 붙도록 CORS보다 먼저 추가
+app.add_middleware(IdempotencyMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -147,6 +204,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(LoggingAndRateLimitMiddleware)
+# 가장 바깥쪽에서 최종 응답을 압축 (마지막에 추가한 미들웨어가 가장 먼저 실행됨)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
 
 # --- Exception Handlers ---
 @app.exception_handler(HTTPException)
@@ -168,7 +232,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 @app.exception_handler(SQLAlchemyError)
 async def database_exception_handler(request: Request, exc: SQLAlchemyError):
-    logger.error(f"Database Error: {str(exc)}")
+    logger.error("Database error", exc_info=exc, extra={"path": request.url.path})
     return create_error_response(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         message="Database Error",
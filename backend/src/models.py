@@ -1,11 +1,13 @@
 # backend/src/models.py
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, DateTime, Enum, Float, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 
 # database.py에 있는 Base 사용 (중요)
 from src.database import Base
+from src.soft_delete import SoftDeleteMixin, deleted_index, live_index
+from src.writes import EAGER_DEFAULTS
 
 
 # --- Enums ---
@@ -15,8 +17,10 @@ class UserRole(str, enum.Enum):
 
 
 # --- Models ---
-class User(Base):
+class User(SoftDeleteMixin, Base):
+    """탈퇴 시 deleted_at 기록 후 src.deletion.purge_user가 참조를 정리하고 행 삭제"""
     __tablename__ = "users"
+    __table_args__ = (deleted_index("ix_users_deleted_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -64,6 +68,8 @@ class Category(Base):
 
 class Course(Base):
     __tablename__ = "courses"
+    # INSERT/UPDATE ... RETURNING으로 created_at / updated_at을 받아 응답용 재조회 생략 (src/writes.py)
+    __mapper_args__ = EAGER_DEFAULTS
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), index=True, nullable=False)
@@ -97,8 +103,15 @@ class Lecture(Base):
     course = relationship("Course", back_populates="lectures")
 
 
-class Enrollment(Base):
+class Enrollment(SoftDeleteMixin, Base):
+    """수강 취소는 deleted_at 기록 (src/soft_delete.py), 오래된 취소 행은 enrollments_archive로 이동"""
     __tablename__ = "enrollments"
+    __mapper_args__ = EAGER_DEFAULTS
+    __table_args__ = (
+        live_index("ix_enrollments_live_user_course", "user_id", "course_id"),
+        live_index("ix_enrollments_live_course", "course_id"),
+        deleted_index("ix_enrollments_deleted_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     status = Column(String(50), default="ACTIVE")
@@ -111,8 +124,14 @@ class Enrollment(Base):
     course = relationship("Course", back_populates="enrollments")
 
 
-class Review(Base):
+class Review(SoftDeleteMixin, Base):
+    """삭제는 deleted_at 기록 (src/soft_delete.py), 오래된 삭제 행은 reviews_archive로 이동"""
     __tablename__ = "reviews"
+    __mapper_args__ = EAGER_DEFAULTS
+    __table_args__ = (
+        live_index("ix_reviews_live_course_created", "course_id", "created_at"),
+        deleted_index("ix_reviews_deleted_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     rating = Column(Integer, nullable=False)
@@ -124,3 +143,81 @@ class Review(Base):
 
     user = relationship("User", back_populates="reviews")
     course = relationship("Course", back_populates="reviews")
+
+
+class EnrollmentArchive(Base):
+    """
+    보관된 수강 기록 (src/archive.py) - enrollments와 같은 컬럼 + archived_at
+    - 원본 id를 그대로 유지, 회원 / 강의가 삭제돼도 남도록 FK 없음
+    """
+    __tablename__ = "enrollments_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    status = Column(String(50))
+    enrolled_at = Column(DateTime(timezone=True), nullable=False)
+    user_id = Column(Integer, index=True)
+    course_id = Column(Integer, index=True)
+    deleted_at = Column(DateTime, nullable=True)   # UTC (datetime.utcnow)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ReviewArchive(Base):
+    """보관된 수강평 (src/archive.py) - reviews와 같은 컬럼 + archived_at"""
+    __tablename__ = "reviews_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    rating = Column(Integer, nullable=False)
+    comment = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    user_id = Column(Integer, index=True)
+    course_id = Column(Integer, index=True)
+    deleted_at = Column(DateTime, nullable=True)   # UTC (datetime.utcnow)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class CourseRecommendation(Base):
+    """함께 수강한 강의 Top-K (오프라인 작업 jobs/build_recommendations.py가 통째로 교체)"""
+    __tablename__ = "course_recommendations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False, index=True)
+    recommended_course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)
+    rank = Column(Integer, nullable=False)
+
+
+class OutboxEvent(Base):
+    """
+    트랜잭셔널 아웃박스 - 도메인 변경과 같은 트랜잭션에서 기록되고, 워커(jobs/outbox_worker.py)가 처리
+    - status: PENDING -> PROCESSING -> (성공 시 행 삭제) / 재시도 초과 시 DEAD
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    topic = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default="PENDING", server_default="PENDING")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    available_at = Column(DateTime, nullable=False, index=True)
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class AnalyticsRollup(Base):
+    """
+    요청 이벤트 시간 버킷 집계 (src/analytics.py가 배치로 추가만 함 - append-only)
+    - 같은 (bucket_start, method, route, status) 행이 여러 개일 수 있고, 조회 시 SUM
+    - 지난 시간 버킷은 compact()가 키별 1행으로 합침
+    """
+    __tablename__ = "analytics_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    bucket_start = Column(DateTime, nullable=False, index=True)   # UTC, 정시
+    method = Column(String(10), nullable=False)
+    route = Column(String(200), nullable=False)                  # 라우트 템플릿 (/api/v1/courses/{course_id})
+    status = Column(Integer, nullable=False)
+    count = Column(Integer, nullable=False)
+    authenticated = Column(Integer, nullable=False, default=0)   # 로그인 사용자 요청 수
+    latency_sum_ms = Column(Float, nullable=False, default=0.0)
+    latency_max_ms = Column(Float, nullable=False, default=0.0)
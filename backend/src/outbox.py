@@ -0,0 +1,263 @@
+# backend/src/outbox.py
+"""
+트랜잭셔널 아웃박스 + 경량 작업 시스템
+
+- enqueue(db, topic, payload): 도메인 변경(Course / Enrollment / Review)과 같은 세션에 outbox_events 행을 추가
+  -> 같은 commit으로 함께 저장되므로 "DB는 바뀌었는데 작업은 유실" / "작업만 실행"이 생기지 않습니다.
+- @handler(topic): 토픽별 부수 효과 함수 등록 (캐시 무효화, 통계 카운터 등). 한 토픽에 여러 핸들러 가능
+- OutboxWorker: 백엔드에서 작업을 가져와 동시 실행 한도(concurrency) 안에서 처리
+  - 실패 시 지수 백오프(+지터)로 재시도, OUTBOX_MAX_ATTEMPTS를 넘기면 DEAD(dead-letter)로 남김
+  - 성공한 행은 삭제, DEAD 행은 requeue_dead()로 다시 대기열에 넣을 수 있음
+- 백엔드
+  - DatabaseBackend: outbox_events 폴링 (SELECT ... FOR UPDATE SKIP LOCKED로 여러 워커가 나눠 가져감)
+  - MemoryBackend: 프로세스 메모리 큐 (테스트 / 로컬 개발용, OUTBOX_BACKEND=memory)
+- 워커 프로세스 실행: cd backend && python -m jobs.outbox_worker
+"""
+import asyncio
+import logging
+import random
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import models
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = "PENDING"
+PROCESSING = "PROCESSING"
+DEAD = "DEAD"
+
+Handler = Callable[[dict], Awaitable[Any]]
+_handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+
+def handler(topic: str):
+    """토픽 핸들러 등록 데코레이터: @outbox.handler("course.updated")"""
+    def decorator(func: Handler) -> Handler:
+        _handlers[topic].append(func)
+        return func
+    return decorator
+
+
+def handlers_for(topic: str) -> List[Handler]:
+    return list(_handlers.get(topic, ()))
+
+
+@dataclass
+class Job:
+    id: int
+    topic: str
+    payload: dict
+    attempts: int = 0
+
+
+def backoff_seconds(attempts: int) -> float:
+    """재시도 대기 시간: base * 2^(attempts-1), 상한 OUTBOX_BACKOFF_MAX_SECONDS, +-20% 지터"""
+    delay = min(settings.OUTBOX_BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), settings.OUTBOX_BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+# ------------------------------------------
+# 백엔드
+# ------------------------------------------
+class DatabaseBackend:
+    """outbox_events 테이블 폴링"""
+
+    def __init__(self, session_maker):
+        self.session_maker = session_maker
+
+    def enqueue(self, db: AsyncSession, topic: str, payload: dict) -> None:
+        db.add(models.OutboxEvent(topic=topic, payload=payload, status=PENDING, attempts=0, available_at=datetime.utcnow()))
+
+    async def claim(self, limit: int) -> List[Job]:
+        now = datetime.utcnow()
+        # 워커가 죽어 PROCESSING으로 남은 작업은 OUTBOX_VISIBILITY_TIMEOUT_SECONDS 후 다시 가져감
+        stale = now - timedelta(seconds=settings.OUTBOX_VISIBILITY_TIMEOUT_SECONDS)
+        async with self.session_maker() as db:
+            events = (await db.execute(
+                select(models.OutboxEvent)
+                .where(or_(
+                    and_(models.OutboxEvent.status == PENDING, models.OutboxEvent.available_at <= now),
+                    and_(models.OutboxEvent.status == PROCESSING, models.OutboxEvent.locked_at < stale),
+                ))
+                .order_by(models.OutboxEvent.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )).scalars().all()
+            for event in events:
+                event.status = PROCESSING
+                event.locked_at = now
+            await db.commit()
+            return [Job(e.id, e.topic, e.payload, e.attempts) for e in events]
+
+    async def complete(self, job: Job) -> None:
+        async with self.session_maker() as db:
+            await db.execute(delete(models.OutboxEvent).where(models.OutboxEvent.id == job.id))
+            await db.commit()
+
+    async def fail(self, job: Job, error: str, retry_at: Optional[datetime]) -> None:
+        """retry_at이 None이면 DEAD"""
+        values = {"attempts": job.attempts, "last_error": error[:2000], "locked_at": None}
+        if retry_at is None:
+            values["status"] = DEAD
+        else:
+            values.update(status=PENDING, available_at=retry_at)
+        async with self.session_maker() as db:
+            await db.execute(update(models.OutboxEvent).where(models.OutboxEvent.id == job.id).values(**values))
+            await db.commit()
+
+    async def requeue_dead(self, ids: Optional[List[int]] = None) -> int:
+        query = (
+            update(models.OutboxEvent)
+            .where(models.OutboxEvent.status == DEAD)
+            .values(status=PENDING, attempts=0, available_at=datetime.utcnow(), last_error=None)
+        )
+        if ids:
+            query = query.where(models.OutboxEvent.id.in_(ids))
+        async with self.session_maker() as db:
+            result = await db.execute(query)
+            await db.commit()
+            return result.rowcount
+
+
+@dataclass
+class _MemoryEntry:
+    job: Job
+    available_at: datetime
+    status: str = PENDING
+    last_error: Optional[str] = None
+
+
+@dataclass
+class MemoryBackend:
+    """프로세스 메모리 큐 (테스트용) - enqueue는 트랜잭션과 무관하게 즉시 대기열에 들어감"""
+
+    entries: Dict[int, _MemoryEntry] = field(default_factory=dict)
+    _next_id: int = 1
+
+    def enqueue(self, db: Optional[AsyncSession], topic: str, payload: dict) -> None:
+        job = Job(self._next_id, topic, payload)
+        self.entries[job.id] = _MemoryEntry(job, datetime.utcnow())
+        self._next_id += 1
+
+    async def claim(self, limit: int) -> List[Job]:
+        now = datetime.utcnow()
+        ready = [e for e in self.entries.values() if e.status == PENDING and e.available_at <= now][:limit]
+        for entry in ready:
+            entry.status = PROCESSING
+        return [entry.job for entry in ready]
+
+    async def complete(self, job: Job) -> None:
+        self.entries.pop(job.id, None)
+
+    async def fail(self, job: Job, error: str, retry_at: Optional[datetime]) -> None:
+        entry = self.entries[job.id]
+        entry.last_error = error
+        if retry_at is None:
+            entry.status = DEAD
+        else:
+            entry.status, entry.available_at = PENDING, retry_at
+
+    async def requeue_dead(self, ids: Optional[List[int]] = None) -> int:
+        count = 0
+        for entry in self.entries.values():
+            if entry.status == DEAD and (not ids or entry.job.id in ids):
+                entry.status, entry.available_at, entry.job.attempts = PENDING, datetime.utcnow(), 0
+                count += 1
+        return count
+
+    def dead(self) -> List[Job]:
+        return [e.job for e in self.entries.values() if e.status == DEAD]
+
+
+def create_backend():
+    if settings.OUTBOX_BACKEND == "memory":
+        return MemoryBackend()
+    from src.database import async_session_maker
+    return DatabaseBackend(async_session_maker)
+
+
+backend = create_backend()
+
+
+def enqueue(db: AsyncSession, topic: str, payload: dict) -> None:
+    """현재 세션(트랜잭션)에 작업 추가 - 호출한 쪽의 commit과 함께 저장됨"""
+    backend.enqueue(db, topic, payload)
+
+
+# ------------------------------------------
+# 워커
+# ------------------------------------------
+class OutboxWorker:
+    def __init__(
+        self,
+        backend=None,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        self.backend = backend
+        self.concurrency = concurrency or settings.OUTBOX_CONCURRENCY
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.OUTBOX_POLL_INTERVAL_SECONDS
+        self.max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._stopping = asyncio.Event()
+
+    @property
+    def _backend(self):
+        # 기본값은 모듈 전역 backend (테스트에서 교체 가능)
+        return self.backend or backend
+
+    async def _process(self, job: Job) -> bool:
+        async with self._semaphore:
+            job.attempts += 1
+            funcs = handlers_for(job.topic)
+            try:
+                if not funcs:
+                    raise LookupError(f"No handler for topic '{job.topic}'")
+                for func in funcs:
+                    await func(job.payload)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                if isinstance(e, LookupError) or job.attempts >= self.max_attempts:
+                    logger.error(f"Outbox job {job.id} ({job.topic}) dead-lettered after {job.attempts} attempts: {error}")
+                    await self._backend.fail(job, error, None)
+                else:
+                    retry_at = datetime.utcnow() + timedelta(seconds=backoff_seconds(job.attempts))
+                    logger.warning(f"Outbox job {job.id} ({job.topic}) failed (attempt {job.attempts}): {error}")
+                    await self._backend.fail(job, error, retry_at)
+                return False
+            await self._backend.complete(job)
+            return True
+
+    async def run_once(self) -> int:
+        """한 배치 처리, 가져온 작업 수 반환"""
+        jobs = await self._backend.claim(self.batch_size)
+        if jobs:
+            await asyncio.gather(*(self._process(job) for job in jobs))
+        return len(jobs)
+
+    async def run(self) -> None:
+        """stop() 호출 전까지 폴링 (작업이 있으면 쉬지 않고 다음 배치)"""
+        while not self._stopping.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                logger.error(f"Outbox poll failed: {e}")
+                claimed = 0
+            if claimed == 0:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def stop(self) -> None:
+        self._stopping.set()
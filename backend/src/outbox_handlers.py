@@ -0,0 +1,59 @@
+# backend/src/outbox_handlers.py
+"""
+아웃박스 토픽별 부수 효과 (요청 처리와 분리되어 워커에서 실행)
+
+토픽
+- course.created / course.updated / course.deleted : {"course_id"}
+- enrollment.created / enrollment.canceled       : {"course_id", "user_id"}
+- review.created / review.updated                 : {"course_id", "review_id", "rating"}
+- review.deleted                                  : {"course_id", "review_id"}
+- user.deleted                                    : {"user_id"} (탈퇴 회원 참조 정리 - src.deletion.purge_user)
+
+Redis 오류는 예외로 올려 워커가 백오프 재시도하도록 둡니다. (Redis 미연결이면 건너뜀)
+"""
+from datetime import datetime
+
+from src import cache, deletion, outbox, rankings
+from src.database import async_session_maker
+
+EVENT_COUNTER_KEY = "stats:events:{}"
+EVENT_COUNTER_TTL = 90 * 86400
+
+TOPICS = (
+    "course.created", "course.updated", "course.deleted",
+    "enrollment.created", "enrollment.canceled",
+    "review.created", "review.updated", "review.deleted",
+)
+
+
+async def count_event(topic: str) -> None:
+    """일자별 이벤트 카운터 (HINCRBY stats:events:YYYY-MM-DD topic)"""
+    client = cache.redis_client
+    if client is None:
+        return
+    key = EVENT_COUNTER_KEY.format(datetime.utcnow().date().isoformat())
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.hincrby(key, topic, 1)
+        pipe.expire(key, EVENT_COUNTER_TTL)
+        await pipe.execute()
+
+
+def _counter(topic: str):
+    async def handle(payload: dict) -> None:
+        await count_event(topic)
+    handle.__name__ = f"count_{topic.replace('.', '_')}"
+    return handle
+
+
+for _topic in TOPICS:
+    outbox.handler(_topic)(_counter(_topic))
+
+
+@outbox.handler("course.deleted")
+async def drop_deleted_course_from_rankings(payload: dict) -> None:
+    await rankings.remove_course(payload["course_id"])
+
+
+@outbox.handler("user.deleted")
+async def purge_deleted_user(payload: dict) -> None:
+    await deletion.purge_user(async_session_maker, payload["user_id"])
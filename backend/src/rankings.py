@@ -0,0 +1,271 @@
+# backend/src/rankings.py
+"""
+강의 랭킹 (인기 / 평점 / 급상승) - Redis Sorted Set으로 미리 계산
+
+- popular   : 수강 신청 수
+- top-rated : 리뷰 평점의 베이지안 평균 (C * 전체평균 + 평점합) / (C + 리뷰수), C = RANKING_BAYES_MIN_REVIEWS
+- trending  : 최근 RANKING_TRENDING_WINDOW_DAYS일 수강 신청을 반감기(RANKING_TRENDING_HALF_LIFE_HOURS)로 감쇠해 합산
+- 전체 랭킹(rank:{kind}:all)과 카테고리별 랭킹(rank:{kind}:cat:{id})을 MULTI/EXEC 한 번으로 교체하므로
+  조회 측은 항상 완성된 스냅샷만 봅니다. 조회는 ZREVRANGE (O(log n + k))
+- lifespan의 RankingRefresher가 주기적으로 재계산 (Redis 락으로 워커 중 하나만 계산)
+- Redis가 없거나 오류가 나면 워커 메모리의 마지막 스냅샷으로 응답합니다.
+"""
+import asyncio
+import enum
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import cache, models
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+RANKING_KEY = "rank:{}:{}"
+KEYS_SET = "rank:keys"
+BUILT_AT_KEY = "rank:built_at"
+LOCK_KEY = "rank:lock"
+
+
+class RankingKind(str, enum.Enum):
+    POPULAR = "popular"
+    TOP_RATED = "top-rated"
+    TRENDING = "trending"
+
+
+Scores = Dict[int, float]
+
+# Redis 미연결/오류 시 대체 스냅샷: key -> [(course_id, score), ...] (점수 내림차순)
+_snapshot: Dict[str, List[Tuple[int, float]]] = {}
+_snapshot_built = False
+_refresh_lock = asyncio.Lock()
+
+
+def ranking_key(kind: RankingKind, category_id: Optional[int] = None) -> str:
+    scope = "all" if category_id is None else f"cat:{category_id}"
+    return RANKING_KEY.format(RankingKind(kind).value, scope)
+
+
+def _utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# ------------------------------------------
+# 계산
+# ------------------------------------------
+async def _popular(db: AsyncSession) -> Scores:
+    result = await db.execute(
+        select(models.Enrollment.course_id, func.count(models.Enrollment.id))
+        .group_by(models.Enrollment.course_id)
+    )
+    return {course_id: float(count) for course_id, count in result if course_id is not None}
+
+
+async def _top_rated(db: AsyncSession) -> Scores:
+    result = await db.execute(
+        select(models.Review.course_id, func.count(models.Review.id), func.sum(models.Review.rating))
+        .group_by(models.Review.course_id)
+    )
+    # MySQL은 SUM(int)을 Decimal로 돌려주므로 float로 (redis zadd / orjson이 Decimal을 받지 않음)
+    rows = [(course_id, n, float(total or 0)) for course_id, n, total in result if course_id is not None]
+    review_count = sum(n for _, n, _ in rows)
+    if review_count == 0:
+        return {}
+    mean = sum(total for _, _, total in rows) / review_count
+    prior = settings.RANKING_BAYES_MIN_REVIEWS
+    return {course_id: (prior * mean + total) / (prior + n) for course_id, n, total in rows}
+
+
+async def _trending(db: AsyncSession, now: datetime) -> Scores:
+    since = now - timedelta(days=settings.RANKING_TRENDING_WINDOW_DAYS)
+    result = await db.execute(
+        select(models.Enrollment.course_id, models.Enrollment.enrolled_at)
+        .where(models.Enrollment.enrolled_at >= since)
+    )
+    half_life = settings.RANKING_TRENDING_HALF_LIFE_HOURS * 3600
+    scores: Scores = defaultdict(float)
+    for course_id, enrolled_at in result:
+        if course_id is None or enrolled_at is None:
+            continue
+        age = max((now - _utc_naive(enrolled_at)).total_seconds(), 0.0)
+        scores[course_id] += 0.5 ** (age / half_life)
+    return dict(scores)
+
+
+async def compute(db: AsyncSession, now: Optional[datetime] = None) -> Dict[str, Scores]:
+    """전체 + 카테고리별 랭킹 계산 -> {redis key: {course_id: score}}"""
+    now = _utc_naive(now or datetime.utcnow())
+    categories = dict((await db.execute(select(models.Course.id, models.Course.category_id))).all())
+    by_kind = {
+        RankingKind.POPULAR: await _popular(db),
+        RankingKind.TOP_RATED: await _top_rated(db),
+        RankingKind.TRENDING: await _trending(db, now),
+    }
+
+    rankings: Dict[str, Scores] = {}
+    for kind, scores in by_kind.items():
+        # 삭제된 강의의 잔여 데이터는 제외
+        scores = {cid: score for cid, score in scores.items() if cid in categories}
+        rankings[ranking_key(kind)] = scores
+        for course_id, score in scores.items():
+            category_id = categories[course_id]
+            if category_id is not None:
+                rankings.setdefault(ranking_key(kind, category_id), {})[course_id] = score
+    return rankings
+
+
+# ------------------------------------------
+# 저장 / 조회
+# ------------------------------------------
+def _store_snapshot(rankings: Dict[str, Scores]) -> None:
+    global _snapshot, _snapshot_built
+    _snapshot = {
+        key: sorted(((cid, float(score)) for cid, score in scores.items()), key=lambda item: (-item[1], item[0]))
+        for key, scores in rankings.items()
+    }
+    _snapshot_built = True
+
+
+async def publish(rankings: Dict[str, Scores]) -> None:
+    """계산 결과를 Redis에 원자적으로 교체 + 워커 로컬 스냅샷 갱신"""
+    _store_snapshot(rankings)
+    client = cache.redis_client
+    if client is None:
+        return
+    try:
+        previous = await client.smembers(KEYS_SET)
+        async with client.pipeline(transaction=True) as pipe:
+            stale = set(previous) - set(rankings)
+            if stale:
+                pipe.delete(*stale)
+            for key, scores in rankings.items():
+                pipe.delete(key)
+                if scores:
+                    pipe.zadd(key, {str(cid): float(score) for cid, score in scores.items()})
+            pipe.delete(KEYS_SET)
+            if rankings:
+                pipe.sadd(KEYS_SET, *rankings)
+            pipe.set(BUILT_AT_KEY, str(time.time()))
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Ranking publish to Redis failed: {e}")
+
+
+async def remove_course(course_id: int) -> None:
+    """삭제된 강의를 모든 랭킹에서 즉시 제거 (다음 재계산을 기다리지 않음)"""
+    for key, items in _snapshot.items():
+        _snapshot[key] = [item for item in items if item[0] != course_id]
+    client = cache.redis_client
+    if client is None:
+        return
+    keys = await client.smembers(KEYS_SET)
+    if keys:
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.zrem(key, str(course_id))
+            await pipe.execute()
+
+
+def _from_snapshot(key: str, offset: int, limit: int) -> Optional[List[Tuple[int, float]]]:
+    if not _snapshot_built:
+        return None
+    return _snapshot.get(key, [])[offset:offset + limit]
+
+
+async def top(
+    kind: RankingKind, category_id: Optional[int] = None, offset: int = 0, limit: int = 20
+) -> Optional[List[Tuple[int, float]]]:
+    """랭킹 상위 [(course_id, score), ...]. 아직 한 번도 계산되지 않았으면 None"""
+    key = ranking_key(kind, category_id)
+    client = cache.redis_client
+    if client is None:
+        return _from_snapshot(key, offset, limit)
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.exists(BUILT_AT_KEY)
+            pipe.zrevrange(key, offset, offset + limit - 1, withscores=True)
+            built, members = await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Ranking read from Redis failed: {e}")
+        return _from_snapshot(key, offset, limit)
+    if not built:
+        return None
+    return [(int(member), float(score)) for member, score in members]
+
+
+async def refresh(db: AsyncSession, now: Optional[datetime] = None) -> None:
+    await publish(await compute(db, now))
+
+
+async def get_ranking(
+    db: AsyncSession, kind: RankingKind, category_id: Optional[int] = None, offset: int = 0, limit: int = 20
+) -> List[Tuple[int, float]]:
+    """랭킹 조회 - 아직 계산 전이면(첫 기동 직후 등) 이 자리에서 한 번 계산"""
+    result = await top(kind, category_id, offset, limit)
+    if result is not None:
+        return result
+    async with _refresh_lock:
+        result = await top(kind, category_id, offset, limit)
+        if result is None:
+            await refresh(db)
+            result = await top(kind, category_id, offset, limit)
+    return result or []
+
+
+def reset() -> None:
+    """테스트용: 로컬 스냅샷 초기화"""
+    global _snapshot, _snapshot_built
+    _snapshot = {}
+    _snapshot_built = False
+
+
+# ------------------------------------------
+# 주기적 재계산 (lifespan)
+# ------------------------------------------
+class RankingRefresher:
+    def __init__(self, session_maker):
+        self.session_maker = session_maker
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> bool:
+        """재계산 1회. 다른 워커가 이번 주기를 맡았으면 False"""
+        client = cache.redis_client
+        interval = settings.RANKING_REFRESH_INTERVAL_SECONDS
+        if client is not None:
+            try:
+                acquired = await client.set(LOCK_KEY, "1", px=int(interval * 1000), nx=True)
+            except Exception:
+                acquired = True
+            if not acquired:
+                return False
+        async with self.session_maker() as db:
+            await refresh(db)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.warning(f"Ranking refresh failed: {e}")
+            await asyncio.sleep(settings.RANKING_REFRESH_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
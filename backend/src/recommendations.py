@@ -0,0 +1,160 @@
+# backend/src/recommendations.py
+"""
+"이 강의를 들은 학생들이 함께 들은 강의" 추천
+
+- 계산(오프라인): enrollments를 (학생 x 강의) 희소 행렬 X로 만들고 X^T X로 강의-강의 동시 수강 행렬을 구한 뒤
+  코사인 유사도 co(i, j) / sqrt(n_i * n_j) 기준 강의별 Top-K만 course_recommendations 테이블에 저장
+  (실행: cd backend && python -m jobs.build_recommendations)
+- 조회(API): course_id 인덱스로 Top-K 행만 읽음. 동시 수강 데이터가 없는 신규 강의는
+  같은 카테고리의 인기 랭킹(src.rankings) -> 최신 강의 순으로 대체합니다.
+- numpy / scipy는 오프라인 계산에서만 사용하므로 함수 안에서 import 합니다. (API 기동 시간에 영향 X)
+"""
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import models, rankings
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+Neighbors = Dict[int, List[Tuple[int, float]]]
+
+INSERT_BATCH_SIZE = 5000
+LOAD_BATCH_SIZE = 50000
+
+SOURCE_CO_ENROLLMENT = "co-enrollment"
+SOURCE_CATEGORY = "category"
+
+
+# ------------------------------------------
+# 계산
+# ------------------------------------------
+def top_k_neighbors(user_ids, course_ids, k: int = 20, min_support: int = 2) -> Neighbors:
+    """
+    (user_id, course_id) 쌍 배열 -> {course_id: [(추천 course_id, 유사도), ...]} (유사도 내림차순)
+    - 같은 쌍이 중복돼도 1회로 계산
+    """
+    import numpy as np
+    from scipy import sparse
+
+    user_ids = np.asarray(user_ids)
+    course_ids = np.asarray(course_ids)
+    if user_ids.size == 0:
+        return {}
+    _, user_idx = np.unique(user_ids, return_inverse=True)
+    courses, course_idx = np.unique(course_ids, return_inverse=True)
+
+    x = sparse.csr_matrix(
+        (np.ones(user_idx.size, dtype=np.float32), (user_idx, course_idx)),
+        shape=(int(user_idx.max()) + 1, courses.size),
+    )
+    x.data[:] = 1.0  # 중복 쌍은 합산되므로 0/1로 되돌림
+    counts = np.asarray(x.sum(axis=0)).ravel()
+
+    co = (x.T @ x).tocoo()
+    keep = (co.row != co.col) & (co.data >= min_support)
+    rows, cols = co.row[keep], co.col[keep]
+    scores = co.data[keep] / np.sqrt(counts[rows] * counts[cols])
+
+    sim = sparse.csr_matrix((scores, (rows, cols)), shape=(courses.size, courses.size))
+    neighbors: Neighbors = {}
+    for i in range(courses.size):
+        start, end = sim.indptr[i], sim.indptr[i + 1]
+        if start == end:
+            continue
+        row_scores = sim.data[start:end]
+        row_cols = sim.indices[start:end]
+        if row_scores.size > k:
+            top = np.argpartition(-row_scores, k - 1)[:k]
+        else:
+            top = np.arange(row_scores.size)
+        # 점수 내림차순, 동점이면 course_id 오름차순
+        order = top[np.lexsort((courses[row_cols[top]], -row_scores[top]))]
+        neighbors[int(courses[i])] = [
+            (int(courses[row_cols[j]]), float(row_scores[j])) for j in order
+        ]
+    return neighbors
+
+
+async def load_enrollment_pairs(db: AsyncSession):
+    """enrollments 전체를 (user_ids, course_ids) numpy 배열로 스트리밍 로딩"""
+    import numpy as np
+
+    user_chunks, course_chunks = [], []
+    query = (
+        select(models.Enrollment.user_id, models.Enrollment.course_id)
+        .where(models.Enrollment.user_id.is_not(None), models.Enrollment.course_id.is_not(None))
+        .execution_options(yield_per=LOAD_BATCH_SIZE)
+    )
+    result = await db.stream(query)
+    async for partition in result.partitions():
+        pairs = np.asarray(partition, dtype=np.int64).reshape(-1, 2)
+        user_chunks.append(pairs[:, 0])
+        course_chunks.append(pairs[:, 1])
+    if not user_chunks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(user_chunks), np.concatenate(course_chunks)
+
+
+async def save_neighbors(db: AsyncSession, neighbors: Neighbors) -> int:
+    """course_recommendations 테이블을 한 트랜잭션에서 통째로 교체, 저장한 행 수 반환"""
+    rows = [
+        {"course_id": course_id, "recommended_course_id": rec_id, "score": score, "rank": rank}
+        for course_id, items in neighbors.items()
+        for rank, (rec_id, score) in enumerate(items, start=1)
+    ]
+    await db.execute(delete(models.CourseRecommendation))
+    for i in range(0, len(rows), INSERT_BATCH_SIZE):
+        await db.execute(insert(models.CourseRecommendation), rows[i:i + INSERT_BATCH_SIZE])
+    await db.commit()
+    return len(rows)
+
+
+async def build(db: AsyncSession, k: Optional[int] = None, min_support: Optional[int] = None) -> int:
+    """enrollments -> Top-K 계산 -> 테이블 저장 (오프라인 작업 진입점)"""
+    user_ids, course_ids = await load_enrollment_pairs(db)
+    neighbors = top_k_neighbors(
+        user_ids,
+        course_ids,
+        k=k or settings.RECOMMENDATION_TOP_K,
+        min_support=min_support or settings.RECOMMENDATION_MIN_SUPPORT,
+    )
+    saved = await save_neighbors(db, neighbors)
+    logger.info(f"Recommendations built: {len(neighbors)} courses, {saved} rows from {len(user_ids)} enrollments")
+    return saved
+
+
+# ------------------------------------------
+# 조회
+# ------------------------------------------
+async def get_recommendations(
+    db: AsyncSession, course_id: int, category_id: Optional[int], limit: int = 10
+) -> Tuple[str, Sequence[Tuple[int, float]]]:
+    """(source, [(course_id, score), ...]) - 미리 계산된 추천이 없으면 같은 카테고리 인기순"""
+    result = await db.execute(
+        select(models.CourseRecommendation.recommended_course_id, models.CourseRecommendation.score)
+        .where(models.CourseRecommendation.course_id == course_id)
+        .order_by(models.CourseRecommendation.rank)
+        .limit(limit)
+    )
+    items = [(rec_id, score) for rec_id, score in result]
+    if items or category_id is None:
+        return SOURCE_CO_ENROLLMENT, items
+
+    # 자기 자신이 섞여 있을 수 있으므로 1개 더 가져옴
+    popular = await rankings.get_ranking(db, rankings.RankingKind.POPULAR, category_id, limit=limit + 1)
+    items = [(cid, score) for cid, score in popular if cid != course_id][:limit]
+    if len(items) < limit:
+        # 수강생이 아직 없는 카테고리: 최신 강의로 채움 (score 0)
+        seen = {cid for cid, _ in items} | {course_id}
+        result = await db.execute(
+            select(models.Course.id)
+            .where(models.Course.category_id == category_id, models.Course.id.not_in(seen))
+            .order_by(models.Course.id.desc())
+            .limit(limit - len(items))
+        )
+        items += [(cid, 0.0) for cid in result.scalars()]
+    return SOURCE_CATEGORY, items
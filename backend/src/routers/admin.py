@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends
+import io
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import func
 
-from src import models, security
+from src import catalog_io, models, security
 from src.database import get_db
 
 # 관리자만 접근 가능하도록 설정
@@ -26,4 +31,59 @@ async def get_admin_stats(
         "total_users": user_count.scalar() or 0,
         "total_courses": course_count.scalar() or 0,
         "total_reviews": review_count.scalar() or 0
-    }
\ No newline at end of file
+    }
+
+
+def _catalog_format(fmt: Optional[str], filename: Optional[str]) -> str:
+    if fmt is None and filename:
+        fmt = filename.rsplit(".", 1)[-1].lower()
+    if fmt not in catalog_io.FORMATS:
+        raise HTTPException(status_code=400, detail="format must be ndjson or csv")
+    return fmt
+
+
+@router.get("/catalog/export")
+async def export_catalog(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    include: Optional[str] = Query(None, description="함께 내보낼 항목 (쉼표 구분): enrollments,reviews"),
+    db: AsyncSession = Depends(get_db),
+    current_admin: models.User = Depends(security.get_current_admin)
+):
+    """
+    [관리자] 강의 카탈로그 내보내기 (강의 + 차시, 선택: 수강 / 수강평)
+    - 서버 사이드 커서로 읽으면서 바로 내보내므로 카탈로그 크기와 관계없이 메모리 사용량이 일정합니다.
+    """
+    requested = {part.strip() for part in (include or "").split(",") if part.strip()}
+    unknown = requested - set(catalog_io.OPTIONAL_RECORDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"catalog_{datetime.utcnow():%Y%m%d%H%M%S}.{format}"
+    # StreamingResponse가 끝날 때까지 get_db 세션이 유지됨 (FastAPI >= 0.118)
+    return StreamingResponse(
+        catalog_io.export_stream(db, format, requested),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/catalog/import")
+async def import_catalog(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="생략 시 파일 확장자로 판단"),
+    dry_run: bool = Query(False, description="검증만 하고 저장하지 않음"),
+    db: AsyncSession = Depends(get_db),
+    current_admin: models.User = Depends(security.get_current_admin)
+):
+    """
+    [관리자] 강의 카탈로그 가져오기 (export 파일 형식, id 기준 upsert)
+    - 업로드 파일(디스크에 임시 저장)을 줄 단위로 읽어 CATALOG_IMPORT_BATCH_SIZE개씩 저장합니다.
+    - 잘못된 레코드는 건너뛰고 errors에 줄 번호와 함께 기록합니다.
+    """
+    fmt = _catalog_format(format, file.filename)
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return await catalog_io.import_file(db, text, fmt, dry_run=dry_run)
+    finally:
+        text.detach()
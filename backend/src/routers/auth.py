@@ -5,32 +5,21 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
 from jose import jwt, JWTError
 
-import firebase_admin
-from firebase_admin import auth as firebase_auth
-from firebase_admin import credentials
-
-from src import models, schemas, security, config
+from src import models, schemas, security, config, token_store, email_index
+from src.google_auth import GoogleTokenError, verifier as google_verifier
 from src.database import get_db
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 settings = config.settings
 
-# --- Firebase 초기화 ---
-try:
-    if not firebase_admin._apps:
-        cred = credentials.Certificate("/app/serviceAccountKey.json")
-        firebase_admin.initialize_app(cred)
-        print("✅ Firebase Admin Initialized!")
-except Exception as e:
-    print(f"⚠️ Firebase Init Failed: {e}")
-
 @router.post("/signup", response_model=schemas.UserResponse, status_code=201)
 async def create_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.User).where(models.User.email == user.email))
-    if result.scalars().first():
+    # 캐시가 '없음'이라고 하면 DB 조회 없이 바로 INSERT (경합은 UNIQUE 제약으로 방어)
+    if await email_index.email_exists(db, user.email, verify_positive=True):
         raise HTTPException(status_code=400, detail="Email already registered")
 
     new_user = models.User(
@@ -40,8 +29,13 @@ async def create_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_d
         provider="LOCAL",
     )
     db.add(new_user)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Email already registered")
     await db.refresh(new_user)
+    await email_index.add(new_user.email)
     return new_user
 
 @router.post("/login", response_model=schemas.Token)
@@ -59,25 +53,19 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Access & Refresh 토큰 생성
-    access_token = security.create_access_token(data={"sub": user.email, "role": user.role.value})
-    refresh_token = security.create_refresh_token(data={"sub": user.email})
-    
-    return {
-        "access_token": access_token, 
-        "refresh_token": refresh_token, 
-        "token_type": "bearer"
-    }
+    # Access & Refresh 토큰 생성 (새 토큰 패밀리)
+    return security.create_token_pair(user)
 
 @router.post("/google", response_model=schemas.Token)
 async def google_login(req: schemas.GoogleLoginRequest, db: AsyncSession = Depends(get_db)):
+    # 공개키 캐시 + 스레드 풀 서명 검증 (이벤트 루프를 막지 않음)
     try:
-        decoded_token = firebase_auth.verify_id_token(req.token)
-        email = decoded_token.get("email")
-        if not email:
-            raise HTTPException(status_code=400, detail="Invalid Google Token (No Email)")
-    except Exception as e:
+        decoded_token = await google_verifier.verify(req.token)
+    except GoogleTokenError as e:
         raise HTTPException(status_code=401, detail=f"Google Auth Failed: {str(e)}")
+    email = decoded_token.get("email")
+    if not email:
+        raise HTTPException(status_code=400, detail="Invalid Google Token (No Email)")
 
     result = await db.execute(select(models.User).where(models.User.email == email))
     user = result.scalars().first()
@@ -93,15 +81,17 @@ async def google_login(req: schemas.GoogleLoginRequest, db: AsyncSession = Depen
         db.add(user)
         await db.commit()
         await db.refresh(user)
+        await email_index.add(user.email)
 
-    access_token = security.create_access_token(data={"sub": user.email, "role": user.role.value})
-    refresh_token = security.create_refresh_token(data={"sub": user.email})
-    
-    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+    return security.create_token_pair(user)
 
 @router.post("/refresh", response_model=schemas.Token)
 async def refresh_token(req: schemas.TokenRefreshRequest, db: AsyncSession = Depends(get_db)):
-    """[수정] 리프레시 토큰을 검증하여 새로운 액세스 토큰 발급"""
+    """
+    리프레시 토큰 회전(Rotation)
+    - 사용된 리프레시 토큰은 즉시 무효화되고 새 액세스/리프레시 토큰 쌍을 발급합니다.
+    - 이미 사용된 리프레시 토큰이 다시 들어오면(탈취 의심) 해당 패밀리 전체를 폐기합니다.
+    """
     try:
         payload = jwt.decode(req.refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
@@ -111,20 +101,30 @@ async def refresh_token(req: schemas.TokenRefreshRequest, db: AsyncSession = Dep
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
 
+    if await token_store.is_revoked(payload):
+        raise HTTPException(status_code=401, detail="Refresh token has been revoked")
+
+    jti = payload.get("jti")
+    family = payload.get("fam")
+    if jti and not await token_store.mark_refresh_used(jti, payload.get("exp")):
+        # 재사용 감지 -> 같은 로그인 세션의 모든 토큰 폐기
+        if family:
+            await token_store.revoke_family(family)
+        raise HTTPException(status_code=401, detail="Refresh token reuse detected")
+
     result = await db.execute(select(models.User).where(models.User.email == email))
     user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
-    new_access_token = security.create_access_token(data={"sub": user.email, "role": user.role.value})
-    
-    return {
-        "access_token": new_access_token, 
-        "refresh_token": req.refresh_token, 
-        "token_type": "bearer"
-    }
+    return security.create_token_pair(user, family=family)
 
 @router.post("/logout")
-async def logout():
-    """로그아웃 (클라이언트 측에서 토큰 폐기 유도)"""
-    return {"message": "Successfully logged out"}
\ No newline at end of file
+async def logout(token: str = Depends(security.oauth2_scheme)):
+    """로그아웃 - 현재 토큰과 같은 로그인 세션(패밀리)의 액세스/리프레시 토큰을 모두 폐기"""
+    payload = await security.decode_access_token(token)
+    if payload.get("jti"):
+        await token_store.revoke_token(payload["jti"], payload.get("exp"))
+    if payload.get("fam"):
+        await token_store.revoke_family(payload["fam"])
+    return {"message": "Successfully logged out"}
@@ -4,8 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from src import models, schemas, security
-from src.database import get_db
+from src import models, schemas, security, category_registry
+from src.database import get_db, get_read_db
+from src.serializers import FastJSONResponse
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
@@ -27,11 +28,12 @@ async def create_category(
     new_category = models.Category(name=category_data.name)
     db.add(new_category)
     await db.commit()
-    await db.refresh(new_category)
+    # 이 워커 스냅샷 즉시 갱신 + 다른 워커에 전파 (Redis pub/sub)
+    await category_registry.publish(new_category)
     return new_category
 
 @router.get("", response_model=List[schemas.CategoryResponse])
-async def list_categories(db: AsyncSession = Depends(get_db)):
-    """카테고리 목록 조회 (전체 공개)"""
-    result = await db.execute(select(models.Category))
-    return result.scalars().all()
\ No newline at end of file
+async def list_categories(db: AsyncSession = Depends(get_read_db)):
+    """카테고리 목록 조회 (전체 공개) - 워커 메모리 스냅샷에서 응답, DB는 첫 로딩 때만"""
+    await category_registry.ensure(db)
+    return FastJSONResponse(category_registry.list_all())
\ No newline at end of file
@@ -1,114 +1,257 @@
+import asyncio
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 from sqlalchemy import func
 
-from src import models, schemas, security
-from src.database import get_db
+from src import models, schemas, security, category_registry, deletion, invalidation, rankings, recommendations, outbox, writes
+from src.database import get_db, get_read_db, get_read_session_factory, get_session_factory
+from src.idempotency import idempotent
+from src.serializers import (
+    FastJSONResponse, json_dumps, course_select, course_rows_to_dicts, course_to_dict,
+    review_select, review_row_to_dict,
+)
+from src.singleflight import SWRCache
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
+COURSE_PAGE_FIELDS = ("lectures", "reviews", "rating", "enrollment")
+
+# 강의 목록 / 상세 응답 캐시 - 강의 / 강사(user) / 카테고리 변경 시 무효화
+# 로더는 primary(get_session_factory)에서 읽음 - replica 지연 값이 무효화 직후 다시 캐싱되어
+# 모든 사용자(쓴 사용자 포함)에게 TTL 동안 보이는 것을 막음
+catalog_cache = SWRCache("courses")
+
+
+@invalidation.on("course", "user", "category")
+async def _evict_catalog(event: invalidation.Event) -> None:
+    if event.local:
+        # 쓴 워커에서 1회만 Redis 공유 값까지 삭제
+        await catalog_cache.invalidate()
+    else:
+        catalog_cache.clear_local()
+
+
+def _json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
 @router.post("", response_model=schemas.CourseResponse, status_code=201)
+@idempotent
 async def create_course(
     course_data: schemas.CourseCreate,
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(security.get_current_user)
 ):
-    """강의 생성 (DB 설정 수정 후 최종본)"""
-    new_course = models.Course(
+    """강의 생성 - INSERT ... RETURNING + 아웃박스 INSERT (응답용 재조회 없음, src/writes.py)"""
+    await category_registry.ensure(db, [course_data.category_id])
+    new_course = await writes.save(db, models.Course(
         **course_data.model_dump(),
         instructor_id=current_user.id
-    )
-    
-    db.add(new_course)
+    ))
+    # 부수 효과는 같은 트랜잭션의 아웃박스로 (워커가 처리)
+    outbox.enqueue(db, "course.created", {"course_id": new_course.id})
     await db.commit()
+    await invalidation.publish("course", new_course.id)
     # expire_on_commit=False 덕분에 여기서 new_course 데이터가 살아있습니다.
-    
-    # 관계 데이터(강사, 카테고리)를 로딩하기 위해 깔끔하게 재조회
-    query = (
-        select(models.Course)
-        .options(
-            selectinload(models.Course.instructor),
-            selectinload(models.Course.category)
-        )
-        .where(models.Course.id == new_course.id)
-    )
-    
-    result = await db.execute(query)
-    created_course = result.scalar_one_or_none()
-    
-    return created_course
+    # 관계 데이터는 이미 읽어 둔 강사 + 카테고리 레지스트리로 채움
+    return course_to_dict(new_course, current_user)
 
 @router.get("", response_model=schemas.PageResponse[schemas.CourseResponse])
 async def read_courses(
     page: int = 1,
     size: int = 20,
     keyword: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    session_factory=Depends(get_session_factory),
 ):
-    skip = (page - 1) * size
-    
-    # 쿼리 구성
-    query = select(models.Course).options(
-        selectinload(models.Course.instructor),
-        selectinload(models.Course.category)
-    )
-    
-    if keyword:
-        query = query.where(models.Course.title.ilike(f"%{keyword}%"))
-    
-    # 개수 카운트
-    count_query = select(func.count(models.Course.id))
-    if keyword:
-        count_query = count_query.where(models.Course.title.ilike(f"%{keyword}%"))
-    
-    count_res = await db.execute(count_query)
-    total_elements = count_res.scalar() or 0
-    
-    # 페이징 조회
-    query = query.offset(skip).limit(size)
-    result = await db.execute(query)
-    courses = result.scalars().all()
-    
-    return {
-        "content": courses,
-        "page": page,
-        "size": size,
-        "total_elements": total_elements,
-        "total_pages": (total_elements + size - 1) // size if total_elements > 0 else 0
-    }
+    async def load() -> bytes:
+        skip = (page - 1) * size
+        async with session_factory() as db:
+            # 쿼리 구성 (Core row 기반 빠른 직렬화 경로)
+            query = course_select()
+            count_query = select(func.count(models.Course.id))
+            if keyword:
+                query = query.where(models.Course.title.ilike(f"%{keyword}%"))
+                count_query = count_query.where(models.Course.title.ilike(f"%{keyword}%"))
+
+            # 개수 카운트
+            total_elements = (await db.execute(count_query)).scalar() or 0
+
+            # 페이징 조회
+            result = await db.execute(query.offset(skip).limit(size))
+            courses = await course_rows_to_dicts(db, result)
+
+        return json_dumps({
+            "content": courses,
+            "page": page,
+            "size": size,
+            "total_elements": total_elements,
+            "total_pages": (total_elements + size - 1) // size if total_elements > 0 else 0
+        })
+
+    # 캐시 만료 순간 동시 요청이 몰려도 DB 조회는 1회 (single-flight + stale-while-revalidate)
+    return _json_response(await catalog_cache.get_or_load(f"list:{page}:{size}:{keyword or ''}", load))
 
 @router.get("/search/query", response_model=List[schemas.CourseResponse])
-async def search_courses_explicit(keyword: str, db: AsyncSession = Depends(get_db)):
-    query = select(models.Course).options(
-        selectinload(models.Course.instructor),
-        selectinload(models.Course.category)
-    ).where(models.Course.title.ilike(f"%{keyword}%"))
+async def search_courses_explicit(keyword: str, db: AsyncSession = Depends(get_read_db)):
+    query = course_select().where(models.Course.title.ilike(f"%{keyword}%"))
     result = await db.execute(query)
-    return result.scalars().all()
+    return FastJSONResponse(await course_rows_to_dicts(db, result))
 
 @router.get("/filter/recent", response_model=List[schemas.CourseResponse])
-async def get_recent_courses(limit: int = 5, db: AsyncSession = Depends(get_db)):
-    query = select(models.Course).options(
-        selectinload(models.Course.instructor),
-        selectinload(models.Course.category)
-    ).order_by(models.Course.id.desc()).limit(limit)
+async def get_recent_courses(limit: int = 5, db: AsyncSession = Depends(get_read_db)):
+    query = course_select().order_by(models.Course.id.desc()).limit(limit)
     result = await db.execute(query)
-    return result.scalars().all()
+    return FastJSONResponse(await course_rows_to_dicts(db, result))
+
+@router.get("/filter/{kind}", response_model=List[schemas.RankedCourseResponse])
+async def get_ranked_courses(
+    kind: rankings.RankingKind,
+    category_id: Optional[int] = None,
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    인기(popular) / 평점(top-rated) / 급상승(trending) 강의 랭킹
+    - 미리 계산된 Redis Sorted Set에서 순위를 읽고, 강의 정보는 JOIN 쿼리 1회로 조회
+    """
+    ranked = await rankings.get_ranking(db, kind, category_id, offset=(page - 1) * size, limit=size)
+    if not ranked:
+        return FastJSONResponse([])
+    result = await db.execute(course_select().where(models.Course.id.in_([cid for cid, _ in ranked])))
+    courses = {course["id"]: course for course in await course_rows_to_dicts(db, result)}
+    # 랭킹 계산 이후 삭제된 강의는 건너뜀
+    return FastJSONResponse([
+        {**courses[cid], "score": score} for cid, score in ranked if cid in courses
+    ])
 
 @router.get("/{course_id}", response_model=schemas.CourseResponse)
-async def get_course_detail(course_id: int, db: AsyncSession = Depends(get_db)):
-    query = select(models.Course).options(
-        selectinload(models.Course.instructor),
-        selectinload(models.Course.category)
-    ).where(models.Course.id == course_id)
-    result = await db.execute(query)
-    course = result.scalar_one_or_none()
-    if not course:
+async def get_course_detail(course_id: int, session_factory=Depends(get_session_factory)):
+    async def load() -> bytes:
+        async with session_factory() as db:
+            courses = await course_rows_to_dicts(db, await db.execute(course_select().where(models.Course.id == course_id)))
+        if not courses:
+            # 예외는 캐싱되지 않고, 동시에 기다리던 요청에만 공유됨
+            raise HTTPException(status_code=404, detail="Course not found")
+        return json_dumps(courses[0])
+
+    return _json_response(await catalog_cache.get_or_load(f"detail:{course_id}", load))
+
+# --- 강의 페이지 묶음 조회용 로더 (각자 별도 세션에서 병렬 실행) ---
+async def _load_course_row(db: AsyncSession, course_id: int):
+    courses = await course_rows_to_dicts(db, await db.execute(course_select().where(models.Course.id == course_id)))
+    return courses[0] if courses else None
+
+async def _load_lectures(db: AsyncSession, course_id: int):
+    result = await db.execute(
+        select(models.Lecture.id, models.Lecture.title, models.Lecture.video_url,
+               models.Lecture.order_index, models.Lecture.course_id)
+        .where(models.Lecture.course_id == course_id)
+        .order_by(models.Lecture.order_index, models.Lecture.id)
+    )
+    return [dict(row._mapping) for row in result]
+
+async def _load_reviews(db: AsyncSession, course_id: int, size: int):
+    result = await db.execute(
+        review_select()
+        .where(models.Review.course_id == course_id)
+        .order_by(models.Review.created_at.desc())
+        .limit(size)
+    )
+    return [review_row_to_dict(row) for row in result]
+
+async def _load_rating(db: AsyncSession, course_id: int):
+    row = (await db.execute(
+        select(func.avg(models.Review.rating), func.count(models.Review.id))
+        .where(models.Review.course_id == course_id)
+    )).one()
+    average, count = row
+    return {"average": round(float(average), 2) if average is not None else None, "count": count}
+
+async def _load_enrollment(db: AsyncSession, course_id: int, email: Optional[str]):
+    if email is None:
+        return {"enrolled": False, "status": None, "enrolled_at": None}
+    # 토큰의 이메일로 바로 JOIN (유저 조회 쿼리 생략)
+    row = (await db.execute(
+        select(models.Enrollment.status, models.Enrollment.enrolled_at)
+        .join(models.User, models.Enrollment.user_id == models.User.id)
+        .where(models.User.email == email, models.Enrollment.course_id == course_id)
+    )).first()
+    if row is None:
+        return {"enrolled": False, "status": None, "enrolled_at": None}
+    return {"enrolled": True, "status": row.status, "enrolled_at": row.enrolled_at}
+
+@router.get("/{course_id}/recommendations", response_model=schemas.RecommendationResponse)
+async def get_course_recommendations(
+    course_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """이 강의를 들은 학생들이 함께 들은 강의 (데이터가 없으면 같은 카테고리 인기 강의)"""
+    course = (await db.execute(
+        select(models.Course.id, models.Course.category_id).where(models.Course.id == course_id)
+    )).first()
+    if course is None:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course
+    source, ranked = await recommendations.get_recommendations(db, course_id, course.category_id, limit)
+    courses = {}
+    if ranked:
+        result = await db.execute(course_select().where(models.Course.id.in_([cid for cid, _ in ranked])))
+        courses = {course["id"]: course for course in await course_rows_to_dicts(db, result)}
+    return FastJSONResponse({
+        "course_id": course_id,
+        "source": source,
+        "items": [{**courses[cid], "score": score} for cid, score in ranked if cid in courses],
+    })
+
+@router.get("/{course_id}/page", response_model=schemas.CoursePageResponse)
+async def get_course_page(
+    course_id: int,
+    fields: Optional[str] = Query(
+        None, description="포함할 항목 (쉼표 구분): lectures,reviews,rating,enrollment - 생략 시 전체"
+    ),
+    review_size: int = Query(10, ge=1, le=50),
+    token: Optional[str] = Depends(security.oauth2_scheme_optional),
+    session_factory=Depends(get_read_session_factory),
+):
+    """
+    강의 페이지 묶음 조회
+    - 상세 / 커리큘럼 / 첫 페이지 리뷰 / 평점 요약 / 내 수강 여부를 한 번의 요청으로 반환
+    - 각 쿼리는 별도 세션에서 동시에 실행 (요청 4회 + 존재 확인 4회 -> 요청 1회)
+    """
+    if fields:
+        requested = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = requested - set(COURSE_PAGE_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    else:
+        requested = set(COURSE_PAGE_FIELDS)
+
+    email = None
+    if "enrollment" in requested and token:
+        email = (await security.decode_access_token(token))["sub"]
+
+    loaders = {"course": lambda db: _load_course_row(db, course_id)}
+    if "lectures" in requested:
+        loaders["lectures"] = lambda db: _load_lectures(db, course_id)
+    if "reviews" in requested:
+        loaders["reviews"] = lambda db: _load_reviews(db, course_id, review_size)
+    if "rating" in requested:
+        loaders["rating"] = lambda db: _load_rating(db, course_id)
+    if "enrollment" in requested:
+        loaders["enrollment"] = lambda db: _load_enrollment(db, course_id, email)
+
+    async def run(loader):
+        async with session_factory() as db:
+            return await loader(db)
+
+    results = await asyncio.gather(*(run(loader) for loader in loaders.values()))
+    page = dict(zip(loaders.keys(), results))
+    if page["course"] is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return FastJSONResponse(page)
 
 @router.put("/{course_id}", response_model=schemas.CourseResponse)
 async def update_course(
@@ -117,7 +260,10 @@ async def update_course(
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(security.get_current_user)
 ):
-    query = select(models.Course).where(models.Course.id == course_id)
+    # 권한 확인용 조회에서 응답에 필요한 강사까지 JOIN으로 함께 로딩 (카테고리는 레지스트리)
+    query = select(models.Course).options(
+        joinedload(models.Course.instructor)
+    ).where(models.Course.id == course_id)
     result = await db.execute(query)
     course = result.scalar_one_or_none()
     
@@ -125,18 +271,15 @@ async def update_course(
         raise HTTPException(status_code=404, detail="Course not found")
     if course.instructor_id != current_user.id and current_user.role != models.UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized")
+    await category_registry.ensure(db, [course.category_id])
     
     for key, value in course_update.model_dump(exclude_unset=True).items():
         setattr(course, key, value)
+    outbox.enqueue(db, "course.updated", {"course_id": course_id})
+    # UPDATE ... RETURNING updated_at + 아웃박스 INSERT -> 재조회 없이 그대로 응답
     await db.commit()
-    
-    # 수정 후 조회도 selectinload 사용
-    query = select(models.Course).options(
-        selectinload(models.Course.instructor),
-        selectinload(models.Course.category)
-    ).where(models.Course.id == course_id)
-    result = await db.execute(query)
-    return result.scalar_one_or_none()
+    await invalidation.publish("course", course_id)
+    return course_to_dict(course, course.instructor)
 
 @router.delete("/{course_id}", status_code=204)
 async def delete_course(
@@ -144,15 +287,19 @@ async def delete_course(
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(security.get_current_user)
 ):
-    query = select(models.Course).where(models.Course.id == course_id)
-    result = await db.execute(query)
-    course = result.scalar_one_or_none()
-    
-    if not course:
+    # 권한 확인용 강사 id만 조회 (강의 / 자식 행을 ORM으로 읽지 않음)
+    row = (await db.execute(
+        select(models.Course.instructor_id).where(models.Course.id == course_id)
+    )).first()
+
+    if row is None:
         raise HTTPException(status_code=404, detail="Course not found")
-    if course.instructor_id != current_user.id and current_user.role != models.UserRole.ADMIN:
+    if row.instructor_id != current_user.id and current_user.role != models.UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized")
-        
-    await db.delete(course)
+
+    # 차시 DELETE / 수강·수강평 보관 / 강의 DELETE를 set-based statement로
+    await deletion.delete_course(db, course_id)
+    outbox.enqueue(db, "course.deleted", {"course_id": course_id})
     await db.commit()
+    await invalidation.publish("course", course_id)
     return None
\ No newline at end of file
@@ -1,11 +1,14 @@
+from datetime import datetime
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, update
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 
-from src import models, schemas, security
+from src import models, schemas, security, outbox, writes
 from src.database import get_db
+from src.serializers import FastJSONResponse, course_select, course_rows_to_dicts
+from src.idempotency import idempotent
 
 router = APIRouter(tags=["Enrollments"])
 
@@ -15,37 +18,40 @@ router = APIRouter(tags=["Enrollments"])
     status_code=201,
     response_model=schemas.EnrollmentResponse,
 )
+@idempotent
 async def enroll_course(
     course_id: int,
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(security.get_current_user),
 ):
-    # 1) 강의 존재 확인
-    course = (await db.execute(
-        select(models.Course).where(models.Course.id == course_id)
-    )).scalar_one_or_none()
-    if not course:
+    # 1) 강의 존재 + 중복 수강 여부를 한 번에 확인
+    row = (await db.execute(
+        select(models.Course.id, models.Enrollment.id.label("enrollment_id"))
+        .outerjoin(
+            models.Enrollment,
+            and_(
+                models.Enrollment.course_id == models.Course.id,
+                models.Enrollment.user_id == current_user.id,
+            ),
+        )
+        .where(models.Course.id == course_id)
+        .limit(1)
+    )).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Course not found")
 
     # 2) 중복 수강 확인
-    existing = (await db.execute(
-        select(models.Enrollment).where(
-            models.Enrollment.user_id == current_user.id,
-            models.Enrollment.course_id == course_id
-        )
-    )).scalar_one_or_none()
-    if existing:
+    if row.enrollment_id is not None:
         raise HTTPException(status_code=409, detail="Already enrolled")
 
-    # 3) 생성
-    new_enrollment = models.Enrollment(
+    # 3) 생성 - INSERT ... RETURNING으로 id / enrolled_at 채움 (refresh 없음)
+    new_enrollment = await writes.save(db, models.Enrollment(
         user_id=current_user.id,
         course_id=course_id,
         status="ACTIVE",
-    )
-    db.add(new_enrollment)
+    ))
+    outbox.enqueue(db, "enrollment.created", {"course_id": course_id, "user_id": current_user.id})
     await db.commit()
-    await db.refresh(new_enrollment)  # enrolled_at 채우기
 
     # ✅ 핵심: ORM 객체를 그대로 반환하지 말고 dict로 반환 (관계(course) lazy-load 방지)
     return {
@@ -66,17 +72,16 @@ async def get_my_enrollments(
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(security.get_current_user),
 ):
+    # 수강 -> 강의(+강사, 카테고리)를 JOIN 한 번으로 조회해서 바로 dict로 변환
     query = (
-        select(models.Enrollment)
-        .options(
-            selectinload(models.Enrollment.course).selectinload(models.Course.instructor),
-            selectinload(models.Enrollment.course).selectinload(models.Course.category),
-        )
+        course_select()
+        .join(models.Enrollment, models.Enrollment.course_id == models.Course.id)
         .where(models.Enrollment.user_id == current_user.id)
+        .order_by(models.Enrollment.id)
     )
 
-    enrollments = (await db.execute(query)).scalars().all()
-    return [e.course for e in enrollments if e.course is not None]
+    result = await db.execute(query)
+    return FastJSONResponse(await course_rows_to_dicts(db, result))
 
 
 # 3. 수강 취소 (DELETE)
@@ -86,16 +91,20 @@ async def cancel_enrollment(
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(security.get_current_user),
 ):
-    enrollment = (await db.execute(
-        select(models.Enrollment).where(
+    # 소프트 삭제: 조회 없이 UPDATE 1개, 바뀐 행이 없으면 수강 중이 아님
+    result = await db.execute(
+        update(models.Enrollment)
+        .where(
             models.Enrollment.user_id == current_user.id,
             models.Enrollment.course_id == course_id,
+            models.Enrollment.deleted_at.is_(None),
         )
-    )).scalar_one_or_none()
-
-    if not enrollment:
+        .values(status="CANCELED", deleted_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Enrollment not found")
 
-    await db.delete(enrollment)
+    outbox.enqueue(db, "enrollment.canceled", {"course_id": course_id, "user_id": current_user.id})
     await db.commit()
     return None
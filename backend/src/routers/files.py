@@ -3,6 +3,7 @@ import shutil
 import uuid
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import FileResponse
+from src.idempotency import idempotent
 
 # 라우터 설정
 router = APIRouter(prefix="/files", tags=["Files (Upload)"])
@@ -12,6 +13,7 @@ UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 @router.post("/upload", status_code=201)
+@idempotent
 async def upload_file(file: UploadFile = File(...)):
     """
     [추가 엔드포인트] 파일 업로드
@@ -1,15 +1,17 @@
 # backend/src/routers/lectures.py
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
 
-from src import models, schemas, security
-from src.database import get_db
+from src import models, schemas, security, invalidation
+from src.database import get_db, get_read_db
 
 router = APIRouter(tags=["Lectures"])
 
+MAX_BATCH_COURSES = 100
+
 # 강의 하위 리소스로 생성
 @router.post("/courses/{course_id}/lectures", response_model=schemas.LectureResponse, status_code=201)
 async def create_lecture(
@@ -31,14 +33,38 @@ async def create_lecture(
     db.add(new_lecture)
     await db.commit()
     await db.refresh(new_lecture)
+    await invalidation.publish("lecture", new_lecture.id)
     return new_lecture
 
 # 강의 하위 리소스로 목록 조회
 @router.get("/courses/{course_id}/lectures", response_model=List[schemas.LectureResponse])
 async def list_course_lectures(
     course_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    query = select(models.Lecture).where(models.Lecture.course_id == course_id)
+    query = (
+        select(models.Lecture)
+        .where(models.Lecture.course_id == course_id)
+        .order_by(models.Lecture.order_index, models.Lecture.id)
+    )
+    result = await db.execute(query)
+    return result.scalars().all()
+
+# 여러 강의의 차시를 한 번에 조회 (프론트 '내 강의실' N+1 호출 방지)
+@router.get("/lectures/batch", response_model=List[schemas.LectureResponse])
+async def list_lectures_batch(
+    course_ids: List[int] = Query(..., description="강의 ID 목록 (?course_ids=1&course_ids=2)"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """course_id IN (...) 한 번의 쿼리로 조회, 강의별 order_index 순으로 정렬"""
+    unique_ids = list(dict.fromkeys(course_ids))
+    if len(unique_ids) > MAX_BATCH_COURSES:
+        raise HTTPException(status_code=400, detail=f"Too many course_ids (max {MAX_BATCH_COURSES})")
+
+    query = (
+        select(models.Lecture)
+        .where(models.Lecture.course_id.in_(unique_ids))
+        .order_by(models.Lecture.course_id, models.Lecture.order_index, models.Lecture.id)
+    )
     result = await db.execute(query)
     return result.scalars().all()
\ No newline at end of file
@@ -1,11 +1,14 @@
+from datetime import datetime
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 
-from src import models, schemas, security
-from src.database import get_db
+from src import models, schemas, security, outbox, writes
+from src.database import get_db, get_read_db
+from src.serializers import FastJSONResponse, review_select, review_row_to_dict
+from src.idempotency import idempotent
 
 router = APIRouter(tags=["Reviews"])
 
@@ -16,45 +19,44 @@ router = APIRouter(tags=["Reviews"])
     status_code=201,
     response_model=schemas.ReviewResponse,
 )
+@idempotent
 async def create_review(
     course_id: int,
     review_create: schemas.ReviewCreate,
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(security.get_current_user),
 ):
-    # 강의 존재 확인
-    course = (await db.execute(select(models.Course).where(models.Course.id == course_id))).scalar_one_or_none()
-    if not course:
+    # 강의 존재 + 수강 여부를 한 번에 확인 (강의가 없으면 row 없음, 수강 안 했으면 enrollment_id None)
+    row = (await db.execute(
+        select(models.Course.id, models.Enrollment.id.label("enrollment_id"))
+        .outerjoin(
+            models.Enrollment,
+            and_(
+                models.Enrollment.course_id == models.Course.id,
+                models.Enrollment.user_id == current_user.id,
+                models.Enrollment.status == "ACTIVE",
+            ),
+        )
+        .where(models.Course.id == course_id)
+        .limit(1)
+    )).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Course not found")
 
     # (권장) 수강한 사람만 리뷰 작성 가능
-    enrolled = (await db.execute(
-        select(models.Enrollment).where(
-            models.Enrollment.user_id == current_user.id,
-            models.Enrollment.course_id == course_id,
-            models.Enrollment.status == "ACTIVE",
-        )
-    )).scalar_one_or_none()
-    if not enrolled:
+    if row.enrollment_id is None:
         raise HTTPException(status_code=403, detail="Enroll required to review")
 
-    review = models.Review(
+    # INSERT ... RETURNING + 아웃박스 INSERT, 작성자는 current_user로 채움 (refresh / 재조회 없음)
+    review = await writes.save(db, models.Review(
         user_id=current_user.id,
         course_id=course_id,
         rating=review_create.rating,
         comment=review_create.comment,
-    )
-    db.add(review)
+    ))
+    outbox.enqueue(db, "review.created", {"course_id": course_id, "review_id": review.id, "rating": review.rating})
     await db.commit()
-    await db.refresh(review)
-
-    # 응답에 user 포함이 필요하면(ReviewResponse가 user 포함하는 경우) selectinload로 재조회
-    result = await db.execute(
-        select(models.Review)
-        .options(selectinload(models.Review.user))
-        .where(models.Review.id == review.id)
-    )
-    return result.scalar_one()
+    return writes.attach(review, user=current_user)
 
 
 # ✅ 2) 강의별 수강평 조회 (GET) - 설계 문서/프론트용
@@ -64,20 +66,19 @@ async def create_review(
 )
 async def get_course_reviews(
     course_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     # 강의 존재 확인(없으면 404)
     course = (await db.execute(select(models.Course).where(models.Course.id == course_id))).scalar_one_or_none()
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
 
-    rows = (await db.execute(
-        select(models.Review)
-        .options(selectinload(models.Review.user))
+    result = await db.execute(
+        review_select()
         .where(models.Review.course_id == course_id)
         .order_by(models.Review.created_at.desc())
-    )).scalars().all()
-    return rows
+    )
+    return FastJSONResponse([review_row_to_dict(row) for row in result])
 
 
 # 3) 수강평 수정 (PUT) - 기존 경로 유지
@@ -97,14 +98,10 @@ async def update_review(
 
     review.rating = review_update.rating
     review.comment = review_update.comment
+    outbox.enqueue(db, "review.updated", {"course_id": review.course_id, "review_id": review_id, "rating": review.rating})
     await db.commit()
-
-    result = await db.execute(
-        select(models.Review)
-        .options(selectinload(models.Review.user))
-        .where(models.Review.id == review_id)
-    )
-    return result.scalar_one()
+    # 작성자 본인만 수정 가능하므로 user는 current_user
+    return writes.attach(review, user=current_user)
 
 
 # 4) 수강평 삭제 (DELETE) - 기존 경로 유지
@@ -121,6 +118,8 @@ async def delete_review(
     if review.user_id != current_user.id and current_user.role != models.UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized to delete this review")
 
-    await db.delete(review)
+    # 소프트 삭제 (오래된 삭제 행은 src.archive가 reviews_archive로 이동)
+    review.deleted_at = datetime.utcnow()
+    outbox.enqueue(db, "review.deleted", {"course_id": review.course_id, "review_id": review_id})
     await db.commit()
     return None
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import func
 
-from src import models, schemas, security
-from src.database import get_db
+from src import analytics, models, schemas, security
+from src.database import get_db, get_session_factory
 
 router = APIRouter(prefix="/admin/stats", tags=["Admin Stats"])
 
@@ -29,18 +31,35 @@ async def get_system_stats(
         "total_enrollments": enroll_count or 0
     }
 
-# --- [추가 엔드포인트] 일별 통계 ---
+# --- 일별 / 시간별 통계 (analytics_rollups 집계) ---
 @router.get("/daily")
-async def get_daily_stats_mock(
+async def get_daily_stats(
+    days: int = Query(7, ge=1, le=90),
+    db: AsyncSession = Depends(get_db),
+    session_factory=Depends(get_session_factory),
     current_user: models.User = Depends(security.get_current_user)
 ):
-    """[추가] 일별 방문자 및 가입자 통계 (Mock Data)"""
+    """일별 방문(API 요청) / 가입 / 수강 신청 수 - 최근 days일 + today (UTC)"""
     if current_user.role != models.UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    return {
-        "2023-12-20": {"visits": 120, "signups": 5},
-        "2023-12-21": {"visits": 145, "signups": 8},
-        "2023-12-22": {"visits": 200, "signups": 15},
-        "today": {"visits": 50, "signups": 2}
-    }
\ No newline at end of file
+    # 이 워커 버퍼에 남은 이벤트까지 반영 (다른 워커는 ANALYTICS_FLUSH_INTERVAL_SECONDS 이내 반영)
+    await analytics.flush(session_factory)
+    stats = await analytics.daily(db, days)
+    stats["today"] = stats[datetime.utcnow().date().isoformat()]
+    return stats
+
+@router.get("/hourly")
+async def get_hourly_stats(
+    day: Optional[date] = Query(None, alias="date", description="YYYY-MM-DD (UTC), 생략 시 오늘"),
+    db: AsyncSession = Depends(get_db),
+    session_factory=Depends(get_session_factory),
+    current_user: models.User = Depends(security.get_current_user)
+):
+    """시간별 방문(API 요청) / 가입 / 수강 신청 수 (UTC)"""
+    if current_user.role != models.UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    await analytics.flush(session_factory)
+    day = day or datetime.utcnow().date()
+    return {"date": day.isoformat(), "hours": await analytics.hourly(db, day)}
@@ -1,10 +1,19 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import io
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from src.database import get_db
-from src import models, schemas, security
+from src.database import get_db, get_session_factory
+from src.config import settings
+from src import models, schemas, security, deletion, email_index, invalidation, outbox
+from src.serializers import FastJSONResponse, USER_COLUMNS, json_dumps, user_select, user_row_to_dict
+
+EXPORT_FIELDS = ["id", "email", "role", "provider", "created_at"]
+EXPORT_CHUNK_SIZE = 1000
 
 router = APIRouter(prefix="/users", tags=["Users (Management)"])
 
@@ -19,8 +28,8 @@ async def check_email_exists(
     [신규] 이메일 중복 확인
     - 회원가입 전 단계이므로 Header에 Authorization 토큰이 없어도 200을 반환해야 합니다. [cite: 7, 14]
     """
-    result = await db.execute(select(models.User).where(models.User.email == email))
-    exists = result.scalars().first() is not None
+    # Redis Set으로 바로 응답, 불확실할 때만 DB 조회
+    exists = await email_index.email_exists(db, email)
     return {"email": email, "exists": exists}
 
 # --- [보호된 API] 일반 유저 인증 필요 ---
@@ -47,19 +56,116 @@ async def delete_me(
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(security.get_current_user)
 ):
-    await db.delete(current_user)
+    # 요청 안에서는 UPDATE 1개 (로그인 / 조회에서 즉시 제외), 참조 정리는 아웃박스 작업으로
+    email = current_user.email
+    await deletion.mark_user_deleted(db, current_user.id)
+    outbox.enqueue(db, "user.deleted", {"user_id": current_user.id})
     await db.commit()
+    await email_index.remove(email)
+    await invalidation.publish("user", current_user.id)
     return
 
 # --- [보호된 API] 관리자(ADMIN) 전용 ---
 
-@router.get("", response_model=List[schemas.UserResponse])
+def _apply_user_filters(
+    query,
+    role: Optional[models.UserRole],
+    provider: Optional[str],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+):
+    """관리자 회원 목록/내보내기 공통 필터"""
+    if role is not None:
+        query = query.where(models.User.role == role)
+    if provider:
+        query = query.where(models.User.provider == provider.upper())
+    if created_from is not None:
+        query = query.where(models.User.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(models.User.created_at < created_to)
+    return query
+
+@router.get("", response_model=schemas.CursorPageResponse[schemas.UserResponse])
 async def read_all_users(
+    cursor: Optional[int] = Query(None, description="이전 페이지의 next_cursor (마지막으로 받은 회원 id)"),
+    size: int = Query(50, ge=1, le=500),
+    role: Optional[models.UserRole] = None,
+    provider: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
     db: AsyncSession = Depends(get_db),
     current_admin: models.User = Depends(security.get_current_admin)
 ):
-    result = await db.execute(select(models.User))
-    return result.scalars().all()
+    """
+    [관리자] 회원 목록 (Keyset 페이지네이션)
+    - OFFSET 대신 id > cursor 조건을 사용하므로 뒤쪽 페이지도 인덱스로 바로 찾아갑니다.
+    """
+    query = _apply_user_filters(user_select(), role, provider, created_from, created_to)
+    if cursor is not None:
+        query = query.where(models.User.id > cursor)
+    # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+    query = query.order_by(models.User.id).limit(size + 1)
+
+    rows = (await db.execute(query)).all()
+    has_next = len(rows) > size
+    rows = rows[:size]
+
+    return FastJSONResponse({
+        "content": [user_row_to_dict(row) for row in rows],
+        "size": size,
+        "next_cursor": rows[-1].id if has_next else None,
+    })
+
+@router.get("/export")
+async def export_users(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    role: Optional[models.UserRole] = None,
+    provider: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db),
+    current_admin: models.User = Depends(security.get_current_admin)
+):
+    """
+    [관리자] 회원 내보내기 (CSV / NDJSON 스트리밍)
+    - 서버 사이드 커서(db.stream)로 EXPORT_CHUNK_SIZE 단위로 읽어 바로 내보내므로
+      회원 수와 관계없이 메모리 사용량이 일정합니다.
+    """
+    query = _apply_user_filters(
+        select(*USER_COLUMNS, models.User.provider), role, provider, created_from, created_to
+    ).order_by(models.User.id).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+
+    async def generate_rows():
+        # StreamingResponse가 끝날 때까지 get_db 세션이 유지됨 (FastAPI >= 0.118)
+        result = await db.stream(query)
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            async for partition in result.partitions():
+                for row in partition:
+                    writer.writerow([
+                        row.id, row.email, row.role.value, row.provider,
+                        row.created_at.isoformat() if row.created_at else "",
+                    ])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+            yield buffer.getvalue()
+        else:
+            async for partition in result.partitions():
+                yield b"".join(
+                    json_dumps({**user_row_to_dict(row), "provider": row.provider}) + b"\n"
+                    for row in partition
+                )
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"users_{datetime.utcnow():%Y%m%d%H%M%S}.{format}"
+    return StreamingResponse(
+        generate_rows(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 @router.get("/{user_id}", response_model=schemas.UserResponse)
 async def read_user_detail(
@@ -73,16 +179,47 @@ async def read_user_detail(
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
-@router.delete("/{user_id}", status_code=204)
+@router.delete("/{user_id}", status_code=202)
 async def delete_user_by_admin(
     user_id: int,
+    purge: bool = Query(False, description="true면 요청 안에서 참조 정리까지 하고 204 반환 (참조가 많으면 오래 걸림)"),
     db: AsyncSession = Depends(get_db),
+    session_factory=Depends(get_session_factory),
     current_admin: models.User = Depends(security.get_current_admin)
 ):
-    result = await db.execute(select(models.User).where(models.User.id == user_id))
-    user = result.scalars().first()
-    if not user:
+    """
+    [관리자] 회원 삭제 - delete_me와 같이 1단계(UPDATE 1개)만 하고 참조 정리는 아웃박스 작업(user.deleted)으로
+    - 202 + 상태 조회 URL (GET /users/{user_id}/deletion)
+    """
+    email = (await db.execute(select(models.User.email).where(models.User.id == user_id))).scalar_one_or_none()
+    if email is None:
         raise HTTPException(status_code=404, detail="User not found")
-    await db.delete(user)
+    await deletion.mark_user_deleted(db, user_id)
+    if not purge:
+        outbox.enqueue(db, "user.deleted", {"user_id": user_id})
     await db.commit()
-    return
\ No newline at end of file
+    await email_index.remove(email)
+    await invalidation.publish("user", user_id)
+
+    if purge:
+        # 참조 정리 (청크마다 commit)
+        await deletion.purge_user(session_factory, user_id)
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    status_url = f"{settings.API_V1_STR}/users/{user_id}/deletion"
+    return FastJSONResponse(
+        {"user_id": user_id, "status": "PENDING", "status_url": status_url},
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": status_url},
+    )
+
+@router.get("/{user_id}/deletion")
+async def get_user_deletion_status(
+    user_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_admin: models.User = Depends(security.get_current_admin)
+):
+    """회원 삭제 진행 상태 (PENDING: 참조 정리 중 / DELETED: 완료)"""
+    deletion_state = await deletion.deletion_status(db, user_id)
+    if deletion_state is None:
+        raise HTTPException(status_code=404, detail="User is not being deleted")
+    return deletion_state
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List, Generic, TypeVar, Dict, Any
+from typing import Optional, List, Generic, TypeVar, Dict, Any, Literal, Union, Annotated
 from datetime import datetime
 from src.models import UserRole
 
@@ -98,6 +98,14 @@ class CourseResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class RankedCourseResponse(CourseResponse):
+    score: float
+
+class RecommendationResponse(BaseModel):
+    course_id: int
+    source: str  # co-enrollment(함께 수강) | category(신규 강의 대체 추천)
+    items: List[RankedCourseResponse]
+
 # --- Lecture Schemas ---
 class LectureCreate(BaseModel):
     title: str = Field(min_length=2, max_length=200)
@@ -154,6 +162,24 @@ class ReviewResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# --- Course Page (Aggregate) Schemas ---
+class RatingSummary(BaseModel):
+    average: Optional[float] = None
+    count: int = 0
+
+class EnrollmentStatus(BaseModel):
+    enrolled: bool
+    status: Optional[str] = None
+    enrolled_at: Optional[datetime] = None
+
+class CoursePageResponse(BaseModel):
+    """강의 페이지 렌더링용 묶음 응답 (fields로 요청한 항목만 포함)"""
+    course: CourseResponse
+    lectures: Optional[List[LectureResponse]] = None
+    reviews: Optional[List[ReviewResponse]] = None
+    rating: Optional[RatingSummary] = None
+    enrollment: Optional[EnrollmentStatus] = None
+
 # --- Stats Schemas ---
 class SystemStats(BaseModel):
     total_users: int
@@ -170,4 +196,54 @@ class PageResponse(BaseModel, Generic[T]):
     total_pages: int
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# --- Cursor(Keyset) Pagination Schema ---
+class CursorPageResponse(BaseModel, Generic[T]):
+    content: List[T]
+    size: int
+    next_cursor: Optional[int] = None  # 다음 페이지 요청 시 cursor로 전달 (없으면 마지막 페이지)
+
+# --- Catalog Export / Import Records (src/catalog_io.py) ---
+# NDJSON 한 줄 / CSV 한 행 = 레코드 1개, type으로 구분 (강의 -> 차시 -> 수강 -> 수강평 순서로 내보냄)
+class CatalogCourseRecord(BaseModel):
+    type: Literal["course"]
+    id: int
+    title: str = Field(min_length=1, max_length=200)
+    description: Optional[str] = None
+    price: int = Field(ge=0, default=0)
+    level: str = Field("BEGINNER", max_length=50)
+    thumbnail_url: Optional[str] = Field(None, max_length=500)
+    is_public: bool = True
+    category: Optional[str] = Field(None, max_length=100)       # 카테고리 이름 (없으면 생성)
+    instructor_email: Optional[str] = None                      # 대상 DB에 있는 회원이어야 함
+
+class CatalogLectureRecord(BaseModel):
+    type: Literal["lecture"]
+    id: int
+    course_id: int
+    title: str = Field(min_length=1, max_length=200)
+    video_url: str = Field(pattern=r"^https?://", max_length=500)
+    order_index: int = 1
+
+class CatalogEnrollmentRecord(BaseModel):
+    type: Literal["enrollment"]
+    id: int
+    course_id: int
+    user_email: str
+    status: str = Field("ACTIVE", max_length=50)
+    enrolled_at: Optional[datetime] = None
+
+class CatalogReviewRecord(BaseModel):
+    type: Literal["review"]
+    id: int
+    course_id: int
+    user_email: str
+    rating: int = Field(ge=1, le=5)
+    comment: str = Field(min_length=1)
+    created_at: Optional[datetime] = None
+
+CatalogRecord = Annotated[
+    Union[CatalogCourseRecord, CatalogLectureRecord, CatalogEnrollmentRecord, CatalogReviewRecord],
+    Field(discriminator="type"),
+]
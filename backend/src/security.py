@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Any
 
@@ -8,7 +9,7 @@ from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from src import models, schemas, config
+from src import analytics, models, schemas, config, token_store
 from src.database import get_db
 
 settings = config.settings
@@ -18,6 +19,8 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # OAuth2 스키마 (로그인 URL 지정)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
+# 비로그인도 허용하는 엔드포인트용 (토큰이 없으면 None)
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -32,25 +35,32 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    # 타입과 만료시간 추가
-    to_encode.update({"exp": expire, "type": "access"})
+    # 타입과 만료시간, 토큰 ID(jti) 추가
+    to_encode.update({"exp": expire, "type": "access", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 def create_refresh_token(data: dict) -> str:
-    """[추가] 리프레시 토큰 생성 (7일 수명)"""
+    """[추가] 리프레시 토큰 생성 (REFRESH_TOKEN_EXPIRE_DAYS 수명)"""
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=7)
+    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     # ALGORITHM 대신 settings.ALGORITHM으로 수정되었습니다.
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-# 현재 로그인한 유저 가져오기
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), 
-    db: AsyncSession = Depends(get_db)
-) -> models.User:
+def create_token_pair(user: models.User, family: Optional[str] = None) -> dict:
+    """
+    액세스 + 리프레시 토큰 발급
+    - family(fam): 로그인 1회 = 패밀리 1개. 리프레시 회전 시에는 기존 패밀리를 이어받습니다.
+    """
+    family = family or uuid.uuid4().hex
+    access_token = create_access_token(data={"sub": user.email, "role": user.role.value, "fam": family})
+    refresh_token = create_refresh_token(data={"sub": user.email, "fam": family})
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+async def decode_access_token(token: str) -> dict:
+    """액세스 토큰 검증 (서명/만료/타입/폐기 여부) 후 payload 반환"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -64,12 +74,29 @@ async def get_current_user(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+
+    # 로그아웃 등으로 폐기된 토큰인지 확인 (로컬 LRU -> Redis 1회)
+    if await token_store.is_revoked(payload):
+        raise credentials_exception
+    return payload
+
+# 현재 로그인한 유저 가져오기
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), 
+    db: AsyncSession = Depends(get_db)
+) -> models.User:
+    payload = await decode_access_token(token)
         
     # DB에서 유저 조회
-    result = await db.execute(select(models.User).where(models.User.email == email))
+    result = await db.execute(select(models.User).where(models.User.email == payload["sub"]))
     user = result.scalars().first()
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    analytics.set_user(user.id)
     return user
 
 # 관리자 권한 확인 함수
@@ -0,0 +1,167 @@
+# backend/src/serializers.py
+"""
+목록 API 전용 빠른 직렬화 경로
+
+- ORM 객체 + Pydantic(from_attributes) 검증 대신 Core row(select 컬럼)를 바로 dict로 매핑합니다.
+- 응답은 orjson 기반 FastJSONResponse로 렌더링합니다. (orjson 미설치 시 표준 json으로 폴백)
+- 응답 스키마(OpenAPI 문서)는 기존 response_model을 그대로 유지합니다.
+- 강의의 category는 JOIN 대신 워커 메모리의 카테고리 레지스트리(src.category_registry)에서 채웁니다.
+"""
+import json
+from typing import Any, Iterable, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src import category_registry, models
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson은 선택 의존성
+    orjson = None
+
+
+def json_dumps(content: Any) -> bytes:
+    """dict/list -> JSON bytes (orjson 우선, 없으면 표준 json)"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson으로 직렬화하는 기본 응답 클래스 (datetime / Enum 네이티브 처리)"""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+# --- Course (+ instructor, category는 레지스트리) ---
+Instructor = aliased(models.User, name="instructor")
+
+COURSE_COLUMNS = (
+    models.Course.id,
+    models.Course.title,
+    models.Course.description,
+    models.Course.price,
+    models.Course.level,
+    models.Course.thumbnail_url,
+    models.Course.category_id,
+    models.Course.instructor_id,
+    models.Course.created_at,
+    models.Course.updated_at,
+    Instructor.email.label("instructor_email"),
+    Instructor.role.label("instructor_role"),
+    Instructor.created_at.label("instructor_created_at"),
+)
+
+
+def course_select():
+    """강의 + 강사를 한 번의 JOIN 쿼리로 조회하는 Core select (카테고리는 course_rows_to_dicts에서 채움)"""
+    return select(*COURSE_COLUMNS).outerjoin(Instructor, models.Course.instructor_id == Instructor.id)
+
+
+def course_row_to_dict(row) -> dict:
+    """course_select() 결과 row -> CourseResponse 형태의 dict (레지스트리가 로딩된 상태여야 함)"""
+    return {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "price": row.price,
+        "level": row.level,
+        "thumbnail_url": row.thumbnail_url,
+        "category_id": row.category_id,
+        "instructor_id": row.instructor_id,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "category": category_registry.get(row.category_id),
+        "instructor": _user_dict(
+            row.instructor_id, row.instructor_email, row.instructor_role, row.instructor_created_at
+        ),
+    }
+
+
+def course_to_dict(course: models.Course, instructor: Optional[models.User]) -> dict:
+    """쓰기 직후의 ORM 객체 -> CourseResponse 형태의 dict (관계 재조회 없이 강사는 이미 로딩된 객체로)"""
+    return {
+        "id": course.id,
+        "title": course.title,
+        "description": course.description,
+        "price": course.price,
+        "level": course.level,
+        "thumbnail_url": course.thumbnail_url,
+        "category_id": course.category_id,
+        "instructor_id": course.instructor_id,
+        "created_at": course.created_at,
+        "updated_at": course.updated_at,
+        "category": category_registry.get(course.category_id),
+        "instructor": (
+            _user_dict(instructor.id, instructor.email, instructor.role, instructor.created_at)
+            if instructor is not None else None
+        ),
+    }
+
+
+async def course_rows_to_dicts(db: AsyncSession, rows: Iterable) -> List[dict]:
+    """course_select() 결과 rows -> dict 목록 (모르는 카테고리 id가 있으면 레지스트리 재로딩 1회)"""
+    rows = list(rows)
+    await category_registry.ensure(db, (row.category_id for row in rows))
+    return [course_row_to_dict(row) for row in rows]
+
+
+# --- Review (+ user) ---
+REVIEW_COLUMNS = (
+    models.Review.id,
+    models.Review.user_id,
+    models.Review.course_id,
+    models.Review.rating,
+    models.Review.comment,
+    models.Review.created_at,
+    models.User.email.label("user_email"),
+    models.User.role.label("user_role"),
+    models.User.created_at.label("user_created_at"),
+)
+
+
+def review_select():
+    """리뷰 + 작성자를 한 번의 JOIN 쿼리로 조회하는 Core select"""
+    return select(*REVIEW_COLUMNS).outerjoin(models.User, models.Review.user_id == models.User.id)
+
+
+def review_row_to_dict(row) -> dict:
+    """review_select() 결과 row -> ReviewResponse 형태의 dict"""
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "course_id": row.course_id,
+        "rating": row.rating,
+        "comment": row.comment,
+        "created_at": row.created_at,
+        "user": _user_dict(row.user_id, row.user_email, row.user_role, row.user_created_at),
+    }
+
+
+# --- User ---
+USER_COLUMNS = (
+    models.User.id,
+    models.User.email,
+    models.User.role,
+    models.User.created_at,
+)
+
+
+def user_select():
+    return select(*USER_COLUMNS)
+
+
+def user_row_to_dict(row) -> dict:
+    """user_select() 결과 row -> UserResponse 형태의 dict"""
+    return _user_dict(row.id, row.email, row.role, row.created_at)
+
+
+def _user_dict(user_id, email, role, created_at) -> Optional[dict]:
+    if email is None:
+        return None
+    return {"id": user_id, "email": email, "role": role, "created_at": created_at}
@@ -0,0 +1,239 @@
+# backend/src/singleflight.py
+"""
+Single-flight + stale-while-revalidate 캐시
+
+- SingleFlight: 워커 안에서 같은 키로 동시에 들어온 호출을 1회 실행으로 합침 (나머지는 같은 결과를 기다림)
+- SWRCache: 직렬화된 응답(bytes)을 fresh(ttl) / stale(stale_ttl) 두 단계로 캐싱
+  - fresh: 그대로 반환
+  - stale: 이전 값을 즉시 반환하고, 백그라운드에서 1회만 재조회 (만료 순간 DB로 몰리는 요청 방지)
+  - miss : 워커 내 single-flight + (Redis 연결 시) 워커 간 Redis 락
+           -> 락을 잡은 워커 하나만 DB를 조회하고, 나머지 워커는 Redis에 값이 채워질 때까지 기다림
+- 로더는 백그라운드에서도 실행되므로 요청 세션이 아니라 자체 세션을 열어야 합니다. (get_session_factory)
+  - 무효화 직후 지연된 replica 값이 다시 캐싱되지 않도록 primary에서 읽습니다.
+- 무효화 세대: invalidate()는 Redis 세대 번호(swr:gen:<namespace>)를 올리고, 다른 워커의 clear_local()은 로컬 세대를 올림
+  -> 무효화 전에 시작된 로드 결과는 로컬 캐시에도, Redis에도 저장하지 않음 (WATCH로 세대 비교 후 SET)
+- Redis가 없으면 워커 로컬 캐시만 사용합니다.
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from redis.exceptions import WatchError
+
+from src import cache
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[bytes]]
+POLL_INTERVAL = 0.05
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable]):
+        """key가 같은 동시 호출은 첫 호출의 결과(또는 예외)를 공유"""
+        future = self._calls.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 쪽이 없으면 "exception was never retrieved" 경고가 나므로 소비
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._calls.pop(key, None)
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+
+class SWRCache:
+    def __init__(
+        self,
+        namespace: str,
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None,
+        lock_timeout: Optional[float] = None,
+        maxsize: int = 1024,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl if ttl is not None else settings.CATALOG_CACHE_TTL_SECONDS
+        self.stale_ttl = stale_ttl if stale_ttl is not None else settings.CATALOG_CACHE_STALE_SECONDS
+        self.lock_timeout = lock_timeout if lock_timeout is not None else settings.SINGLEFLIGHT_LOCK_TIMEOUT_SECONDS
+        # key -> (value, fresh_until(epoch))
+        self._local = cache.LocalTTLCache(maxsize=maxsize)
+        self._flight = SingleFlight()
+        self._background: Set[asyncio.Task] = set()
+        # invalidate() 이전에 시작된 로드 결과가 무효화 뒤에 저장되지 않도록 세대 번호로 구분
+        self._generation = 0
+        _registry.append(self)
+
+    # --- Redis 키 ---
+    def _redis_key(self, key: str) -> str:
+        return f"swr:{self.namespace}:{key}"
+
+    def _lock_key(self, key: str) -> str:
+        return f"swr:lock:{self.namespace}:{key}"
+
+    @property
+    def _keys_set(self) -> str:
+        return f"swr:keys:{self.namespace}"
+
+    @property
+    def _generation_key(self) -> str:
+        return f"swr:gen:{self.namespace}"
+
+    # --- 조회 ---
+    async def get_or_load(self, key: str, loader: Loader) -> bytes:
+        entry = self._local.get(key)
+        if entry is not None:
+            value, fresh_until = entry
+            if time.time() >= fresh_until:
+                self._revalidate(key, loader)
+            return value
+        return await self._flight.do(key, lambda: self._load_shared(key, loader))
+
+    def _revalidate(self, key: str, loader: Loader) -> None:
+        """stale 값을 반환하는 동안 백그라운드에서 1회만 재조회"""
+        if self._flight.in_flight(key):
+            return
+        task = asyncio.create_task(self._flight.do(key, lambda: self._load_shared(key, loader, accept_stale=False)))
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"SWR revalidation failed ({self.namespace}): {task.exception()}")
+
+    def _set_local(self, key: str, entry: tuple, generation: int) -> None:
+        # 값을 읽는 동안 무효화됐으면 로컬에 저장하지 않음
+        if generation == self._generation:
+            self._local.set(key, entry, self.stale_ttl)
+
+    async def _load_shared(self, key: str, loader: Loader, accept_stale: bool = True) -> bytes:
+        client = cache.redis_client
+        if client is None:
+            return await self._load(key, loader)
+        generation = self._generation
+        locked = False
+        try:
+            shared = await self._read_redis(key)
+            if shared is not None:
+                value, fresh_until = shared
+                if accept_stale or time.time() < fresh_until:
+                    self._set_local(key, shared, generation)
+                    if time.time() >= fresh_until:
+                        self._revalidate(key, loader)
+                    return value
+            # 워커 간 락: 잡은 워커만 DB 조회
+            locked = bool(await client.set(self._lock_key(key), "1", px=int(self.lock_timeout * 1000), nx=True))
+            if not locked:
+                deadline = time.monotonic() + self.lock_timeout
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(POLL_INTERVAL)
+                    shared = await self._read_redis(key)
+                    if shared is not None and (accept_stale or time.time() < shared[1]):
+                        self._set_local(key, shared, generation)
+                        return shared[0]
+                # 락을 잡은 워커가 응답이 없으면 직접 조회
+        except Exception as e:
+            logger.warning(f"SWR Redis error ({self.namespace}), loading locally: {e}")
+            return await self._load(key, loader)
+        try:
+            return await self._load(key, loader)
+        finally:
+            if locked:
+                try:
+                    await client.delete(self._lock_key(key))
+                except Exception:
+                    pass
+
+    async def _read_redis(self, key: str):
+        raw = await cache.redis_client.get(self._redis_key(key))
+        if raw is None:
+            return None
+        fresh_until, _, body = raw.partition("|")
+        return body.encode("utf-8"), float(fresh_until)
+
+    async def _load(self, key: str, loader: Loader) -> bytes:
+        generation = self._generation
+        client = cache.redis_client
+        shared_generation = None
+        if client is not None:
+            try:
+                shared_generation = await client.get(self._generation_key)
+            except Exception as e:
+                logger.warning(f"SWR Redis error ({self.namespace}): {e}")
+                client = None
+        value = await loader()
+        if generation != self._generation:
+            return value
+        fresh_until = time.time() + self.ttl
+        self._local.set(key, (value, fresh_until), self.stale_ttl)
+        if client is not None:
+            try:
+                await self._write_redis(client, key, f"{fresh_until}|{value.decode('utf-8')}", shared_generation)
+            except WatchError:
+                pass
+            except Exception as e:
+                logger.warning(f"SWR Redis write failed ({self.namespace}): {e}")
+        return value
+
+    async def _write_redis(self, client, key: str, payload: str, shared_generation) -> None:
+        """로드 시작 때의 세대가 그대로일 때만 저장 (중간에 invalidate()가 세대를 올리면 WatchError)"""
+        async with client.pipeline(transaction=True) as pipe:
+            await pipe.watch(self._generation_key)
+            if await pipe.get(self._generation_key) != shared_generation:
+                # 로드 중에 다른 워커가 무효화함 -> 이전 값이므로 저장하지 않음
+                return
+            pipe.multi()
+            pipe.set(self._redis_key(key), payload, px=int(self.stale_ttl * 1000))
+            pipe.sadd(self._keys_set, key)
+            pipe.expire(self._keys_set, int(self.stale_ttl) + 1)
+            await pipe.execute()
+
+    # --- 무효화 ---
+    async def invalidate(self) -> None:
+        """네임스페이스 전체 무효화 (이 워커 로컬 + Redis)"""
+        self._generation += 1
+        self._local.clear()
+        client = cache.redis_client
+        if client is None:
+            return
+        try:
+            # 세대를 먼저 올려 진행 중인 로드가 이전 값을 다시 저장하지 못하게 함
+            await client.incr(self._generation_key)
+            keys = await client.smembers(self._keys_set)
+            if keys:
+                await client.delete(*(self._redis_key(k) for k in keys), self._keys_set)
+        except Exception as e:
+            logger.warning(f"SWR invalidation failed ({self.namespace}): {e}")
+
+    def clear_local(self) -> None:
+        """다른 워커의 무효화 알림 - 진행 중인 로드 결과도 로컬에 저장되지 않도록 세대를 올림"""
+        self._generation += 1
+        self._local.clear()
+
+
+_registry: list = []
+
+
+def clear_all_local() -> None:
+    """테스트용: 모든 SWRCache의 워커 로컬 값 제거"""
+    for swr in _registry:
+        swr.clear_local()
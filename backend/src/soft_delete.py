@@ -0,0 +1,47 @@
+# backend/src/soft_delete.py
+"""
+소프트 삭제 (enrollments / reviews)
+
+- 수강 취소 / 수강평 삭제는 행을 지우지 않고 deleted_at만 기록합니다. (UPDATE 1개)
+  -> 오래된 삭제 행은 src.archive의 Archiver가 보관 테이블로 옮김
+- 조회에서 삭제 행 제외: Session의 do_orm_execute 훅이 모든 ORM SELECT에
+  with_loader_criteria(deleted_at IS NULL)를 붙입니다. (JOIN ON 절, 관계 로딩 포함)
+  - 라우터마다 조건을 빠뜨릴 위험이 없고, 기존 쿼리(랭킹 / 통계 / 추천 등)도 그대로 삭제 행을 제외
+  - 삭제 행까지 봐야 하면 .execution_options(include_deleted=True)
+  - Core Table(models.X.__table__)로 만든 statement에는 적용되지 않음 (보관 작업용)
+- 살아 있는 행만 담는 부분 인덱스(live_index): PostgreSQL / SQLite는 WHERE deleted_at IS NULL 부분 인덱스,
+  MySQL은 부분 인덱스가 없으므로 deleted_at을 마지막 컬럼으로 둔 복합 인덱스로 같은 조건을 처리
+"""
+from sqlalchemy import Column, DateTime, Index, event, text
+from sqlalchemy.orm import Session, with_loader_criteria
+
+INCLUDE_DELETED = "include_deleted"
+_LIVE = text("deleted_at IS NULL")
+_DELETED = text("deleted_at IS NOT NULL")
+
+
+class SoftDeleteMixin:
+    deleted_at = Column(DateTime, nullable=True)   # UTC (datetime.utcnow)
+
+
+def live_index(name: str, *columns: str) -> Index:
+    """살아 있는 행(deleted_at IS NULL) 조회용 인덱스"""
+    return Index(name, *columns, "deleted_at", sqlite_where=_LIVE, postgresql_where=_LIVE)
+
+
+def deleted_index(name: str) -> Index:
+    """보관 대상(삭제 행) 조회용 인덱스 - 삭제 행은 적으므로 부분 인덱스가 작게 유지됨"""
+    return Index(name, "deleted_at", sqlite_where=_DELETED, postgresql_where=_DELETED)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _exclude_deleted(state) -> None:
+    if (
+        state.is_select
+        and not state.is_column_load
+        and not state.is_relationship_load
+        and not state.execution_options.get(INCLUDE_DELETED, False)
+    ):
+        state.statement = state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
@@ -0,0 +1,113 @@
+# backend/src/token_store.py
+"""
+토큰 폐기 목록(Revocation List) - Redis 기반
+
+- 모든 토큰은 jti(토큰 ID)와 fam(로그인 세션 단위 토큰 패밀리 ID) 클레임을 가집니다.
+- 로그아웃: 해당 패밀리 전체를 폐기 (TTL = 리프레시 토큰 최대 수명)
+- 리프레시 토큰 회전: 한 번 사용된 리프레시 토큰을 다시 쓰면 탈취로 보고 패밀리 전체를 폐기
+- get_current_user 확인 비용: Redis EXISTS 1회 (앞단에 워커 로컬 LRU 캐시)
+- Redis가 연결되지 않은 경우(테스트/로컬)에는 프로세스 메모리에 저장합니다.
+"""
+import logging
+import time
+from typing import Optional
+
+from src import cache
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+REVOKED_TOKEN_KEY = "auth:revoked:{}"
+REVOKED_FAMILY_KEY = "auth:revoked_family:{}"
+USED_REFRESH_KEY = "auth:refresh_used:{}"
+
+# jti -> 폐기 여부 (폐기=True는 만료 시점까지, False는 짧은 TTL 동안 캐싱)
+_verdicts = cache.LocalTTLCache(maxsize=settings.TOKEN_REVOCATION_CACHE_SIZE)
+# 이 워커에서 폐기한 패밀리 (다른 워커의 폐기는 Redis 조회로 반영)
+_revoked_families = cache.LocalTTLCache(maxsize=settings.TOKEN_REVOCATION_CACHE_SIZE)
+# Redis 미연결 시 대체 저장소
+_memory_store = cache.LocalTTLCache(maxsize=100_000)
+
+
+def _remaining_ttl(exp: Optional[int]) -> int:
+    """토큰 만료 시각(exp, epoch sec)까지 남은 초 (최소 1초)"""
+    if exp is None:
+        return settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+    return max(int(exp - time.time()), 1)
+
+
+def _family_ttl() -> int:
+    # 패밀리 안의 어떤 토큰도 지금부터 리프레시 토큰 수명보다 오래 살 수 없음
+    return settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+
+async def _set(key: str, ttl: int, nx: bool = False) -> bool:
+    """key를 TTL과 함께 기록. nx=True이면 이미 있을 때 False 반환"""
+    client = cache.redis_client
+    if client is not None:
+        try:
+            return bool(await client.set(key, "1", ex=ttl, nx=nx))
+        except Exception as e:
+            logger.warning(f"Token store Redis error (fallback to memory): {e}")
+    if nx and _memory_store.get(key) is not None:
+        return False
+    _memory_store.set(key, True, ttl)
+    return True
+
+
+async def revoke_token(jti: str, exp: Optional[int]) -> None:
+    """단일 토큰 폐기 (토큰 만료 시점까지 유지)"""
+    ttl = _remaining_ttl(exp)
+    _verdicts.set(jti, True, ttl)
+    await _set(REVOKED_TOKEN_KEY.format(jti), ttl)
+
+
+async def revoke_family(fam: str) -> None:
+    """로그인 세션(패밀리)에서 발급된 모든 액세스/리프레시 토큰 폐기"""
+    ttl = _family_ttl()
+    _revoked_families.set(fam, True, ttl)
+    await _set(REVOKED_FAMILY_KEY.format(fam), ttl)
+
+
+async def mark_refresh_used(jti: str, exp: Optional[int]) -> bool:
+    """
+    리프레시 토큰 사용 기록 (SET NX)
+    - 처음 사용이면 True, 이미 사용된 토큰(재사용)이면 False
+    """
+    return await _set(USED_REFRESH_KEY.format(jti), _remaining_ttl(exp), nx=True)
+
+
+async def is_revoked(payload: dict) -> bool:
+    """디코딩된 JWT payload가 폐기되었는지 확인 (hot path)"""
+    jti = payload.get("jti")
+    fam = payload.get("fam")
+    if not jti:
+        # jti 도입 이전에 발급된 토큰은 폐기 대상이 아님
+        return False
+    if fam and fam in _revoked_families:
+        return True
+
+    cached = _verdicts.get(jti)
+    if cached is not None:
+        return cached
+
+    keys = [REVOKED_TOKEN_KEY.format(jti)]
+    if fam:
+        keys.append(REVOKED_FAMILY_KEY.format(fam))
+
+    client = cache.redis_client
+    if client is not None:
+        try:
+            revoked = await client.exists(*keys) > 0
+        except Exception as e:
+            # 레이트 리미터와 동일하게 Redis 장애 시 요청은 통과시킴 (fail-open)
+            logger.warning(f"Token revocation check failed: {e}")
+            return False
+    else:
+        revoked = any(_memory_store.get(key) is not None for key in keys)
+
+    if revoked:
+        _verdicts.set(jti, True, _remaining_ttl(payload.get("exp")))
+    else:
+        _verdicts.set(jti, False, settings.TOKEN_REVOCATION_NEGATIVE_TTL_SECONDS)
+    return revoked
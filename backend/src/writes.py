@@ -0,0 +1,40 @@
+# backend/src/writes.py
+"""
+쓰기 경로 헬퍼 - 쓰기 엔드포인트당 DB statement 최소화
+
+기존: commit -> refresh -> selectinload 재조회 (쓰기 1 + 왕복 2~3)
+변경: 쓰기 statement(INSERT/UPDATE) + 아웃박스 INSERT, 최대 2개로 응답까지 완료
+- 서버 기본값(id, created_at, updated_at 등)은 모델의 eager_defaults(EAGER_DEFAULTS)로
+  flush 시 INSERT/UPDATE ... RETURNING에서 함께 받아옵니다. (RETURNING 미지원 DB는 SQLAlchemy가 PK로 1회 재조회)
+- 응답에 필요한 관계(강사 / 작성자)는 재조회하지 않고
+  이미 세션 identity map에 있는 객체(get_current_user의 사용자, 권한 확인 때 읽은 강의 등)로 채웁니다. -> attach()
+- 카테고리는 워커 메모리의 src.category_registry에서 채웁니다.
+- 세션은 expire_on_commit=False 이므로 commit 후에도 속성이 그대로 남아 refresh가 필요 없습니다.
+"""
+from typing import TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+# 쓰기 응답에 서버 기본값이 필요한 모델의 __mapper_args__
+EAGER_DEFAULTS = {"eager_defaults": True}
+
+T = TypeVar("T")
+
+
+def attach(obj: T, **related) -> T:
+    """
+    관계 속성을 이미 로드된 객체로 채움 (SQL 없음, 변경 이력 없음)
+    - attach(review, user=current_user)
+    - 채우지 않은 관계를 응답 직렬화에서 접근하면 async 세션에서 lazy load 오류가 나므로 응답에 쓰는 관계는 모두 지정
+    """
+    for key, value in related.items():
+        set_committed_value(obj, key, value)
+    return obj
+
+
+async def save(db: AsyncSession, obj: T) -> T:
+    """새 객체 INSERT (RETURNING으로 id / 서버 기본값 채움) - commit은 호출한 쪽에서 (아웃박스와 같은 트랜잭션)"""
+    db.add(obj)
+    await db.flush()
+    return obj
@@ -2,12 +2,13 @@
 import pytest
 import asyncio
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool # [중요] SQLite 메모리용 풀
 
-from src.database import Base, get_db
-from src import models
+from src.database import Base, get_db, get_read_db, get_session_factory, get_read_session_factory
+from src import models, cache, singleflight, category_registry
 from src.main import app
 
 # 테스트용 인메모리 DB (SQLite)
@@ -54,6 +55,23 @@ async def db_session():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
+@pytest.fixture(scope="function")
+def session_factory(db_session):
+    """세션을 직접 여는 코드(워커 / 배치 작업) 테스트용 - db_session과 같은 DB"""
+    return TestingSessionLocal
+
+@pytest.fixture(scope="function")
+def sql_statements():
+    """실행된 SQL statement 기록 (쿼리 수 검증용)"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
 @pytest.fixture(scope="function")
 async def client(db_session):
     """FastAPI 앱의 DB 의존성을 가짜 DB 세션으로 교체"""
@@ -61,10 +79,26 @@ async def client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    app.dependency_overrides[get_read_session_factory] = lambda: TestingSessionLocal
+    # 이전 테스트의 DB 기준으로 캐싱된 응답 제거
+    singleflight.clear_all_local()
+    category_registry.reset()
     
     # Transport 설정으로 httpx 최신 버전 대응
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as c:
         yield c
     
-    app.dependency_overrides.clear()
\ No newline at end of file
+    app.dependency_overrides.clear()
+
+@pytest.fixture(scope="function")
+async def fake_redis():
+    """Redis가 필요한 기능 테스트용 가짜 Redis (fakeredis)"""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    cache.redis_client = client
+    yield client
+    cache.redis_client = None
+    await client.aclose()
@@ -311,4 +311,1415 @@ async def test_create_review(client: AsyncClient):
     
     payload = {"rating": 5, "comment": "Great course!"}
     response = await client.post(f"/api/v1/courses/{cid}/reviews", json=payload, headers=headers)
-    assert response.status_code == 201
\ No newline at end of file
+    assert response.status_code == 201
+
+# --- 7. Fast Serialization Path ---
+
+@pytest.mark.asyncio
+async def test_list_courses_nested_fields(client: AsyncClient):
+    """목록 API(Core row + orjson)가 CourseResponse와 같은 형태를 유지하는지 확인"""
+    email = "fast_admin@test.com"
+    await client.post("/api/v1/auth/signup", json={"email": email, "password": "password123", "role": "ADMIN"})
+    token = (await client.post("/api/v1/auth/login", data={"username": email, "password": "password123"})).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    cat_id = (await client.post("/api/v1/categories", json={"name": "Backend"}, headers=headers)).json()["id"]
+    await client.post("/api/v1/courses", json={"title": "Fast Path", "category_id": cat_id}, headers=headers)
+    await client.post("/api/v1/courses", json={"title": "No Category"}, headers=headers)
+
+    response = await client.get("/api/v1/courses?page=1&size=10")
+    assert response.status_code == 200
+    content = {c["title"]: c for c in response.json()["content"]}
+    assert content["Fast Path"]["category"] == {"id": cat_id, "name": "Backend"}
+    assert content["Fast Path"]["instructor"]["email"] == email
+    assert content["Fast Path"]["instructor"]["role"] == "ADMIN"
+    assert content["No Category"]["category"] is None
+
+@pytest.mark.asyncio
+async def test_course_reviews_and_my_enrollments_shape(client: AsyncClient):
+    email = "fast_stu@test.com"
+    await client.post("/api/v1/auth/signup", json={"email": email, "password": "password123"})
+    token = (await client.post("/api/v1/auth/login", data={"username": email, "password": "password123"})).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    cid = (await client.post("/api/v1/courses", json={"title": "Shape Course"}, headers=headers)).json()["id"]
+    await client.post(f"/api/v1/courses/{cid}/enroll", headers=headers)
+    await client.post(f"/api/v1/courses/{cid}/reviews", json={"rating": 4, "comment": "Nice course"}, headers=headers)
+
+    my = (await client.get("/api/v1/enrollments/me", headers=headers)).json()
+    assert [c["id"] for c in my] == [cid]
+    assert my[0]["instructor"]["email"] == email
+
+    reviews = (await client.get(f"/api/v1/courses/{cid}/reviews")).json()
+    assert reviews[0]["rating"] == 4
+    assert reviews[0]["user"]["email"] == email
+
+
+# --- 8. Admin User Listing & Export ---
+
+async def _admin_headers(client: AsyncClient, email: str) -> dict:
+    await client.post("/api/v1/auth/signup", json={"email": email, "password": "password123", "role": "ADMIN"})
+    token = (await client.post("/api/v1/auth/login", data={"username": email, "password": "password123"})).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.mark.asyncio
+async def test_admin_users_keyset_pagination(client: AsyncClient):
+    headers = await _admin_headers(client, "list_admin@test.com")
+    for i in range(4):
+        await client.post("/api/v1/auth/signup", json={"email": f"page_user{i}@test.com", "password": "password123"})
+
+    first = (await client.get("/api/v1/users?size=3", headers=headers)).json()
+    assert len(first["content"]) == 3
+    assert first["next_cursor"] is not None
+
+    second = (await client.get(f"/api/v1/users?size=3&cursor={first['next_cursor']}", headers=headers)).json()
+    assert len(second["content"]) == 2
+    assert second["next_cursor"] is None
+
+    admins = (await client.get("/api/v1/users?role=ADMIN", headers=headers)).json()
+    assert [u["email"] for u in admins["content"]] == ["list_admin@test.com"]
+
+@pytest.mark.asyncio
+async def test_admin_users_export_stream(client: AsyncClient):
+    headers = await _admin_headers(client, "export_admin@test.com")
+    await client.post("/api/v1/auth/signup", json={"email": "export_user@test.com", "password": "password123"})
+
+    csv_res = await client.get("/api/v1/users/export?format=csv", headers=headers)
+    assert csv_res.status_code == 200
+    lines = csv_res.text.strip().splitlines()
+    assert lines[0] == "id,email,role,provider,created_at"
+    assert len(lines) == 3
+
+    nd_res = await client.get("/api/v1/users/export?format=ndjson&role=USER", headers=headers)
+    assert nd_res.status_code == 200
+    rows = [line for line in nd_res.text.splitlines() if line]
+    assert len(rows) == 1 and "export_user@test.com" in rows[0]
+
+
+# --- 9. Token Revocation (Logout / Refresh Rotation) ---
+
+@pytest.mark.asyncio
+async def test_logout_revokes_access_token(client: AsyncClient):
+    email = "logout_user@test.com"
+    await client.post("/api/v1/auth/signup", json={"email": email, "password": "password123"})
+    tokens = (await client.post("/api/v1/auth/login", data={"username": email, "password": "password123"})).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 200
+    assert (await client.post("/api/v1/auth/logout", headers=headers)).status_code == 200
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 401
+
+    # 같은 로그인 세션의 리프레시 토큰도 폐기됨
+    res = await client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert res.status_code == 401
+
+@pytest.mark.asyncio
+async def test_refresh_rotation_and_reuse_detection(client: AsyncClient):
+    email = "rotate_user@test.com"
+    await client.post("/api/v1/auth/signup", json={"email": email, "password": "password123"})
+    tokens = (await client.post("/api/v1/auth/login", data={"username": email, "password": "password123"})).json()
+
+    rotated = await client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert rotated.status_code == 200
+    new_tokens = rotated.json()
+    assert new_tokens["refresh_token"] != tokens["refresh_token"]
+
+    # 이미 사용한 리프레시 토큰 재사용 -> 패밀리 전체 폐기
+    reuse = await client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reuse.status_code == 401
+    res = await client.post("/api/v1/auth/refresh", json={"refresh_token": new_tokens["refresh_token"]})
+    assert res.status_code == 401
+    me = await client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {new_tokens['access_token']}"})
+    assert me.status_code == 401
+
+
+# --- 10. Email Existence Cache ---
+
+@pytest.mark.asyncio
+async def test_email_index_answers_without_db(client: AsyncClient, db_session, fake_redis):
+    from src import email_index
+
+    await client.post("/api/v1/auth/signup", json={"email": "cached@test.com", "password": "password123"})
+    assert await email_index.warm(db_session) == 1
+
+    # Set만으로 응답 (대소문자 무시)
+    assert (await client.get("/api/v1/users/check-email?email=CACHED@test.com")).json()["exists"] is True
+    assert await email_index.contains("nobody@test.com") is False
+
+    # 회원가입 시 Set에 동기화
+    await client.post("/api/v1/auth/signup", json={"email": "new_cached@test.com", "password": "password123"})
+    assert await email_index.contains("new_cached@test.com") is True
+    dup = await client.post("/api/v1/auth/signup", json={"email": "new_cached@test.com", "password": "password123"})
+    assert dup.status_code == 400
+
+    # 탈퇴 시 Set에서 제거
+    token = (await client.post("/api/v1/auth/login", data={"username": "new_cached@test.com", "password": "password123"})).json()["access_token"]
+    await client.delete("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert (await client.get("/api/v1/users/check-email?email=new_cached@test.com")).json()["exists"] is False
+
+@pytest.mark.asyncio
+async def test_email_index_falls_back_to_db_when_not_warmed(client: AsyncClient, fake_redis):
+    from src import email_index
+
+    await client.post("/api/v1/auth/signup", json={"email": "cold@test.com", "password": "password123"})
+    assert await email_index.contains("cold@test.com") is None
+    assert (await client.get("/api/v1/users/check-email?email=cold@test.com")).json()["exists"] is True
+
+@pytest.mark.asyncio
+async def test_email_index_warm_applies_changes_made_during_build(client: AsyncClient, db_session, fake_redis, monkeypatch):
+    from src import email_index
+
+    await client.post("/api/v1/auth/signup", json={"email": "scanned@test.com", "password": "password123"})
+    leaving = await _login_headers(client, "leaving@test.com")
+    await fake_redis.sadd(email_index.EMAIL_SET_KEY, "stale@test.com")   # 이전 Set에 남은 오래된 값
+    sadd = fake_redis.sadd
+
+    async def sadd_then_change(key, *members):
+        result = await sadd(key, *members)
+        if key.endswith(":tmp"):
+            # DB 스캔 이후, 교체 전에 가입 / 탈퇴한 회원 (add()/remove()가 기존 Set을 바꿈)
+            await email_index.add("late@test.com")
+            assert (await client.delete("/api/v1/users/me", headers=leaving)).status_code == 204
+        return result
+
+    monkeypatch.setattr(fake_redis, "sadd", sadd_then_change)
+    assert await email_index.warm(db_session) == 2
+    monkeypatch.setattr(fake_redis, "sadd", sadd)
+
+    assert await email_index.contains("scanned@test.com") is True
+    assert await email_index.contains("late@test.com") is True
+    assert await email_index.contains("stale@test.com") is False
+    assert (await client.get("/api/v1/users/check-email?email=leaving@test.com")).json()["exists"] is False
+    assert not await fake_redis.exists(f"{email_index.EMAIL_SET_KEY}:tmp", email_index.EMAIL_SET_DELTA_KEY)
+
+    # 빌드 중이 아니면 delta를 남기지 않음
+    await email_index.add("after@test.com")
+    assert not await fake_redis.exists(email_index.EMAIL_SET_DELTA_KEY)
+
+
+# --- 11. Google ID Token Verification (offline stub keys) ---
+
+def _stub_google_signer():
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+@pytest.mark.asyncio
+async def test_google_login_with_stub_keys(client: AsyncClient, monkeypatch):
+    import time
+    from jose import jwt
+    from src.google_auth import GoogleTokenVerifier
+    from src.routers import auth
+
+    private_pem, public_pem = _stub_google_signer()
+    verifier = GoogleTokenVerifier(project_id="demo-project")
+    verifier.use_static_keys({"kid-1": public_pem})
+    monkeypatch.setattr(auth, "google_verifier", verifier)
+
+    now = int(time.time())
+    claims = {
+        "iss": "https://securetoken.google.com/demo-project", "aud": "demo-project",
+        "sub": "google-uid-1", "email": "google_user@test.com",
+        "iat": now, "exp": now + 600, "auth_time": now,
+    }
+    token = jwt.encode(claims, private_pem, algorithm="RS256", headers={"kid": "kid-1"})
+    response = await client.post("/api/v1/auth/google", json={"token": token})
+    assert response.status_code == 200
+    assert "access_token" in response.json()
+
+    wrong_aud = jwt.encode({**claims, "aud": "other"}, private_pem, algorithm="RS256", headers={"kid": "kid-1"})
+    assert (await client.post("/api/v1/auth/google", json={"token": wrong_aud})).status_code == 401
+
+    unknown_kid = jwt.encode(claims, private_pem, algorithm="RS256", headers={"kid": "kid-2"})
+    assert (await client.post("/api/v1/auth/google", json={"token": unknown_kid})).status_code == 401
+
+def test_parse_cache_control_max_age():
+    from src.google_auth import _parse_max_age, DEFAULT_MAX_AGE
+
+    assert _parse_max_age("public, max-age=19766, must-revalidate, no-transform") == 19766
+    assert _parse_max_age(None) == DEFAULT_MAX_AGE
+
+
+# --- 12. Lecture Batch Lookup ---
+
+@pytest.mark.asyncio
+async def test_list_lectures_batch(client: AsyncClient):
+    email = "batch_user@test.com"
+    await client.post("/api/v1/auth/signup", json={"email": email, "password": "password123"})
+    token = (await client.post("/api/v1/auth/login", data={"username": email, "password": "password123"})).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    cid1 = (await client.post("/api/v1/courses", json={"title": "Batch One"}, headers=headers)).json()["id"]
+    cid2 = (await client.post("/api/v1/courses", json={"title": "Batch Two"}, headers=headers)).json()["id"]
+    await client.post(f"/api/v1/courses/{cid1}/lectures", json={"title": "Second", "video_url": "http://v.com/2", "order_index": 2}, headers=headers)
+    await client.post(f"/api/v1/courses/{cid1}/lectures", json={"title": "First", "video_url": "http://v.com/1", "order_index": 1}, headers=headers)
+    await client.post(f"/api/v1/courses/{cid2}/lectures", json={"title": "Only", "video_url": "http://v.com/3"}, headers=headers)
+
+    response = await client.get(f"/api/v1/lectures/batch?course_ids={cid1}&course_ids={cid2}")
+    assert response.status_code == 200
+    assert [(l["course_id"], l["title"]) for l in response.json()] == [(cid1, "First"), (cid1, "Second"), (cid2, "Only")]
+
+
+def test_frontend_lecture_batch_splits_over_server_limit(monkeypatch):
+    import os, sys
+    pytest.importorskip("streamlit")
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "frontend"))
+    import api_client
+    from src.routers.lectures import MAX_BATCH_COURSES
+
+    assert api_client.MAX_BATCH_COURSES == MAX_BATCH_COURSES
+    requested = []
+
+    class FakeResponse:
+        def __init__(self, lectures):
+            self._lectures = lectures
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self._lectures
+
+    def fake_get(path, token=None, params=None, **kwargs):
+        # 서버와 같은 한도 - 넘으면 400이므로 여기서 실패
+        assert path == "/lectures/batch" and len(params["course_ids"]) <= MAX_BATCH_COURSES
+        requested.append(params["course_ids"])
+        return FakeResponse([{"course_id": cid, "title": f"L{cid}"} for cid in params["course_ids"] if cid % 2])
+
+    monkeypatch.setattr(api_client, "get", fake_get)
+    course_ids = tuple(range(1, 251))   # 수강 강의 250개
+    grouped = api_client.fetch_lectures_batch(course_ids)
+    assert [len(ids) for ids in requested] == [100, 100, 50]
+    assert list(grouped) == list(course_ids)
+    assert grouped[1] == [{"course_id": 1, "title": "L1"}] and grouped[2] == []
+    assert sum(len(lectures) for lectures in grouped.values()) == 125
+
+
+# --- 13. Course Page Aggregate ---
+
+@pytest.mark.asyncio
+async def test_course_page_aggregate(client: AsyncClient):
+    email = "page_user@test.com"
+    await client.post("/api/v1/auth/signup", json={"email": email, "password": "password123"})
+    token = (await client.post("/api/v1/auth/login", data={"username": email, "password": "password123"})).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    cid = (await client.post("/api/v1/courses", json={"title": "Aggregate Course"}, headers=headers)).json()["id"]
+    await client.post(f"/api/v1/courses/{cid}/lectures", json={"title": "Intro", "video_url": "http://v.com"}, headers=headers)
+    await client.post(f"/api/v1/courses/{cid}/enroll", headers=headers)
+    await client.post(f"/api/v1/courses/{cid}/reviews", json={"rating": 4, "comment": "Pretty good"}, headers=headers)
+
+    page = (await client.get(f"/api/v1/courses/{cid}/page", headers=headers)).json()
+    assert page["course"]["title"] == "Aggregate Course"
+    assert [l["title"] for l in page["lectures"]] == ["Intro"]
+    assert page["reviews"][0]["comment"] == "Pretty good"
+    assert page["rating"] == {"average": 4.0, "count": 1}
+    assert page["enrollment"]["enrolled"] is True
+
+    # 필드 선택 + 비로그인
+    partial = (await client.get(f"/api/v1/courses/{cid}/page?fields=rating,enrollment")).json()
+    assert set(partial.keys()) == {"course", "rating", "enrollment"}
+    assert partial["enrollment"]["enrolled"] is False
+
+    assert (await client.get("/api/v1/courses/99999/page")).status_code == 404
+    assert (await client.get(f"/api/v1/courses/{cid}/page?fields=nope")).status_code == 400
+
+
+# --- 14. Response Compression ---
+
+@pytest.mark.asyncio
+async def test_list_response_is_compressed(client: AsyncClient):
+    email = "gzip_user@test.com"
+    await client.post("/api/v1/auth/signup", json={"email": email, "password": "password123"})
+    token = (await client.post("/api/v1/auth/login", data={"username": email, "password": "password123"})).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(10):
+        await client.post("/api/v1/courses", json={"title": f"Compressed {i}", "description": "long text " * 30}, headers=headers)
+
+    gz = await client.get("/api/v1/courses?size=10", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in gz.headers["vary"]
+    assert len(gz.json()["content"]) == 10
+
+    br = await client.get("/api/v1/courses?size=10", headers={"Accept-Encoding": "gzip, br"})
+    assert br.headers["content-encoding"] == "br"
+
+    identity = await client.get("/api/v1/courses?size=10", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+    # 작은 응답은 압축하지 않음
+    small = await client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+@pytest.mark.asyncio
+async def test_compressed_media_is_not_recompressed(client: AsyncClient):
+    files = {"file": ("big.png", b"\x89PNG" + b"\x00" * 4096, "image/png")}
+    url = (await client.post("/api/v1/files/upload", files=files)).json()["url"]
+    response = await client.get(url, headers={"Accept-Encoding": "gzip, br"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+def test_choose_encoding_negotiation():
+    from src.compression import choose_encoding
+
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0") == "gzip"
+    assert choose_encoding("identity") is None
+
+
+# --- 15. Read Replica Routing ---
+
+@pytest.mark.asyncio
+async def test_read_routing_prefers_replica_until_own_write(monkeypatch):
+    from starlette.requests import Request
+    from src import database, security
+
+    primary, replica = object(), object()
+    monkeypatch.setattr(database, "async_session_maker", primary)
+    monkeypatch.setattr(database, "read_session_maker", replica)
+    monkeypatch.setattr(database, "read_engine", object())
+    monkeypatch.setattr(database.replica_health, "healthy", True)
+
+    token = security.create_access_token({"sub": "sticky@test.com", "role": "USER"})
+    request = Request({"type": "http", "method": "GET", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+    anonymous = Request({"type": "http", "method": "GET", "headers": []})
+
+    assert await database.choose_read_session_maker(request) is replica
+    await database.remember_write(request)
+    assert await database.choose_read_session_maker(request) is primary
+    assert await database.choose_read_session_maker(anonymous) is replica
+
+    # 복제 지연이 크면 모두 primary
+    monkeypatch.setattr(database.replica_health, "healthy", False)
+    assert await database.choose_read_session_maker(anonymous) is primary
+
+
+# --- 16. Lazy Startup ---
+
+def test_app_import_does_not_load_lazy_modules():
+    import subprocess, sys
+    from benchmarks.profile_startup import BACKEND_DIR, LAZY_MODULES
+
+    code = "import sys, src.main; print(','.join(m for m in %r if m in sys.modules))" % (LAZY_MODULES,)
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_parse_importtime_output():
+    from benchmarks.profile_startup import parse_importtime, by_package
+
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |     sqlalchemy.sql\n"
+        "import time:        50 |        150 |   sqlalchemy\n"
+        "import time:        30 |        180 | src.main\n"
+    )
+    records = parse_importtime(output)
+    assert [r.name for r in records] == ["sqlalchemy.sql", "sqlalchemy", "src.main"]
+    assert records[0].depth == 2 and records[2].depth == 0
+    assert by_package(records) == {"sqlalchemy": 150, "src.main": 30}
+
+
+# --- 17. Course Rankings ---
+
+async def _seed_ranking_data(db_session):
+    from datetime import datetime, timedelta
+    from src import models
+
+    now = datetime.utcnow()
+    cat_a, cat_b = models.Category(name="Rank A"), models.Category(name="Rank B")
+    instructor = models.User(email="rank_teacher@test.com", hashed_password="x")
+    students = [models.User(email=f"rank_s{i}@test.com", hashed_password="x") for i in range(4)]
+    db_session.add_all([cat_a, cat_b, instructor, *students])
+    await db_session.flush()
+    c1, c2, c3 = (
+        models.Course(title=f"Rank {i}", instructor_id=instructor.id, category_id=cat.id)
+        for i, cat in ((1, cat_a), (2, cat_a), (3, cat_b))
+    )
+    db_session.add_all([c1, c2, c3])
+    await db_session.flush()
+    # c1: 오래된 수강 3건 / c3: 최근 수강 2건
+    for s in students[:3]:
+        db_session.add(models.Enrollment(user_id=s.id, course_id=c1.id, enrolled_at=now - timedelta(days=30)))
+    for s in students[:2]:
+        db_session.add(models.Enrollment(user_id=s.id, course_id=c3.id, enrolled_at=now - timedelta(hours=1)))
+    # c2: 5점 1건 / c3: 5점 3건 / c1: 1점 1건 -> 리뷰가 많은 c3가 c2보다 위
+    db_session.add(models.Review(user_id=students[0].id, course_id=c2.id, rating=5, comment="great"))
+    db_session.add(models.Review(user_id=students[0].id, course_id=c1.id, rating=1, comment="bad"))
+    for s in students[:3]:
+        db_session.add(models.Review(user_id=s.id, course_id=c3.id, rating=5, comment="good"))
+    await db_session.commit()
+    return cat_a.id, (c1.id, c2.id, c3.id)
+
+
+@pytest.mark.asyncio
+async def test_course_rankings_local_snapshot(client: AsyncClient, db_session):
+    from src import rankings
+
+    rankings.reset()
+    cat_a, (c1, c2, c3) = await _seed_ranking_data(db_session)
+
+    popular = (await client.get("/api/v1/courses/filter/popular")).json()
+    assert [c["id"] for c in popular] == [c1, c3]
+    assert popular[0]["score"] == 3.0
+
+    top_rated = (await client.get("/api/v1/courses/filter/top-rated")).json()
+    assert [c["id"] for c in top_rated] == [c3, c2, c1]
+
+    trending = (await client.get("/api/v1/courses/filter/trending")).json()
+    assert [c["id"] for c in trending] == [c3]
+
+    by_category = (await client.get(f"/api/v1/courses/filter/popular?category_id={cat_a}")).json()
+    assert [c["id"] for c in by_category] == [c1]
+    assert (await client.get("/api/v1/courses/filter/unknown")).status_code == 422
+    rankings.reset()
+
+
+@pytest.mark.asyncio
+async def test_course_rankings_redis_sorted_sets(client: AsyncClient, db_session, fake_redis):
+    from src import rankings
+    from src.main import ranking_refresher
+
+    rankings.reset()
+    cat_a, (c1, c2, c3) = await _seed_ranking_data(db_session)
+    await rankings.refresh(db_session)
+
+    assert await fake_redis.zrevrange("rank:popular:all", 0, -1) == [str(c1), str(c3)]
+    assert await fake_redis.zrevrange(f"rank:top-rated:cat:{cat_a}", 0, -1) == [str(c2), str(c1)]
+
+    # 다른 워커가 이미 이번 주기의 락을 잡았으면 재계산하지 않음
+    await fake_redis.set(rankings.LOCK_KEY, "1")
+    assert await ranking_refresher.run_once() is False
+
+    page2 = (await client.get("/api/v1/courses/filter/popular?page=2&size=1")).json()
+    assert [c["id"] for c in page2] == [c3]
+    rankings.reset()
+
+
+@pytest.mark.asyncio
+async def test_course_rankings_accept_decimal_sums(client: AsyncClient, db_session, monkeypatch):
+    from decimal import Decimal
+    import fakeredis
+    from src import cache, rankings
+
+    rankings.reset()
+    cat_a, (c1, c2, c3) = await _seed_ranking_data(db_session)
+    original = rankings._top_rated
+
+    async def mysql_like_top_rated(db):
+        # aiomysql: SUM(rating) -> Decimal
+        class MySQLSession:
+            async def execute(self, stmt):
+                return [(cid, n, Decimal(total)) for cid, n, total in await db.execute(stmt)]
+        return await original(MySQLSession())
+
+    monkeypatch.setattr(rankings, "_top_rated", mysql_like_top_rated)
+
+    # Redis 없음: 로컬 스냅샷 -> orjson 응답
+    top_rated = await client.get("/api/v1/courses/filter/top-rated")
+    assert top_rated.status_code == 200
+    assert [c["id"] for c in top_rated.json()] == [c3, c2, c1]
+    assert all(isinstance(c["score"], float) for c in top_rated.json())
+
+    # publish()에 Decimal 점수가 들어와도 Redis 교체가 끝까지 됨 (built_at 기록)
+    client_redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(cache, "redis_client", client_redis)
+    await rankings.publish({rankings.ranking_key("top-rated"): {c3: Decimal("4.5"), c2: Decimal("4")}})
+    assert await client_redis.exists(rankings.BUILT_AT_KEY)
+    assert await rankings.top("top-rated") == [(c3, 4.5), (c2, 4.0)]
+    await client_redis.aclose()
+    rankings.reset()
+
+
+# --- 18. Co-enrollment Recommendations ---
+
+def test_top_k_neighbors_cosine():
+    pytest.importorskip("scipy")
+    from src.recommendations import top_k_neighbors
+
+    # 학생 1~3은 101+102, 학생 1은 103도 수강, 중복 쌍(1, 101)은 한 번으로 계산
+    pairs = [(1, 101), (1, 101), (1, 102), (1, 103), (2, 101), (2, 102), (3, 101), (3, 102), (4, 103)]
+    users, courses = zip(*pairs)
+    neighbors = top_k_neighbors(users, courses, k=5, min_support=1)
+    assert [cid for cid, _ in neighbors[101]] == [102, 103]
+    assert neighbors[101][0][1] == pytest.approx(1.0)
+    assert neighbors[103] == [(101, pytest.approx(1 / 6 ** 0.5)), (102, pytest.approx(1 / 6 ** 0.5))]
+
+    # min_support=2 이면 한 명만 함께 들은 103 관계는 제외
+    assert 103 not in top_k_neighbors(users, courses, k=5, min_support=2)
+    assert top_k_neighbors([], [], k=5) == {}
+
+
+@pytest.mark.asyncio
+async def test_course_recommendations_endpoint(client: AsyncClient, db_session):
+    pytest.importorskip("scipy")
+    from src import models, rankings, recommendations
+
+    rankings.reset()
+    cat = models.Category(name="Rec")
+    teacher = models.User(email="rec_teacher@test.com", hashed_password="x")
+    students = [models.User(email=f"rec_s{i}@test.com", hashed_password="x") for i in range(3)]
+    db_session.add_all([cat, teacher, *students])
+    await db_session.flush()
+    c1, c2, new = (models.Course(title=t, instructor_id=teacher.id, category_id=cat.id) for t in ("R1", "R2", "R-new"))
+    db_session.add_all([c1, c2, new])
+    await db_session.flush()
+    for s in students:
+        db_session.add_all([
+            models.Enrollment(user_id=s.id, course_id=c1.id),
+            models.Enrollment(user_id=s.id, course_id=c2.id),
+        ])
+    await db_session.commit()
+
+    assert await recommendations.build(db_session, k=10, min_support=2) == 2
+
+    res = (await client.get(f"/api/v1/courses/{c1.id}/recommendations")).json()
+    assert res["source"] == "co-enrollment"
+    assert [c["id"] for c in res["items"]] == [c2.id]
+
+    # 수강 데이터가 없는 신규 강의는 같은 카테고리 인기순으로 대체
+    cold = (await client.get(f"/api/v1/courses/{new.id}/recommendations?limit=2")).json()
+    assert cold["source"] == "category"
+    assert {c["id"] for c in cold["items"]} == {c1.id, c2.id}
+
+    assert (await client.get("/api/v1/courses/99999/recommendations")).status_code == 404
+    rankings.reset()
+
+
+# --- 19. Idempotency-Key ---
+
+async def _login_headers(client: AsyncClient, email: str) -> dict:
+    await client.post("/api/v1/auth/signup", json={"email": email, "password": "password123"})
+    token = (await client.post("/api/v1/auth/login", data={"username": email, "password": "password123"})).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_replays_first_response(client: AsyncClient):
+    headers = await _login_headers(client, "idem_user@test.com")
+    cid = (await client.post("/api/v1/courses", json={"title": "Idem Course"}, headers=headers)).json()["id"]
+
+    retry = {**headers, "Idempotency-Key": "enroll-1"}
+    first = await client.post(f"/api/v1/courses/{cid}/enroll", headers=retry)
+    second = await client.post(f"/api/v1/courses/{cid}/enroll", headers=retry)
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+
+    # 키 없이 재요청하면 기존처럼 409
+    assert (await client.post(f"/api/v1/courses/{cid}/enroll", headers=headers)).status_code == 409
+
+    # 같은 키 + 다른 본문 -> 422
+    course_key = {**headers, "Idempotency-Key": "course-1"}
+    assert (await client.post("/api/v1/courses", json={"title": "Course A"}, headers=course_key)).status_code == 201
+    reused = await client.post("/api/v1/courses", json={"title": "Course B"}, headers=course_key)
+    assert reused.status_code == 422
+    assert reused.json()["code"] == "IDEMPOTENCY_KEY_REUSED"
+
+    # 다른 사용자는 같은 키를 써도 별개의 요청
+    other = await _login_headers(client, "idem_other@test.com")
+    res = await client.post("/api/v1/courses", json={"title": "Course A"}, headers={**other, "Idempotency-Key": "course-1"})
+    assert res.status_code == 201 and "idempotent-replayed" not in res.headers
+
+
+@pytest.mark.asyncio
+async def test_idempotency_concurrent_retries_run_handler_once(client: AsyncClient, db_session, fake_redis):
+    import asyncio
+    from sqlalchemy import func, select
+    from src import models
+
+    headers = {**(await _login_headers(client, "idem_race@test.com")), "Idempotency-Key": "race-1"}
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/courses", json={"title": "Race Course"}, headers=headers) for _ in range(3)
+    ))
+    assert {r.status_code for r in responses} == {201}
+    assert len({r.json()["id"] for r in responses}) == 1
+    assert sum(r.headers.get("idempotent-replayed") == "true" for r in responses) == 2
+    count = (await db_session.execute(select(func.count(models.Course.id)).where(models.Course.title == "Race Course"))).scalar()
+    assert count == 1
+
+
+# --- 20. Outbox Jobs ---
+
+@pytest.mark.asyncio
+async def test_outbox_event_written_with_course_and_processed(client: AsyncClient, db_session, session_factory, fake_redis):
+    from datetime import datetime
+    from sqlalchemy import select
+    from src import models, outbox, outbox_handlers
+
+    headers = await _login_headers(client, "outbox_user@test.com")
+    cid = (await client.post("/api/v1/courses", json={"title": "Outbox Course"}, headers=headers)).json()["id"]
+
+    events = (await db_session.execute(select(models.OutboxEvent))).scalars().all()
+    assert [(e.topic, e.payload, e.status) for e in events] == [("course.created", {"course_id": cid}, "PENDING")]
+
+    worker = outbox.OutboxWorker(backend=outbox.DatabaseBackend(session_factory))
+    assert await worker.run_once() == 1
+    db_session.expire_all()
+    assert (await db_session.execute(select(models.OutboxEvent))).scalars().all() == []
+    counters = await fake_redis.hgetall(outbox_handlers.EVENT_COUNTER_KEY.format(datetime.utcnow().date().isoformat()))
+    assert counters == {"course.created": "1"}
+
+
+@pytest.mark.asyncio
+async def test_outbox_retry_backoff_and_dead_letter(monkeypatch):
+    from src import outbox
+
+    calls = []
+
+    async def flaky(payload):
+        calls.append(payload)
+        raise RuntimeError("downstream unavailable")
+
+    monkeypatch.setitem(outbox._handlers, "test.flaky", [flaky])
+    monkeypatch.setattr(outbox, "backoff_seconds", lambda attempts: 0)
+    backend = outbox.MemoryBackend()
+    backend.enqueue(None, "test.flaky", {"n": 1})
+    backend.enqueue(None, "test.unknown", {"n": 2})
+    worker = outbox.OutboxWorker(backend=backend, max_attempts=2)
+
+    assert await worker.run_once() == 2   # flaky: 1차 실패 -> 재시도 대기, unknown: 핸들러 없음 -> 바로 DEAD
+    assert await worker.run_once() == 1   # flaky: 2차 실패 -> DEAD
+    assert await worker.run_once() == 0
+    assert len(calls) == 2
+    assert sorted(job.topic for job in backend.dead()) == ["test.flaky", "test.unknown"]
+
+    # 장애 복구 후 dead-letter 재처리
+    async def ok(payload):
+        pass
+
+    monkeypatch.setitem(outbox._handlers, "test.flaky", [ok])
+    assert await backend.requeue_dead([job.id for job in backend.dead() if job.topic == "test.flaky"]) == 1
+    assert await worker.run_once() == 1
+    assert [job.topic for job in backend.dead()] == ["test.unknown"]
+    assert len(backend.entries) == 1
+
+
+# --- 21. Single-flight / Stale-While-Revalidate ---
+@pytest.mark.asyncio
+async def test_singleflight_collapses_concurrent_loads():
+    import asyncio
+    from src.singleflight import SWRCache
+
+    swr = SWRCache("test-sf", ttl=60, stale_ttl=120)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return b'{"v": 1}'
+
+    results = await asyncio.gather(*(swr.get_or_load("k", loader) for _ in range(20)))
+    assert results == [b'{"v": 1}'] * 20
+    assert len(calls) == 1
+
+    # 예외는 캐싱되지 않음
+    async def failing():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await swr.get_or_load("missing", failing)
+    assert await swr.get_or_load("missing", loader) == b'{"v": 1}'
+
+
+@pytest.mark.asyncio
+async def test_swr_serves_stale_while_revalidating():
+    import asyncio
+    from src.singleflight import SWRCache
+
+    swr = SWRCache("test-swr", ttl=0, stale_ttl=60)
+    version = {"n": 1}
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        return str(version["n"]).encode()
+
+    assert await swr.get_or_load("k", loader) == b"1"
+    version["n"] = 2
+    # ttl이 지난 값: 이전 값을 즉시 반환하고 백그라운드에서 갱신
+    assert await swr.get_or_load("k", loader) == b"1"
+    await asyncio.gather(*swr._background)
+    assert await swr.get_or_load("k", loader) == b"2"
+
+    # 무효화 후에는 새로 조회
+    version["n"] = 3
+    await swr.invalidate()
+    assert await swr.get_or_load("k", loader) == b"3"
+
+
+@pytest.mark.asyncio
+async def test_swr_shares_value_across_workers(fake_redis):
+    import asyncio
+    from src.singleflight import SWRCache
+
+    # 같은 네임스페이스의 캐시 두 개 = 워커 두 개
+    worker_a = SWRCache("test-shared", ttl=60, stale_ttl=120, lock_timeout=2)
+    worker_b = SWRCache("test-shared", ttl=60, stale_ttl=120, lock_timeout=2)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return b"shared"
+
+    results = await asyncio.gather(worker_a.get_or_load("k", loader), worker_b.get_or_load("k", loader))
+    assert results == [b"shared", b"shared"]
+    assert len(calls) == 1   # 락을 못 잡은 워커는 Redis에 채워진 값을 사용
+    assert await fake_redis.sismember("swr:keys:test-shared", "k")
+
+    await worker_a.invalidate()
+    assert await fake_redis.get("swr:test-shared:k") is None
+
+
+@pytest.mark.asyncio
+async def test_swr_load_started_before_invalidation_is_not_cached(fake_redis):
+    import asyncio
+    from src.singleflight import SWRCache
+
+    worker_a = SWRCache("test-race", ttl=60, stale_ttl=120, lock_timeout=2)
+    worker_b = SWRCache("test-race", ttl=60, stale_ttl=120, lock_timeout=2)
+    version = {"n": 1}
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_loader():
+        value = str(version["n"]).encode()   # 쓰기 이전 값을 읽은 상태
+        started.set()
+        await release.wait()
+        return value
+
+    # 워커 B의 로드 도중 워커 A가 쓰고 무효화 (B는 버스 알림으로 clear_local)
+    loading = asyncio.create_task(worker_b.get_or_load("k", slow_loader))
+    await started.wait()
+    version["n"] = 2
+    await worker_a.invalidate()
+    worker_b.clear_local()
+    release.set()
+    assert await loading == b"1"   # 진행 중이던 요청에는 이전 값 응답
+
+    # 이전 값은 로컬 / Redis 어디에도 남지 않음
+    assert worker_b._local.get("k") is None
+    assert await fake_redis.get("swr:test-race:k") is None
+
+    async def loader():
+        return str(version["n"]).encode()
+
+    assert await worker_b.get_or_load("k", loader) == b"2"
+    assert await worker_a.get_or_load("k", loader) == b"2"
+
+
+@pytest.mark.asyncio
+async def test_course_catalog_cache_invalidated_on_write(client: AsyncClient):
+    headers = await _login_headers(client, "swr@test.com")
+    created = await client.post("/api/v1/courses", json={"title": "Cached Course", "price": 0}, headers=headers)
+    course_id = created.json()["id"]
+
+    listing = await client.get("/api/v1/courses")
+    assert listing.json()["total_elements"] == 1
+    detail = await client.get(f"/api/v1/courses/{course_id}")
+    assert detail.json()["title"] == "Cached Course"
+    assert detail.json()["instructor"]["email"] == "swr@test.com"
+
+    await client.put(f"/api/v1/courses/{course_id}", json={"title": "Renamed Course"}, headers=headers)
+    assert (await client.get(f"/api/v1/courses/{course_id}")).json()["title"] == "Renamed Course"
+    assert (await client.get("/api/v1/courses")).json()["content"][0]["title"] == "Renamed Course"
+
+    # 없는 강의의 404는 캐싱되지 않음
+    assert (await client.get("/api/v1/courses/999999")).status_code == 404
+
+
+# --- 22. Write Path Statement Budget ---
+def _write_path(statements: list) -> list:
+    """첫 INSERT/UPDATE부터 응답까지 실행된 statement (인증 / 존재 확인 조회 제외)"""
+    for i, statement in enumerate(statements):
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE")):
+            return [s.lstrip().split()[0].upper() for s in statements[i:]]
+    return []
+
+
+@pytest.mark.asyncio
+async def test_write_endpoints_use_at_most_two_statements(client: AsyncClient, sql_statements: list):
+    headers = await _login_headers(client, "writes@test.com")
+
+    sql_statements.clear()
+    created = await client.post("/api/v1/courses", json={"title": "Write Path Course"}, headers=headers)
+    assert created.status_code == 201
+    body = created.json()
+    assert body["created_at"] and body["updated_at"]
+    assert body["instructor"]["email"] == "writes@test.com"
+    assert body["category"] is None
+    assert _write_path(sql_statements) == ["INSERT", "INSERT"]   # courses RETURNING + outbox
+    course_id = body["id"]
+
+    sql_statements.clear()
+    updated = await client.put(f"/api/v1/courses/{course_id}", json={"price": 1000}, headers=headers)
+    assert updated.status_code == 200
+    assert updated.json()["price"] == 1000
+    assert updated.json()["instructor"]["email"] == "writes@test.com"
+    assert sorted(_write_path(sql_statements)) == ["INSERT", "UPDATE"]
+    assert any(s.startswith("UPDATE courses") and "RETURNING" in s for s in sql_statements)
+
+    sql_statements.clear()
+    enrolled = await client.post(f"/api/v1/courses/{course_id}/enroll", headers=headers)
+    assert enrolled.status_code == 201
+    assert enrolled.json()["enrolled_at"]
+    assert _write_path(sql_statements) == ["INSERT", "INSERT"]
+    # 인증 1 + 강의/중복 확인 1
+    assert len(sql_statements) == 4
+
+    sql_statements.clear()
+    review = await client.post(
+        f"/api/v1/courses/{course_id}/reviews", json={"rating": 5, "comment": "great course"}, headers=headers
+    )
+    assert review.status_code == 201
+    assert review.json()["user"]["email"] == "writes@test.com"
+    assert review.json()["created_at"]
+    assert _write_path(sql_statements) == ["INSERT", "INSERT"]
+    assert len(sql_statements) == 4
+
+    sql_statements.clear()
+    edited = await client.put(
+        f"/api/v1/reviews/{review.json()['id']}", json={"rating": 4, "comment": "pretty good"}, headers=headers
+    )
+    assert edited.status_code == 200
+    assert edited.json()["rating"] == 4 and edited.json()["user"]["email"] == "writes@test.com"
+    assert sorted(_write_path(sql_statements)) == ["INSERT", "UPDATE"]
+
+    # 기존 검증은 그대로
+    assert (await client.post(f"/api/v1/courses/{course_id}/enroll", headers=headers)).status_code == 409
+    assert (await client.post("/api/v1/courses/999999/enroll", headers=headers)).status_code == 404
+
+
+# --- 23. Category Registry ---
+@pytest.mark.asyncio
+async def test_categories_served_from_registry(client: AsyncClient, db_session, sql_statements: list):
+    from src import models
+
+    await client.post("/api/v1/auth/signup", json={"email": "reg_admin@test.com", "password": "password123", "role": "ADMIN"})
+    headers = await _login_headers(client, "reg_admin@test.com")
+    cat_id = (await client.post("/api/v1/categories", json={"name": "Registry"}, headers=headers)).json()["id"]
+    await client.post("/api/v1/courses", json={"title": "Registry Course", "category_id": cat_id}, headers=headers)
+
+    assert (await client.get("/api/v1/categories")).json() == [{"id": cat_id, "name": "Registry"}]
+    sql_statements.clear()
+    assert (await client.get("/api/v1/categories")).json() == [{"id": cat_id, "name": "Registry"}]
+    recent = (await client.get("/api/v1/courses/filter/recent")).json()
+    assert recent[0]["category"] == {"id": cat_id, "name": "Registry"}
+    # 목록은 스냅샷에서, 강의 조회는 categories JOIN 없이
+    assert not any("categories" in s for s in sql_statements)
+
+    # API를 거치지 않고 추가된 카테고리도 처음 보는 id면 재로딩해서 채움
+    direct = models.Category(name="Direct")
+    db_session.add(direct)
+    await db_session.flush()
+    db_session.add(models.Course(title="Direct Course", instructor_id=recent[0]["instructor_id"], category_id=direct.id))
+    await db_session.commit()
+    recent = (await client.get("/api/v1/courses/filter/recent")).json()
+    assert recent[0]["category"] == {"id": direct.id, "name": "Direct"}
+
+
+@pytest.mark.asyncio
+async def test_category_registry_follows_other_workers(db_session):
+    from src import category_registry, invalidation, models
+
+    category_registry.reset()
+    db_session.add(models.Category(name="Existing"))
+    await db_session.commit()
+    await category_registry.ensure(db_session)
+    assert [c["name"] for c in category_registry.list_all()] == ["Existing"]
+
+    # 다른 워커가 카테고리를 추가하고 알림을 보냄 -> 스냅샷을 stale로 표시, 다음 조회에서 재로딩
+    db_session.add(models.Category(name="From Worker B"))
+    await db_session.commit()
+    await invalidation._dispatch(invalidation.Event("category", None, local=False))
+    await category_registry.ensure(db_session)
+    assert [c["name"] for c in category_registry.list_all()] == ["Existing", "From Worker B"]
+    category_registry.reset()
+
+
+@pytest.mark.asyncio
+async def test_category_registry_reloads_from_primary(db_session, session_factory):
+    from src import category_registry, invalidation, models
+
+    category_registry.reset()
+    await category_registry.warm(session_factory)   # lifespan: primary 세션 팩토리
+    db_session.add(models.Category(name="New On Primary"))
+    await db_session.commit()
+    await invalidation._dispatch(invalidation.Event("category", None, local=False))
+
+    class LaggingReplica:
+        async def execute(self, *args, **kwargs):
+            raise AssertionError("registry must not reload from the request's replica session")
+
+    await category_registry.ensure(LaggingReplica())
+    assert [c["name"] for c in category_registry.list_all()] == ["New On Primary"]
+    category_registry.reset()
+
+
+# --- 24. Cross-worker Invalidation Bus ---
+@pytest.mark.asyncio
+async def test_invalidation_bus_delivers_to_other_workers(fake_redis, monkeypatch):
+    import asyncio
+    import json
+    from src import invalidation
+
+    invalidation.reset()
+    events = []
+
+    async def record(event):
+        events.append((event.entity, event.id, event.local))
+
+    monkeypatch.setitem(invalidation._listeners, "lecture", [record])
+    bus = invalidation.InvalidationBus()
+    bus.start()
+    try:
+        for _ in range(200):
+            if bus.subscribed:
+                break
+            await asyncio.sleep(0.01)
+        assert bus.subscribed
+
+        # 이 워커의 쓰기: 리스너는 바로 실행 (local), 구독으로 돌아온 자기 메시지는 무시
+        await invalidation.publish("lecture", 1)
+        # 다른 워커의 쓰기
+        await fake_redis.hincrby(invalidation.VERSIONS_KEY, "lecture", 1)
+        await fake_redis.publish(invalidation.CHANNEL, json.dumps({"entity": "lecture", "id": 2, "version": 2, "origin": "worker-b"}))
+        # 버전 3을 놓치고 4를 받음 -> 전체 무효화
+        await fake_redis.hincrby(invalidation.VERSIONS_KEY, "lecture", 2)
+        await fake_redis.publish(invalidation.CHANNEL, json.dumps({"entity": "lecture", "id": 4, "version": 4, "origin": "worker-b"}))
+        for _ in range(200):
+            if len(events) >= 3:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        assert events == [("lecture", 1, True), ("lecture", 2, False), ("lecture", None, False)]
+    finally:
+        await bus.stop()
+        invalidation.reset()
+
+
+@pytest.mark.asyncio
+async def test_invalidation_version_stamp_fallback(fake_redis, monkeypatch):
+    from src import invalidation
+
+    invalidation.reset()
+    events = []
+
+    async def record(event):
+        events.append((event.entity, event.id))
+
+    monkeypatch.setitem(invalidation._listeners, "user", [record])
+    await invalidation.check_versions()            # 기준값 기록 (아직 버전 없음)
+    await invalidation.publish("user", 7)
+    assert events == [("user", 7)]
+
+    # 구독이 끊긴 사이 다른 워커가 2번 변경 (메시지 유실) -> 주기적 확인에서 전체 무효화
+    await fake_redis.hincrby(invalidation.VERSIONS_KEY, "user", 2)
+    await invalidation.check_versions()
+    assert events == [("user", 7), ("user", None)]
+    await invalidation.check_versions()
+    assert len(events) == 2
+    invalidation.reset()
+
+
+@pytest.mark.asyncio
+async def test_remote_course_change_evicts_local_catalog(client: AsyncClient):
+    from src import invalidation
+    from src.routers.courses import catalog_cache
+
+    headers = await _login_headers(client, "bus@test.com")
+    await client.post("/api/v1/courses", json={"title": "Bus Course"}, headers=headers)
+    assert (await client.get("/api/v1/courses")).json()["total_elements"] == 1
+    assert catalog_cache._local.get("list:1:20:") is not None
+
+    await invalidation._dispatch(invalidation.Event("course", 1, local=False))
+    assert catalog_cache._local.get("list:1:20:") is None
+
+
+# --- 25. Request Analytics Rollups ---
+@pytest.mark.asyncio
+async def test_daily_stats_from_analytics_rollups(client: AsyncClient):
+    from datetime import datetime
+    from src import analytics
+
+    analytics.buffer.drain()   # 이전 테스트의 이벤트 제거
+    await client.post("/api/v1/auth/signup", json={"email": "an_admin@test.com", "password": "password123", "role": "ADMIN"})
+    admin = await _login_headers(client, "an_admin@test.com")
+    student = await _login_headers(client, "an_student@test.com")
+    course_id = (await client.post("/api/v1/courses", json={"title": "Analytics 101"}, headers=admin)).json()["id"]
+    assert (await client.post(f"/api/v1/courses/{course_id}/enroll", headers=student)).status_code == 201
+    assert (await client.post(f"/api/v1/courses/{course_id}/enroll", headers=student)).status_code == 409
+    assert (await client.get("/api/v1/no-such-route")).status_code == 404   # 매칭 라우트 없음 -> 기록 안 함
+
+    daily = (await client.get("/api/v1/admin/stats/daily?days=3", headers=admin)).json()
+    today = datetime.utcnow().date().isoformat()
+    assert len(daily) == 4 and daily["today"] == daily[today]
+    # 가입 요청 3(관리자 중복 1회는 409) / 로그인 2 / 강의 생성 1 / 수강 신청 2(1 성공) = 방문 8
+    assert daily[today]["signups"] == 2
+    assert daily[today]["enrollments"] == 1
+    assert daily[today]["visits"] == 8
+
+    hourly = (await client.get(f"/api/v1/admin/stats/hourly?date={today}", headers=admin)).json()
+    assert sum(h["enrollments"] for h in hourly["hours"].values()) == 1
+    assert len(hourly["hours"]) == 24
+
+
+@pytest.mark.asyncio
+async def test_analytics_ring_buffer_rollup_and_compact(db_session, session_factory):
+    from datetime import datetime, timedelta
+    from sqlalchemy import func, select
+    from src import analytics, models
+
+    ring = analytics.RingBuffer(maxlen=2)
+    for i in range(3):
+        ring.append(analytics.RequestEvent(float(i), "GET", "/r", 200, 1.0, None))
+    assert ring.dropped == 1 and [e.timestamp for e in ring.drain()] == [1.0, 2.0]
+
+    base = datetime(2026, 1, 1, 10).timestamp() - datetime(1970, 1, 1).timestamp()   # UTC 10:00
+    events = [
+        analytics.RequestEvent(base + 60, "GET", "/api/v1/courses", 200, 10.0, 1),
+        analytics.RequestEvent(base + 120, "GET", "/api/v1/courses", 200, 30.0, None),
+        analytics.RequestEvent(base + 3600, "GET", "/api/v1/courses", 200, 5.0, None),   # 11시 버킷
+    ]
+    rows = analytics.rollup(events)
+    assert len(rows) == 2
+    first = next(r for r in rows if r["bucket_start"].hour == 10)
+    assert (first["count"], first["authenticated"], first["latency_sum_ms"], first["latency_max_ms"]) == (2, 1, 40.0, 30.0)
+
+    analytics.buffer.drain()
+    for event in events + events:   # 두 번 flush된 것과 같은 상황 (append-only)
+        analytics.buffer.append(event)
+    assert await analytics.flush(session_factory) == 6
+    count_rows = select(func.count(models.AnalyticsRollup.id))
+    assert (await db_session.execute(count_rows)).scalar() == 2
+    for event in events:
+        analytics.buffer.append(event)
+    await analytics.flush(session_factory)
+    assert (await db_session.execute(count_rows)).scalar() == 4
+
+    # 방금 닫힌 1시간(10시)만 합치고 11시 버킷은 건드리지 않음
+    assert await analytics.compact(db_session, datetime(2026, 1, 1, 10), datetime(2026, 1, 1, 11)) == 1
+    assert (await db_session.execute(count_rows)).scalar() == 3
+    assert await analytics.compact(db_session, datetime(2026, 1, 1, 10), datetime(2026, 1, 1, 11)) == 0
+    hourly = await analytics.hourly(db_session, datetime(2026, 1, 1).date())
+    assert hourly["10:00"]["visits"] == 6 and hourly["11:00"]["visits"] == 3
+
+    # 지난 버킷에 늦게 flush된 행은 버킷 단위로 기록 -> 정시 compact 때 그 버킷만 다시 합침
+    await analytics._pop_late()
+    analytics.buffer.append(events[0])
+    await analytics.flush(session_factory)
+    assert await analytics._pop_late() == [datetime(2026, 1, 1, 10)]
+    analytics.buffer.append(events[0])
+    await analytics.flush(session_factory)
+    flusher = analytics.AnalyticsFlusher(session_factory)
+    await flusher._compact_closed_hours()
+    assert (await db_session.execute(count_rows)).scalar() == 3   # 10시 1행 + 늦은 행이 없는 11시는 그대로 2행
+    hourly = await analytics.hourly(db_session, datetime(2026, 1, 1).date())
+    assert hourly["10:00"]["visits"] == 8 and hourly["11:00"]["visits"] == 3
+
+
+# --- 26. Structured Logging ---
+@pytest.mark.asyncio
+async def test_request_id_propagation_and_access_log_sampling(client: AsyncClient, caplog, monkeypatch):
+    import logging
+    from src.config import settings
+
+    caplog.set_level(logging.INFO, logger="access")
+    response = await client.get("/api/v1/courses", headers={"X-Request-ID": "req-abc.123"})
+    assert response.headers["x-request-id"] == "req-abc.123"
+    # 형식이 이상한 값은 이어받지 않고 새로 발급
+    generated = (await client.get("/api/v1/courses", headers={"X-Request-ID": "bad id\n"})).headers["x-request-id"]
+    assert len(generated) == 32 and generated != "bad id\n"
+
+    monkeypatch.setattr(settings, "LOG_SUCCESS_SAMPLE_RATE", 0.0)
+    caplog.clear()
+    await client.get("/api/v1/courses", headers={"X-Request-ID": "sampled-out"})
+    assert (await client.get("/api/v1/courses/999999", headers={"X-Request-ID": "missing"})).status_code == 404
+    records = [r for r in caplog.records if r.name == "access"]
+    # 성공 요청은 샘플링에서 빠지고, 404는 항상 기록
+    assert [r.request_id for r in records] == ["missing"]
+    assert records[0].status == 404 and records[0].route == "/api/v1/courses/{course_id}"
+    assert records[0].duration_ms >= 0
+
+
+def test_json_formatter_fields_and_exception():
+    import json
+    import logging
+    from src import logging_setup
+
+    token = logging_setup.request_id_var.set("rid-1")
+    try:
+        record = logging.LogRecord("access", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+        logging_setup.RequestIdFilter().filter(record)
+    finally:
+        logging_setup.request_id_var.reset(token)
+    record.status = 200
+    record.duration_ms = 1.5
+    line = json.loads(logging_setup.JsonFormatter().format(record))
+    assert line["msg"] == "hello world" and line["request_id"] == "rid-1"
+    assert (line["level"], line["logger"], line["status"], line["duration_ms"]) == ("INFO", "access", 200, 1.5)
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        import sys
+        error = logging.LogRecord("src.main", logging.ERROR, __file__, 1, "failed", None, sys.exc_info())
+    line = json.loads(logging_setup.JsonFormatter().format(error))
+    assert "request_id" not in line and "ValueError: boom" in line["exc"]
+
+
+# --- 27. Soft Delete / Archive / Set-based Course Delete ---
+@pytest.mark.asyncio
+async def test_soft_deleted_enrollments_and_reviews_are_hidden(client: AsyncClient, db_session, sql_statements: list):
+    from sqlalchemy import select
+    from src import models
+
+    admin = await _login_headers(client, "sd_owner@test.com")
+    student = await _login_headers(client, "sd_student@test.com")
+    course_id = (await client.post("/api/v1/courses", json={"title": "Soft Delete 101"}, headers=admin)).json()["id"]
+    assert (await client.post(f"/api/v1/courses/{course_id}/enroll", headers=student)).status_code == 201
+    review = await client.post(
+        f"/api/v1/courses/{course_id}/reviews", json={"rating": 5, "comment": "keep me around"}, headers=student
+    )
+    review_id = review.json()["id"]
+
+    assert (await client.delete(f"/api/v1/reviews/{review_id}", headers=student)).status_code == 204
+    assert (await client.get(f"/api/v1/courses/{course_id}/reviews")).json() == []
+    assert (await client.delete(f"/api/v1/reviews/{review_id}", headers=student)).status_code == 404
+
+    sql_statements.clear()
+    assert (await client.delete(f"/api/v1/enrollments/{course_id}", headers=student)).status_code == 204
+    assert _write_path(sql_statements) == ["UPDATE", "INSERT"]   # 조회 없이 UPDATE + 아웃박스
+    assert (await client.get("/api/v1/enrollments/me", headers=student)).json() == []
+    assert (await client.delete(f"/api/v1/enrollments/{course_id}", headers=student)).status_code == 404
+    # 취소한 수강은 중복 확인(JOIN)에서도 제외 -> 다시 신청 가능
+    assert (await client.post(f"/api/v1/courses/{course_id}/enroll", headers=student)).status_code == 201
+
+    # 행은 남아 있음 (include_deleted로만 보임)
+    hidden = select(models.Review).where(models.Review.id == review_id)
+    assert (await db_session.execute(hidden)).scalar_one_or_none() is None
+    kept = (await db_session.execute(hidden.execution_options(include_deleted=True))).scalar_one()
+    assert kept.deleted_at is not None
+    enrollments = (await db_session.execute(
+        select(models.Enrollment.status).where(models.Enrollment.course_id == course_id)
+        .order_by(models.Enrollment.id).execution_options(include_deleted=True)
+    )).scalars().all()
+    assert enrollments == ["CANCELED", "ACTIVE"]
+
+
+@pytest.mark.asyncio
+async def test_archiver_and_set_based_course_delete(client: AsyncClient, db_session, session_factory, sql_statements: list):
+    from datetime import datetime, timedelta
+    from sqlalchemy import func, select
+    from src import archive, models
+
+    owner = await _login_headers(client, "arc_owner@test.com")
+    students = [await _login_headers(client, f"arc_student{i}@test.com") for i in range(3)]
+    course_id = (await client.post("/api/v1/courses", json={"title": "Archive 101"}, headers=owner)).json()["id"]
+    for headers in students:
+        await client.post(f"/api/v1/courses/{course_id}/enroll", headers=headers)
+    for headers in students[:2]:
+        await client.delete(f"/api/v1/enrollments/{course_id}", headers=headers)
+
+    # 보관 기간이 안 지난 행은 그대로, 지난 행은 청크(1건)씩 이동
+    assert await archive.archive_deleted(session_factory) == {"enrollments": 0, "reviews": 0}
+    moved = await archive.archive_deleted(session_factory, before=datetime.utcnow() + timedelta(days=1), batch_size=1)
+    assert moved == {"enrollments": 2, "reviews": 0}
+    count = lambda model: select(func.count(model.id)).execution_options(include_deleted=True)
+    assert (await db_session.execute(count(models.EnrollmentArchive))).scalar() == 2
+    assert (await db_session.execute(count(models.Enrollment))).scalar() == 1
+
+    # 강의 삭제: 차시 / 수강 / 수강평을 읽지 않고 테이블마다 statement 하나
+    for i in range(5):
+        await client.post(
+            f"/api/v1/courses/{course_id}/lectures",
+            json={"title": f"Lecture {i}", "video_url": "https://v.test/x"}, headers=owner,
+        )
+    await client.post(f"/api/v1/courses/{course_id}/reviews", json={"rating": 4, "comment": "archived too"}, headers=students[2])
+    sql_statements.clear()
+    assert (await client.delete(f"/api/v1/courses/{course_id}", headers=owner)).status_code == 204
+    assert not any(s.lstrip().startswith("SELECT") and "FROM lectures" in s for s in sql_statements)
+    writes = [s for s in sql_statements if s.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))]
+    assert len(writes) == 7   # lectures 1 + (보관 INSERT + DELETE) x 2 + courses 1 + 아웃박스 1
+    assert (await db_session.execute(count(models.Lecture))).scalar() == 0
+    assert (await db_session.execute(count(models.Enrollment))).scalar() == 0
+    assert (await db_session.execute(count(models.EnrollmentArchive))).scalar() == 3
+    assert (await db_session.execute(
+        select(models.ReviewArchive.course_id, models.ReviewArchive.deleted_at)
+    )).one() == (course_id, None)
+    assert (await client.get(f"/api/v1/courses/{course_id}")).status_code == 404
+
+
+# --- 28. Account Deletion (two-phase, set-based) ---
+@pytest.mark.asyncio
+async def test_delete_me_marks_then_purges_in_chunks(client: AsyncClient, db_session, session_factory, sql_statements: list):
+    from sqlalchemy import select
+    from src import deletion, models
+
+    instructor = await _login_headers(client, "del_instructor@test.com")
+    course_ids = [
+        (await client.post("/api/v1/courses", json={"title": f"Deleted Instructor {i}"}, headers=instructor)).json()["id"]
+        for i in range(3)
+    ]
+    for course_id in course_ids:
+        await client.post(f"/api/v1/courses/{course_id}/enroll", headers=instructor)
+    await client.post(f"/api/v1/courses/{course_ids[0]}/reviews", json={"rating": 5, "comment": "my own course"}, headers=instructor)
+    await client.delete(f"/api/v1/enrollments/{course_ids[2]}", headers=instructor)   # 소프트 삭제 행도 정리 대상
+    user_id = (await client.get("/api/v1/users/me", headers=instructor)).json()["id"]
+
+    sql_statements.clear()
+    assert (await client.delete("/api/v1/users/me", headers=instructor)).status_code == 204
+    assert _write_path(sql_statements) == ["UPDATE", "INSERT"]   # users UPDATE + 아웃박스 (자식 행 로딩 없음)
+    # 로그인 / 인증에서 즉시 제외, 같은 이메일로 재가입 가능
+    assert (await client.get("/api/v1/users/me", headers=instructor)).status_code == 401
+    assert (await client.post("/api/v1/auth/signup", json={"email": "del_instructor@test.com", "password": "password123"})).status_code == 201
+
+    state = await deletion.deletion_status(db_session, user_id)
+    assert state["status"] == "PENDING"
+    assert state["remaining"] == {"courses": 3, "enrollments": 3, "reviews": 1}
+
+    # 아웃박스 작업(user.deleted)이 하는 일 - 청크 2건씩
+    assert await deletion.purge_user(session_factory, user_id, batch_size=2) == {"courses": 3, "enrollments": 3, "reviews": 1}
+    assert (await deletion.deletion_status(db_session, user_id))["status"] == "DELETED"
+    # 기존 ORM 삭제와 같이 강의 / 수강 / 수강평은 남고 참조만 NULL
+    courses = (await db_session.execute(
+        select(models.Course.instructor_id).where(models.Course.id.in_(course_ids))
+    )).scalars().all()
+    assert courses == [None, None, None]
+    enrollments = (await db_session.execute(
+        select(models.Enrollment.user_id).where(models.Enrollment.course_id.in_(course_ids))
+        .execution_options(include_deleted=True)
+    )).scalars().all()
+    assert enrollments == [None, None, None]
+    assert (await client.get(f"/api/v1/courses/{course_ids[0]}")).json()["instructor"] is None
+
+
+@pytest.mark.asyncio
+async def test_admin_user_deletion_background_by_default(client: AsyncClient, sql_statements: list):
+    await client.post("/api/v1/auth/signup", json={"email": "del_admin@test.com", "password": "password123", "role": "ADMIN"})
+    admin = await _login_headers(client, "del_admin@test.com")
+    targets = []
+    for i in range(2):
+        headers = await _login_headers(client, f"del_target{i}@test.com")
+        await client.post("/api/v1/courses", json={"title": f"Target Course {i}"}, headers=headers)
+        targets.append((await client.get("/api/v1/users/me", headers=headers)).json()["id"])
+
+    # 기본: delete_me와 같이 1단계 + 아웃박스만 하고 202, 상태 조회 URL로 진행 확인
+    sql_statements.clear()
+    response = await client.delete(f"/api/v1/users/{targets[0]}", headers=admin)
+    status_url = f"/api/v1/users/{targets[0]}/deletion"
+    assert response.status_code == 202
+    assert response.json() == {"user_id": targets[0], "status": "PENDING", "status_url": status_url}
+    assert response.headers["location"] == status_url
+    assert _write_path(sql_statements) == ["UPDATE", "INSERT"]   # users UPDATE + 아웃박스 (참조 정리 없음)
+    status_body = (await client.get(status_url, headers=admin)).json()
+    assert status_body["status"] == "PENDING" and status_body["remaining"]["courses"] == 1
+    assert (await client.delete(f"/api/v1/users/{targets[0]}", headers=admin)).status_code == 404
+
+    # purge=true: 요청 안에서 참조 정리까지
+    assert (await client.delete(f"/api/v1/users/{targets[1]}?purge=true", headers=admin)).status_code == 204
+    assert (await client.get(f"/api/v1/users/{targets[1]}/deletion", headers=admin)).json()["status"] == "DELETED"
+    admin_id = (await client.get("/api/v1/users/me", headers=admin)).json()["id"]
+    assert (await client.get(f"/api/v1/users/{admin_id}/deletion", headers=admin)).status_code == 404   # 삭제 중 아님
+
+
+# --- 29. Catalog Export / Import ---
+@pytest.mark.asyncio
+async def test_catalog_export_streams_ndjson_and_csv(client: AsyncClient):
+    import csv
+    import io
+    import json
+    from src import catalog_io
+
+    await client.post("/api/v1/auth/signup", json={"email": "cat_admin@test.com", "password": "password123", "role": "ADMIN"})
+    admin = await _login_headers(client, "cat_admin@test.com")
+    student = await _login_headers(client, "cat_student@test.com")
+    category_id = (await client.post("/api/v1/categories", json={"name": "Export Cat"}, headers=admin)).json()["id"]
+    course_id = (await client.post(
+        "/api/v1/courses", json={"title": "Export Course", "category_id": category_id}, headers=admin
+    )).json()["id"]
+    for i in (2, 1):
+        await client.post(
+            f"/api/v1/courses/{course_id}/lectures",
+            json={"title": f"Part {i}", "video_url": "https://v.test/p", "order_index": i}, headers=admin,
+        )
+    await client.post(f"/api/v1/courses/{course_id}/enroll", headers=student)
+    await client.post(f"/api/v1/courses/{course_id}/reviews", json={"rating": 4, "comment": "exported review"}, headers=student)
+
+    response = await client.get("/api/v1/admin/catalog/export?include=enrollments,reviews", headers=admin)
+    assert response.status_code == 200 and response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["type"] for r in records] == ["course", "lecture", "lecture", "enrollment", "review"]
+    assert records[0]["category"] == "Export Cat" and records[0]["instructor_email"] == "cat_admin@test.com"
+    assert [r["title"] for r in records[1:3]] == ["Part 1", "Part 2"]   # 강의 안 순서대로
+    assert records[3]["user_email"] == records[4]["user_email"] == "cat_student@test.com"
+
+    response = await client.get("/api/v1/admin/catalog/export?format=csv", headers=admin)
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert list(rows[0].keys()) == catalog_io.CATALOG_FIELDS
+    assert [r["type"] for r in rows] == ["course", "lecture", "lecture"]
+    assert rows[0]["is_public"] == "true" and rows[1]["video_url"] == "https://v.test/p"
+
+    assert (await client.get("/api/v1/admin/catalog/export?include=users", headers=admin)).status_code == 400
+    assert (await client.get("/api/v1/admin/catalog/export", headers=student)).status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_catalog_import_upserts_in_batches_with_validation(client: AsyncClient, db_session):
+    import json
+    from src import catalog_io
+
+    await client.post("/api/v1/auth/signup", json={"email": "imp_admin@test.com", "password": "password123", "role": "ADMIN"})
+    admin = await _login_headers(client, "imp_admin@test.com")
+    course_id = (await client.post("/api/v1/courses", json={"title": "Before Import"}, headers=admin)).json()["id"]
+    await client.post(
+        f"/api/v1/courses/{course_id}/lectures", json={"title": "Old Lecture", "video_url": "https://v.test/a"}, headers=admin
+    )
+    exported = [json.loads(line) for line in (await client.get("/api/v1/admin/catalog/export", headers=admin)).text.splitlines()]
+    exported[0]["title"] = "After Import"
+    lines = [json.dumps(r) for r in exported] + [
+        json.dumps({"type": "course", "id": 5000, "title": "Brand New", "category": "Imported Cat", "instructor_email": "imp_admin@test.com"}),
+        json.dumps({"type": "lecture", "id": 7000, "course_id": 5000, "title": "New Lecture", "video_url": "https://v.test/n"}),
+        json.dumps({"type": "lecture", "id": 7001, "course_id": 9999, "title": "Orphan", "video_url": "https://v.test/o"}),
+        json.dumps({"type": "review", "id": 7002, "course_id": 5000, "user_email": "imp_admin@test.com", "rating": 9, "comment": "bad"}),
+        json.dumps({"type": "enrollment", "id": 7003, "course_id": 5000, "user_email": "ghost@test.com"}),
+        "{not json",
+    ]
+    body = ("\n".join(lines) + "\n").encode("utf-8")
+    upload = lambda: {"file": ("catalog.ndjson", body, "application/x-ndjson")}
+
+    # dry_run: 검증 결과만, 저장 안 함 (새 강의 5000을 참조하는 차시도 통과)
+    dry = (await client.post("/api/v1/admin/catalog/import?dry_run=true", files=upload(), headers=admin)).json()
+    assert dry["dry_run"] is True and dry["lectures"] == {"inserted": 1, "updated": 1}
+    assert (await client.get("/api/v1/courses/5000")).status_code == 404
+
+    report = (await client.post("/api/v1/admin/catalog/import", files=upload(), headers=admin)).json()
+    assert report["processed"] == 8 and report["rejected"] == 4
+    assert report["courses"] == {"inserted": 1, "updated": 1}
+    assert report["lectures"] == {"inserted": 1, "updated": 1}
+    assert report["categories_created"] == 1
+    errors = {e["line"]: e["error"] for e in report["errors"]}
+    assert sorted(errors) == [5, 6, 7, 8]
+    assert errors[5] == "Unknown course 9999" and errors[6].startswith("review.rating")
+    assert errors[7] == "Unknown user 'ghost@test.com'"
+
+    assert (await client.get(f"/api/v1/courses/{course_id}")).json()["title"] == "After Import"
+    new_course = (await client.get("/api/v1/courses/5000")).json()
+    assert new_course["category"]["name"] == "Imported Cat"
+    assert new_course["instructor"]["email"] == "imp_admin@test.com"
+
+    # CSV 왕복: 내보낸 파일을 배치 2개씩 다시 가져오면 전부 갱신
+    import io
+    csv_text = (await client.get("/api/v1/admin/catalog/export?format=csv", headers=admin)).text
+    again = await catalog_io.import_file(db_session, io.StringIO(csv_text, newline=""), "csv", batch_size=2)
+    assert again["rejected"] == 0
+    assert again["courses"] == {"inserted": 0, "updated": 2} and again["lectures"] == {"inserted": 0, "updated": 2}
@@ -0,0 +1,143 @@
+# frontend/api_client.py
+"""
+백엔드 API 공용 클라이언트
+
+- requests.Session 하나를 모든 세션/리런이 공유 (HTTP keep-alive + 커넥션 풀)
+- 강의 목록 / 차시 목록 / 내 정보는 st.cache_data(TTL)로 캐싱하고, 쓰기 후 invalidate_*()로 비웁니다.
+- 서로 의존하지 않는 조회는 fetch_parallel()로 동시에 요청합니다.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+import streamlit as st
+
+# 스트림릿(서버)이 백엔드(서버)와 통신하는 주소 (도커 내부 통신 기본값)
+API_URL = os.getenv("API_URL", "http://backend:8000/api/v1")
+
+REQUEST_TIMEOUT = 10
+CATALOG_TTL = 60      # 강의 목록
+LECTURE_TTL = 300     # 차시 목록
+USER_TTL = 300        # /users/me
+MAX_BATCH_COURSES = 100   # /lectures/batch 한 번에 보낼 수 있는 강의 수 (백엔드 routers/lectures.py와 동일)
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="api")
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """프로세스 전체가 공유하는 커넥션 풀 세션"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def auth_headers(token):
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+def request(method: str, path: str, token=None, **kwargs) -> requests.Response:
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    return get_session().request(method, f"{API_URL}{path}", headers=auth_headers(token), **kwargs)
+
+
+def get(path: str, token=None, **kwargs) -> requests.Response:
+    return request("GET", path, token, **kwargs)
+
+
+def post(path: str, token=None, **kwargs) -> requests.Response:
+    return request("POST", path, token, **kwargs)
+
+
+# ------------------------------------------
+# 캐싱되는 조회 API
+# ------------------------------------------
+@st.cache_data(ttl=CATALOG_TTL, show_spinner=False)
+def list_courses(page: int = 1, size: int = 100) -> list:
+    res = get("/courses", params={"page": page, "size": size})
+    res.raise_for_status()
+    return res.json().get("content", [])
+
+
+@st.cache_data(ttl=LECTURE_TTL, show_spinner=False)
+def list_lectures(course_id: int) -> list:
+    res = get(f"/courses/{course_id}/lectures")
+    res.raise_for_status()
+    return res.json()
+
+
+def fetch_lectures_batch(course_ids) -> dict:
+    """
+    여러 강의의 차시를 배치 API로 조회 -> {course_id: [lecture, ...]}
+    - 백엔드 한도(MAX_BATCH_COURSES)를 넘으면 나눠서 요청한 뒤 합침
+    """
+    course_ids = list(dict.fromkeys(course_ids))
+    grouped = {cid: [] for cid in course_ids}
+    for start in range(0, len(course_ids), MAX_BATCH_COURSES):
+        res = get("/lectures/batch", params={"course_ids": course_ids[start:start + MAX_BATCH_COURSES]})
+        res.raise_for_status()
+        for lecture in res.json():
+            grouped.setdefault(lecture["course_id"], []).append(lecture)
+    return grouped
+
+
+@st.cache_data(ttl=LECTURE_TTL, show_spinner=False)
+def lectures_by_course(course_ids: tuple) -> dict:
+    """수강 중인 강의들의 차시 (배치 API, 강의 100개당 요청 1회)"""
+    return fetch_lectures_batch(course_ids)
+
+
+@st.cache_data(ttl=CATALOG_TTL, show_spinner=False)
+def my_enrollments(token: str) -> list:
+    res = get("/enrollments/me", token)
+    res.raise_for_status()
+    return res.json()
+
+
+@st.cache_data(ttl=USER_TTL, show_spinner=False)
+def get_me(token: str):
+    res = get("/users/me", token)
+    if res.status_code != 200:
+        return None
+    return res.json()
+
+
+# ------------------------------------------
+# 쓰기 후 캐시 무효화
+# ------------------------------------------
+def invalidate_catalog():
+    list_courses.clear()
+
+
+def invalidate_lectures():
+    list_lectures.clear()
+    lectures_by_course.clear()
+
+
+def invalidate_enrollments():
+    my_enrollments.clear()
+
+
+def invalidate_user():
+    get_me.clear()
+
+
+# ------------------------------------------
+# 병렬 조회
+# ------------------------------------------
+def fetch_parallel(*calls):
+    """
+    fetch_parallel((fn, arg1, ...), (fn2, ...)) -> [결과1, 결과2, ...]
+    - 각 호출을 스레드 풀에서 동시에 실행, 실패한 호출의 결과는 None
+    """
+    futures = [_executor.submit(fn, *args) for fn, *args in calls]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception:
+            results.append(None)
+    return results
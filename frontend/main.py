@@ -1,9 +1,10 @@
 import streamlit as st
-import requests
 import pandas as pd
 import streamlit.components.v1 as components
 import os
 
+import api_client as api
+
 # ==========================================
 # 1. 페이지 및 환경 설정
 # ==========================================
@@ -12,9 +13,7 @@ st.set_page_config(page_title="LMS Student System", layout="wide", page_icon="
 # [환경변수 로드] 
 # 깃허브에 올릴 때는 로컬/서버 환경이 다를 수 있으므로 환경변수로 분리합니다.
 
-# 1. API_URL: 스트림릿(서버)이 백엔드(서버)와 통신하는 주소
-# 도커 내부 통신이므로 기본값은 'http://backend:8000/api/v1' 입니다.
-API_URL = os.getenv("API_URL", "http://backend:8000/api/v1")
+# 1. API_URL: 스트림릿(서버)이 백엔드(서버)와 통신하는 주소 -> api_client.API_URL
 
 # 2. LOGIN_PAGE_URL: 사용자의 '브라우저'가 접속해야 하는 로그인 페이지 주소
 # 로컬 테스트용 기본값은 'http://localhost:8000...' 입니다.
@@ -25,8 +24,8 @@ if 'access_token' not in st.session_state: st.session_state.access_token = None
 if 'user_role' not in st.session_state: st.session_state.user_role = None
 if 'user_email' not in st.session_state: st.session_state.user_email = None
 
-def get_headers():
-    return {"Authorization": f"Bearer {st.session_state.access_token}"}
+def get_token():
+    return st.session_state.access_token
 
 # ==========================================
 # 2. 인증 로직 함수
@@ -36,7 +35,7 @@ def get_headers():
 def login(email, password):
     try:
         # 백엔드와 통신하므로 API_URL 사용
-        res = requests.post(f"{API_URL}/auth/login", data={"username": email, "password": password})
+        res = api.post("/auth/login", data={"username": email, "password": password})
         if res.status_code == 200:
             data = res.json()
             token = data.get('access_token')
@@ -50,7 +49,7 @@ def login(email, password):
 def register(email, password):
     try:
         # 백엔드 스키마에 맞춰 role='USER' 고정 전송
-        res = requests.post(f"{API_URL}/auth/signup", json={
+        res = api.post("/auth/signup", json={
             "email": email,
             "password": password,
             "role": "USER"
@@ -64,7 +63,7 @@ def register(email, password):
 def process_social_login(id_token):
     try:
         with st.spinner("구글 인증 정보를 서버로 전송 중..."):
-            res = requests.post(f"{API_URL}/auth/google", json={"token": id_token})
+            res = api.post("/auth/google", json={"token": id_token})
             
             if res.status_code == 200:
                 data = res.json()
@@ -82,9 +81,8 @@ def process_social_login(id_token):
 # --- 공통: 사용자 정보 가져오기 ---
 def fetch_user_info(token):
     try:
-        me_res = requests.get(f"{API_URL}/users/me", headers={"Authorization": f"Bearer {token}"})
-        if me_res.status_code == 200:
-            user_info = me_res.json()
+        user_info = api.get_me(token)
+        if user_info:
             st.session_state.access_token = token
             st.session_state.user_email = user_info.get('email')
             st.session_state.user_role = user_info.get('role')
@@ -163,6 +161,12 @@ with st.sidebar:
         st.success(f"권한: {role_label}")
         
         if st.button("로그아웃"):
+            try:
+                api.post("/auth/logout", get_token())
+            except Exception:
+                pass
+            api.invalidate_user()
+            api.invalidate_enrollments()
             st.session_state.access_token = None
             st.session_state.user_role = None
             st.session_state.user_email = None
@@ -181,7 +185,7 @@ if st.session_state.access_token:
         with tab1:
             if st.button("통계 새로고침"):
                 try:
-                    res = requests.get(f"{API_URL}/admin/stats", headers=get_headers())
+                    res = api.get("/admin/stats", get_token())
                     if res.status_code == 200:
                         stats = res.json()
                         c1, c2, c3 = st.columns(3)
@@ -192,15 +196,13 @@ if st.session_state.access_token:
 
         with tab2:
             try:
-                res = requests.get(f"{API_URL}/courses", params={"page": 1, "size": 100})
-                if res.status_code == 200:
-                    content = res.json().get('content', [])
-                    if content:
-                        df = pd.DataFrame(content)
-                        # 존재하는 컬럼만 선택하여 에러 방지
-                        cols = [c for c in ['id', 'title', 'instructor_id', 'price'] if c in df.columns]
-                        st.dataframe(df[cols], use_container_width=True)
-                    else: st.info("강의 없음")
+                content = api.list_courses(1, 100)
+                if content:
+                    df = pd.DataFrame(content)
+                    # 존재하는 컬럼만 선택하여 에러 방지
+                    cols = [c for c in ['id', 'title', 'instructor_id', 'price'] if c in df.columns]
+                    st.dataframe(df[cols], use_container_width=True)
+                else: st.info("강의 없음")
             except: st.error("로딩 실패")
 
         with tab3:
@@ -210,8 +212,10 @@ if st.session_state.access_token:
                 price = st.number_input("가격", step=1000)
                 if st.form_submit_button("생성"):
                     try:
-                        res = requests.post(f"{API_URL}/courses", json={"title": title, "description": desc, "price": price, "level": "BEGINNER", "category_id": 1}, headers=get_headers())
-                        if res.status_code == 201: st.success("생성 완료")
+                        res = api.post("/courses", get_token(), json={"title": title, "description": desc, "price": price, "level": "BEGINNER", "category_id": 1})
+                        if res.status_code == 201:
+                            api.invalidate_catalog()
+                            st.success("생성 완료")
                         else: st.error("실패")
                     except: st.error("오류")
 
@@ -221,8 +225,10 @@ if st.session_state.access_token:
             l_url = st.text_input("URL")
             if st.button("추가"):
                 try:
-                    res = requests.post(f"{API_URL}/courses/{c_id}/lectures", json={"title": l_title, "video_url": l_url, "order_index": 1}, headers=get_headers())
-                    if res.status_code == 201: st.success("추가됨")
+                    res = api.post(f"/courses/{c_id}/lectures", get_token(), json={"title": l_title, "video_url": l_url, "order_index": 1})
+                    if res.status_code == 201:
+                        api.invalidate_lectures()
+                        st.success("추가됨")
                     else: st.error("실패")
                 except: st.error("오류")
 
@@ -230,27 +236,36 @@ if st.session_state.access_token:
     else:
         tab1, tab2, tab3 = st.tabs(["🏠 수강 신청", "📺 내 강의실", "👤 내 정보"])
 
+        # 세 탭은 매 리런마다 모두 그려지므로, 서로 독립적인 조회는 한 번에 병렬로 가져옴
+        catalog, my_courses, me = api.fetch_parallel(
+            (api.list_courses, 1, 50),
+            (api.my_enrollments, get_token()),
+            (api.get_me, get_token()),
+        )
+
         with tab1:
-            try:
-                res = requests.get(f"{API_URL}/courses", params={"page": 1, "size": 50})
-                if res.status_code == 200:
-                    for c in res.json().get('content', []):
-                        with st.expander(f"[{c.get('level','?')}] {c['title']} - {c['price']}원"):
-                            st.write(c.get('description'))
-                            if st.button("신청", key=f"btn_{c['id']}"):
-                                r = requests.post(f"{API_URL}/courses/{c['id']}/enroll", headers=get_headers())
-                                if r.status_code == 201: st.success("완료")
+            if catalog is not None:
+                for c in catalog:
+                    with st.expander(f"[{c.get('level','?')}] {c['title']} - {c['price']}원"):
+                        st.write(c.get('description'))
+                        if st.button("신청", key=f"btn_{c['id']}"):
+                            try:
+                                r = api.post(f"/courses/{c['id']}/enroll", get_token())
+                                if r.status_code == 201:
+                                    api.invalidate_enrollments()
+                                    st.success("완료")
                                 elif r.status_code == 409: st.warning("이미 신청함")
                                 else: st.error("실패")
-                else: st.error("로딩 실패")
-            except: st.error("연결 실패")
+                            except: st.error("연결 실패")
+            else: st.error("로딩 실패")
 
         with tab2:
             try:
-                res = requests.get(f"{API_URL}/enrollments/me", headers=get_headers())
-                if res.status_code == 200:
-                    courses = res.json()
+                if my_courses is not None:
+                    courses = my_courses
                     if courses:
+                        # 수강 중인 모든 강의의 차시를 배치 API로 조회 (강의별 N회 호출 X, 100개씩 나눠 요청)
+                        lectures_map = api.lectures_by_course(tuple(c['id'] for c in courses))
                         opts = {c['title']: c['id'] for c in courses}
                         sel = st.selectbox("강의 선택", list(opts.keys()))
                         cid = opts[sel]
@@ -259,9 +274,9 @@ if st.session_state.access_token:
                         cv, cr = st.columns([2, 1])
                         with cv:
                             st.markdown(f"### 🎬 {sel}")
-                            l_res = requests.get(f"{API_URL}/courses/{cid}/lectures", headers=get_headers())
-                            if l_res.status_code == 200:
-                                for l in l_res.json():
+                            lectures = lectures_map.get(cid, [])
+                            if lectures:
+                                for l in lectures:
                                     with st.expander(f"{l['title']}"):
                                         st.video(l['video_url'])
                             else: st.info("영상 없음")
@@ -272,17 +287,16 @@ if st.session_state.access_token:
                                 star = st.slider("별점", 1, 5, 5)
                                 cmt = st.text_area("내용")
                                 if st.form_submit_button("등록"):
-                                    rv = requests.post(f"{API_URL}/courses/{cid}/reviews", json={"rating": star, "comment": cmt}, headers=get_headers())
+                                    rv = api.post(f"/courses/{cid}/reviews", get_token(), json={"rating": star, "comment": cmt})
                                     if rv.status_code == 201: st.success("완료")
                                     else: st.error("실패")
                     else: st.info("수강 중인 강의가 없습니다.")
+                else: st.error("로딩 실패")
             except: st.error("오류")
 
         with tab3:
-            try:
-                me = requests.get(f"{API_URL}/users/me", headers=get_headers())
-                if me.status_code == 200: st.json(me.json())
-            except: st.error("정보 로딩 실패")
+            if me is not None: st.json(me)
+            else: st.error("정보 로딩 실패")
 
 else:
     st.markdown("## 👋 LMS 시스템에 오신 것을 환영합니다!")